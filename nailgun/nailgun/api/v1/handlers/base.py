@@ -18,7 +18,10 @@ from datetime import datetime
 from decorator import decorator
 from oslo_serialization import jsonutils
 import six
+import threading
+import time
 import traceback
+import types
 import yaml
 
 from distutils.version import StrictVersion
@@ -54,6 +57,37 @@ def forbid_client_caching(handler):
     return handler()
 
 
+class ValidationStats(object):
+    """Time spent on validation of request data by handlers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._handlers = {}
+
+    def add(self, handler_name, validation_time):
+        with self._lock:
+            stats = self._handlers.get(handler_name)
+            if stats is None:
+                stats = self._handlers[handler_name] = {
+                    'count': 0, 'total_time': 0.0, 'max_time': 0.0}
+            stats['count'] += 1
+            stats['total_time'] += validation_time
+            stats['max_time'] = max(stats['max_time'], validation_time)
+
+    def to_dict(self):
+        with self._lock:
+            return dict(
+                (name, dict(stats))
+                for name, stats in six.iteritems(self._handlers)
+            )
+
+
+validation_stats = ValidationStats()
+
+
 def load_db_driver(handler):
     """Wrap all handlers calls so transaction is handled accordingly
 
@@ -170,7 +204,14 @@ class BaseHandler(object):
         try:
             data = kwargs.pop('data', web.data())
             method = validate_method or cls.validator.validate
-            valid_data = method(data, **kwargs)
+            started = time.time()
+            try:
+                valid_data = method(data, **kwargs)
+            finally:
+                validation_time = time.time() - started
+                validation_stats.add(cls.__name__, validation_time)
+                logger.debug("Data of %s is validated in %.6f s",
+                             cls.__name__, validation_time)
         except (
             errors.InvalidInterfacesInfo,
             errors.InvalidMetadata
@@ -285,6 +326,21 @@ class BaseHandler(object):
         return accept
 
 
+def iter_json_list(items):
+    """Encode items to JSON list part by part
+
+    :param items: iterable of JSON serializable objects
+    :returns: generator of strings
+    """
+    yield '['
+    for index, item in enumerate(items):
+        if index:
+            yield ', ' + jsonutils.dumps(item)
+        else:
+            yield jsonutils.dumps(item)
+    yield ']'
+
+
 def json_resp(data):
     if isinstance(data, (dict, list)) or data is None:
         return jsonutils.dumps(data)
@@ -382,10 +438,14 @@ def serialize(func, cls, *args, **kwargs):
     resp = func(cls, *args, **kwargs)
     if accept == 'application/x-yaml':
         web.header('Content-Type', 'application/x-yaml', unique=True)
+        if isinstance(resp, types.GeneratorType):
+            resp = list(resp)
         return yaml.dump(resp, default_flow_style=False)
     else:
         # default is json
         web.header('Content-Type', 'application/json', unique=True)
+        if isinstance(resp, types.GeneratorType):
+            return iter_json_list(resp)
         return jsonutils.dumps(resp)
 
 
@@ -460,7 +520,74 @@ class CollectionHandler(BaseHandler):
         :http: * 200 (OK)
         """
         q = self.collection.eager(None, self.eager)
-        return self.collection.to_list(q)
+        return self.get_collection(q)
+
+    def get_collection_params(self):
+        """Get paging and projection parameters of request
+
+        :returns: dict with limit, offset, marker and fields
+        :http: * 400 (invalid parameters)
+        """
+        params = {}
+        for name in ('limit', 'offset', 'marker'):
+            value = web.input(**{name: None})[name]
+            if value is not None:
+                try:
+                    value = int(value)
+                except ValueError:
+                    value = -1
+                if value < 0:
+                    raise self.http(
+                        400, "'{0}' should be non-negative integer"
+                             .format(name))
+            params[name] = value
+
+        fields = self.get_param_as_set('fields')
+        if fields:
+            unknown = fields.difference(
+                self.collection.single.serializer.fields)
+            if unknown:
+                raise self.http(
+                    400, "Unknown fields: {0}".format(
+                        ', '.join(sorted(unknown))))
+            fields = sorted(fields)
+        params['fields'] = fields or None
+        return params
+
+    def get_collection(self, query):
+        """Serialize objects of query by chunks
+
+        The request may contain parameters: limit, offset,
+        marker (id of the last object on the previous page)
+        and fields (comma-separated fields to serialize).
+
+        :param query: SQLAlchemy query
+        :returns: generator of serialized objects
+        """
+        params = self.get_collection_params()
+        fields = params.pop('fields')
+        if fields:
+            query = self.collection.load_only(query, fields)
+        chunks = self.collection.iter_chunks(
+            query, settings.API_COLLECTION_CHUNK_SIZE, **params)
+        # the first chunk is serialized right away, so the errors are
+        # handled as usual, the rest is serialized while response is sent
+        first = self.collection.to_list(next(chunks, []), fields=fields)
+        return self._iter_collection(first, chunks, fields, db())
+
+    def _iter_collection(self, first, chunks, fields, session):
+        try:
+            for item in first:
+                yield item
+            for chunk in chunks:
+                for item in self.collection.to_list(chunk, fields=fields):
+                    yield item
+        finally:
+            # the request session is removed before the response
+            # is sent, so the one opened for the rest of chunks
+            # should be removed here as well
+            if db() is not session:
+                db.remove()
 
     @handle_errors
     @validate
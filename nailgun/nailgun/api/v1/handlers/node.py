@@ -40,6 +40,7 @@ from nailgun.task.manager import NodeDeletionTaskManager
 
 from nailgun.logger import logger
 from nailgun import notifier
+from nailgun.utils import heartbeat
 
 
 class NodeHandler(SingleHandler):
@@ -111,8 +112,11 @@ class NodeCollectionHandler(CollectionHandler):
     def GET(self):
         """May receive cluster_id parameter to filter list of nodes
 
+        Also supports limit, offset, marker and fields parameters.
+
         :returns: Collection of JSONized Node objects.
         :http: * 200 (OK)
+               * 400 (invalid paging or fields parameters)
         """
         cluster_id = web.input(cluster_id=None).cluster_id
         nodes = self.collection.eager_nodes_handlers(None)
@@ -122,7 +126,7 @@ class NodeCollectionHandler(CollectionHandler):
         elif cluster_id:
             nodes = nodes.filter_by(cluster_id=cluster_id)
 
-        return self.collection.to_list(nodes)
+        return self.get_collection(nodes)
 
     @handle_errors
     @validate
@@ -218,6 +222,15 @@ class NodeAgentHandler(BaseHandler):
         if not node:
             raise self.http(404, "Can't find node: {0}".format(nd))
 
+        is_cached = 'agent_checksum' in nd and (
+            node.agent_checksum == nd['agent_checksum']
+        )
+        heartbeat_writer = heartbeat.get_heartbeat_writer()
+        if is_cached and node.online and heartbeat_writer is not None:
+            # nothing is changed, the timestamp is written in background
+            heartbeat_writer.write(node.id, datetime.now())
+            return {'id': node.id, 'cached': True}
+
         node.timestamp = datetime.now()
 
         if not node.online:
@@ -227,9 +240,7 @@ class NodeAgentHandler(BaseHandler):
             notifier.notify("discover", msg, node_id=node.id)
         db().flush()
 
-        if 'agent_checksum' in nd and (
-            node.agent_checksum == nd['agent_checksum']
-        ):
+        if is_cached:
             return {'id': node.id, 'cached': True}
         nd['is_agent'] = True
         self.collection.single.update_by_agent(node, nd)
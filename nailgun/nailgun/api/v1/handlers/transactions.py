@@ -103,3 +103,8 @@ class TransactionClusterSettings(BaseTransactionDataHandler):
 class TransactionNetworkSettings(BaseTransactionDataHandler):
 
     get_data = objects.Transaction.get_network_settings
+
+
+class TransactionStats(BaseTransactionDataHandler):
+
+    get_data = objects.Transaction.get_stats
@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import six
 import web
 
 from nailgun.extensions import get_all_extensions
@@ -122,6 +123,7 @@ from nailgun.api.v1.handlers.transactions import TransactionCollectionHandler
 from nailgun.api.v1.handlers.transactions import TransactionDeploymentInfo
 from nailgun.api.v1.handlers.transactions import TransactionHandler
 from nailgun.api.v1.handlers.transactions import TransactionNetworkSettings
+from nailgun.api.v1.handlers.transactions import TransactionStats
 
 
 from nailgun.api.v1.handlers.version import VersionHandler
@@ -153,6 +155,7 @@ from nailgun.api.v1.handlers.deployment_sequence import SequenceExecutorHandler
 from nailgun.api.v1.handlers.deployment_sequence import SequenceHandler
 
 from nailgun.settings import settings
+from nailgun.utils import routing
 
 urls = (
     r'/releases/?$',
@@ -315,6 +318,8 @@ urls = (
     TransactionNetworkSettings,
     r'/transactions/(?P<transaction_id>\d+)/settings/?$',
     TransactionClusterSettings,
+    r'/transactions/(?P<transaction_id>\d+)/stats/?$',
+    TransactionStats,
 
     r'/plugins/(?P<plugin_id>\d+)/links/?$',
     PluginLinkCollectionHandler,
@@ -448,8 +453,47 @@ def get_all_urls():
     return [all_urls, _locals]
 
 
+class RoutedApplication(web.application):
+    """web.py application which dispatches requests by routing.Router
+
+    web.py matches the path against all url patterns one by one,
+    the router matches it only against patterns with suitable prefix.
+    """
+
+    _router = None
+    _router_mapping = None
+    _router_size = None
+
+    def _get_router(self):
+        # the mapping can be reloaded or extended by web.py
+        if (self._router_mapping is not self.mapping or
+                self._router_size != len(self.mapping)):
+            self._router_mapping = self.mapping
+            self._router_size = len(self.mapping)
+            if any(isinstance(what, web.application)
+                   for _, what in self.mapping):
+                # sub applications are matched by prefix
+                self._router = None
+            else:
+                self._router = routing.Router(
+                    ('^' + pat + '$', what) for pat, what in self.mapping)
+        return self._router
+
+    def _match(self, mapping, value):
+        router = self._get_router() if mapping is self.mapping else None
+        if router is None:
+            return web.application._match(self, mapping, value)
+
+        what, result = router.match(value)
+        if result is None:
+            return None, None
+        if isinstance(what, six.string_types):
+            what = result.expand(what)
+        return what, list(result.groups())
+
+
 def app():
-    return web.application(*get_all_urls())
+    return RoutedApplication(*get_all_urls())
 
 
 def public_urls():
@@ -14,6 +14,7 @@
 #    under the License.
 
 import copy
+import threading
 
 import jsonschema
 from jsonschema import exceptions
@@ -23,9 +24,85 @@ import six
 from nailgun.api.v1.validators.json_schema import base_types
 from nailgun import errors
 from nailgun import objects
+from nailgun.utils.lru import LRUCache
 from nailgun.utils import restrictions
 
 
+class CompiledSchema(object):
+    """The validator of schema, the schema itself is checked only once."""
+
+    def __init__(self, schema, format_checker=None):
+        validator_cls = jsonschema.validators.validator_for(schema)
+        validator_cls.check_schema(schema)
+        self.schema = schema
+        self._validator = validator_cls(
+            schema, format_checker=format_checker)
+        # the resolver of references keeps the state during validation
+        self._lock = threading.Lock()
+
+    def validate(self, data):
+        """Validates data, the same as jsonschema.validate does.
+
+        :raises: jsonschema.exceptions.ValidationError
+        """
+        with self._lock:
+            self._validator.validate(data)
+
+
+_format_checker = jsonschema.FormatChecker()
+_compiled_schemas = LRUCache(size=1024)
+
+
+def get_compiled_schema(schema, check_format=False, cache=True):
+    """Gets the validator of schema, it is compiled on the first use.
+
+    The validators are cached by the schema object, the cache keeps
+    the reference to the schema, so the key is not reused while
+    the validator is cached.
+
+    :param schema: the JSON schema
+    :param check_format: if True the formats of values are checked
+    :param cache: if False the validator is not cached, it should be
+                  used for schemas, that are built for single validation
+    :returns: CompiledSchema instance
+    :raises: jsonschema.exceptions.SchemaError if schema is not valid
+    """
+    format_checker = _format_checker if check_format else None
+    if not cache:
+        return CompiledSchema(schema, format_checker)
+
+    key = (id(schema), check_format)
+    compiled = _compiled_schemas.get(key)
+    if compiled is None or compiled.schema is not schema:
+        compiled = CompiledSchema(schema, format_checker)
+        _compiled_schemas.put(key, compiled)
+    return compiled
+
+
+_attribute_schemas = {}
+
+
+def get_attribute_schema(attr_type):
+    """Gets the schema of attribute with value of specified type.
+
+    The schemas are built once per type, so their validators are cached.
+
+    :param attr_type: the type of attribute, e.g. 'text' or 'checkbox'
+    :returns: the JSON schema
+    """
+    if attr_type not in base_types.ATTRIBUTE_TYPE_SCHEMAS:
+        attr_type = None
+
+    schema = _attribute_schemas.get(attr_type)
+    if schema is None:
+        schema = copy.deepcopy(base_types.ATTRIBUTE_SCHEMA)
+        if attr_type is not None:
+            schema['properties'].update(
+                base_types.ATTRIBUTE_TYPE_SCHEMAS[attr_type])
+        schema = _attribute_schemas.setdefault(attr_type, schema)
+    return schema
+
+
 class BasicValidator(object):
 
     single_schema = None
@@ -62,7 +139,7 @@ class BasicValidator(object):
         }.get(resource_type)
 
         try:
-            jsonschema.validate(json_req, use_schema)
+            get_compiled_schema(use_schema).validate(json_req)
         except exceptions.ValidationError as exc:
             if len(exc.path) > 0:
                 raise errors.JsonValidationError(
@@ -80,16 +157,18 @@ class BasicValidator(object):
         return cls.validate_json(data)
 
     @classmethod
-    def validate_schema(cls, data, schema):
+    def validate_schema(cls, data, schema, cache=True):
         """Validate a given data with a given schema.
 
         :param data:   a data to validate represented as a dict
         :param schema: a schema to validate represented as a dict;
                        must be in JSON Schema Draft 4 format.
+        :param cache:  if False the compiled schema is not cached,
+                       it should be used for the schemas built ad hoc
         """
         try:
-            checker = jsonschema.FormatChecker()
-            jsonschema.validate(data, schema, format_checker=checker)
+            get_compiled_schema(
+                schema, check_format=True, cache=cache).validate(data)
         except Exception as exc:
             # We need to cast a given exception to the string since it's the
             # only way to print readable validation error. Unfortunately,
@@ -216,15 +295,8 @@ class BasicAttributesValidator(BasicValidator):
         if 'type' not in attr and 'value' not in attr:
             return attr
 
-        schema = copy.deepcopy(base_types.ATTRIBUTE_SCHEMA)
-        type_ = attr.get('type')
-        if type_:
-            value_schema = base_types.ATTRIBUTE_TYPE_SCHEMAS.get(type_)
-            if value_schema:
-                schema['properties'].update(value_schema)
-
         try:
-            cls.validate_schema(attr, schema)
+            cls.validate_schema(attr, get_attribute_schema(attr.get('type')))
         except errors.JsonValidationError as e:
             raise errors.JsonValidationError(
                 '[{0}] {1}'.format(attr_name, e.message))
@@ -108,6 +108,9 @@ GRAPH_EXECUTE_PARAMS_SCHEMA = {
         "debug": {
             "type": "boolean"
         },
+        "profile": {
+            "type": "boolean"
+        },
         "subgraphs": {
             "type": "array",
             "items": {
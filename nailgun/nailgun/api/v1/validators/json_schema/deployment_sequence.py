@@ -56,6 +56,7 @@ SEQUENCE_EXECUTION_PARAMS = {
         "dry_run": {"type": "boolean"},
         "noop_run": {"type": "boolean"},
         "force": {"type": "boolean"},
-        "debug": {"type": "boolean"}
+        "debug": {"type": "boolean"},
+        "profile": {"type": "boolean"}
     }
 }
@@ -23,45 +23,101 @@ import time
 
 from datetime import datetime
 from datetime import timedelta
+import sqlalchemy as sa
 from sqlalchemy.sql import not_
 
-from nailgun import notifier
-
+from nailgun import consts
 from nailgun.db import db
 from nailgun.db.sqlalchemy.models import Node
+from nailgun import objects
 from nailgun.settings import settings
 
 from nailgun.utils import logs
 
 
+def _get_watched_nodes_condition(nodes):
+    return sa.and_(
+        nodes.c.online.is_(True),
+        not_(nodes.c.status == consts.NODE_STATUSES.provisioning)
+    )
+
+
 def update_nodes_status(timeout, logger):
-    to_update = db().query(Node).filter(
-        not_(Node.status == 'provisioning')
-    ).filter(
-        datetime.now() > (Node.timestamp + timedelta(seconds=timeout))
-    ).filter_by(online=True)
-    for node_db in to_update:
-        away_message = u"Node '{0}' has gone away".format(
-            node_db.human_readable_name)
-
-        notifier.notify(
-            "error",
-            away_message,
-            node_id=node_db.id
+    """Switches the nodes, which agents have gone away, offline.
+
+    The nodes are switched by the single UPDATE statement, which
+    returns the switched nodes, so the nodes which are updated
+    concurrently are not notified twice.
+
+    :param timeout: seconds since the last update of node by agent
+    :param logger: the logger
+    :returns: the number of nodes which have gone away
+    """
+    now = datetime.now()
+    nodes = Node.__table__
+    gone_away = db().execute(
+        nodes.update().where(sa.and_(
+            _get_watched_nodes_condition(nodes),
+            nodes.c.timestamp < now - timedelta(seconds=timeout)
+        )).values(
+            online=False
+        ).returning(
+            nodes.c.id, nodes.c.name, nodes.c.mac
         )
+    ).fetchall()
+
+    notifications = []
+    for node_id, name, mac in sorted(gone_away):
+        away_message = u"Node '{0}' has gone away".format(name or mac)
+        notifications.append({
+            "topic": consts.NOTIFICATION_TOPICS.error,
+            "message": away_message,
+            "node_id": node_id,
+            "datetime": now,
+        })
         logger.warning(away_message)
-    to_update.update({"online": False})
+    objects.NotificationCollection.bulk_create(notifications)
     db().commit()
+    return len(gone_away)
+
+
+def get_next_check_delay(timeout, min_interval, max_interval):
+    """Gets the number of seconds till the next check of nodes.
+
+    The check is scheduled to the time when the earliest updated
+    online node may go away, but not later than max_interval seconds.
+
+    :param timeout: seconds since the last update of node by agent
+    :param min_interval: the min number of seconds between checks
+    :param max_interval: the max number of seconds between checks
+    """
+    nodes = Node.__table__
+    earliest = db().execute(
+        sa.select([sa.func.min(nodes.c.timestamp)]).where(
+            _get_watched_nodes_condition(nodes))
+    ).scalar()
+    # the daemon should not keep the transaction open while sleeping
+    db().commit()
+
+    if earliest is None:
+        return max_interval
+    expires_at = earliest + timedelta(seconds=timeout)
+    delay = (expires_at - datetime.now()).total_seconds()
+    return min(max(delay, min_interval), max_interval)
 
 
 def run():
     logger = logs.prepare_submodule_logger('assassin',
                                            settings.ASSASSIN_LOG_PATH)
     logger.info('Running Assassind...')
+    timeout = settings.KEEPALIVE['timeout']
     try:
         while True:
-            update_nodes_status(settings.KEEPALIVE['timeout'], logger)
-            time.sleep(settings.KEEPALIVE['interval'])
+            update_nodes_status(timeout, logger)
+            time.sleep(get_next_check_delay(
+                timeout,
+                settings.KEEPALIVE['min_interval'],
+                settings.KEEPALIVE['interval']))
     except (KeyboardInterrupt, SystemExit):
         logger.info('Stopping Assassind...')
         sys.exit(1)
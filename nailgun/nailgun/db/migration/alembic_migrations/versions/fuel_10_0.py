@@ -40,9 +40,17 @@ def upgrade():
     upgrade_release_required_component_types()
     upgrade_node_tagging()
     upgrade_tags_existing_nodes()
+    upgrade_deployment_info_snapshots()
+    upgrade_nodes_jsonb_fields()
+    upgrade_transactions_stats()
+    upgrade_nodes_meta_checksums()
 
 
 def downgrade():
+    downgrade_nodes_meta_checksums()
+    downgrade_transactions_stats()
+    downgrade_nodes_jsonb_fields()
+    downgrade_deployment_info_snapshots()
     downgrade_node_tagging()
     downgrade_release_required_component_types()
     downgrade_plugin_links_constraints()
@@ -213,3 +221,87 @@ def upgrade_release_required_component_types():
 
 def downgrade_release_required_component_types():
     op.drop_column('releases', 'required_component_types')
+
+
+def upgrade_deployment_info_snapshots():
+    op.create_table(
+        'deployment_info_snapshots',
+        sa.Column('checksum', sa.String(40), nullable=False),
+        sa.Column('deployment_info', fields.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint('checksum')
+    )
+    op.add_column(
+        'node_deployment_info',
+        sa.Column('snapshot_checksum', sa.String(40), nullable=True)
+    )
+    op.create_foreign_key(
+        'node_deployment_info_snapshot_checksum_fkey',
+        'node_deployment_info', 'deployment_info_snapshots',
+        ['snapshot_checksum'], ['checksum']
+    )
+    op.create_index('node_deployment_info_snapshot_checksum',
+                    'node_deployment_info', ['snapshot_checksum'])
+
+
+def downgrade_deployment_info_snapshots():
+    connection = op.get_bind()
+    connection.execute(sa.sql.text("""
+        UPDATE node_deployment_info ndi
+        SET deployment_info = s.deployment_info
+        FROM deployment_info_snapshots s
+        WHERE ndi.snapshot_checksum = s.checksum"""))
+
+    op.drop_index('node_deployment_info_snapshot_checksum',
+                  'node_deployment_info')
+    op.drop_constraint('node_deployment_info_snapshot_checksum_fkey',
+                       'node_deployment_info', type_='foreignkey')
+    op.drop_column('node_deployment_info', 'snapshot_checksum')
+    op.drop_table('deployment_info_snapshots')
+
+
+def _alter_nodes_json_fields(type_name):
+    # the defaults cannot be cast automatically between text and jsonb
+    for column, default in (('meta', None),
+                            ('labels', "'{}'"),
+                            ('attributes', "'{}'")):
+        op.execute(
+            u'ALTER TABLE nodes ALTER COLUMN {0} DROP DEFAULT'
+            .format(column))
+        op.execute(
+            u'ALTER TABLE nodes ALTER COLUMN {0} TYPE {1}'
+            u' USING {0}::{1}'.format(column, type_name))
+        if default is not None:
+            op.execute(
+                u'ALTER TABLE nodes ALTER COLUMN {0} SET DEFAULT {1}'
+                .format(column, default))
+
+
+def upgrade_nodes_jsonb_fields():
+    _alter_nodes_json_fields('jsonb')
+
+
+def downgrade_nodes_jsonb_fields():
+    _alter_nodes_json_fields('text')
+
+
+def upgrade_transactions_stats():
+    op.add_column(
+        'tasks',
+        sa.Column('stats', fields.JSON(), nullable=True)
+    )
+
+
+def downgrade_transactions_stats():
+    op.drop_column('tasks', 'stats')
+
+
+def upgrade_nodes_meta_checksums():
+    op.add_column(
+        'nodes',
+        sa.Column('meta_checksums', fields.JSON(),
+                  nullable=False, server_default='{}')
+    )
+
+
+def downgrade_nodes_meta_checksums():
+    op.drop_column('nodes', 'meta_checksums')
@@ -15,6 +15,7 @@
 #    under the License.
 
 from oslo_serialization import jsonutils
+from sqlalchemy.dialects import postgresql as psql
 import sqlalchemy.types as types
 
 
@@ -33,6 +34,22 @@ class JSON(types.TypeDecorator):
         return value
 
 
+class JSONB(psql.JSONB):
+    """JSON field, which is stored as JSONB in PostgreSQL.
+
+    Unlike JSON, the data is parsed by PostgreSQL, so the field can be
+    filtered by JSON path on the server side, e.g.
+    Node.meta[('system', 'manufacturer')] == 'Dell'.
+    """
+
+    def bind_processor(self, dialect):
+        def process(value):
+            if value is not None:
+                value = jsonutils.dumps(value)
+            return value
+        return process
+
+
 class LowercaseString(types.TypeDecorator):
 
     impl = types.String
@@ -32,6 +32,7 @@ from sqlalchemy.orm import relationship
 from nailgun import consts
 from nailgun.db.sqlalchemy.models.base import Base
 from nailgun.db.sqlalchemy.models.fields import JSON
+from nailgun.db.sqlalchemy.models.fields import JSONB
 from nailgun.db.sqlalchemy.models.mutable import MutableDict
 from nailgun.db.sqlalchemy.models.mutable import MutableList
 from nailgun.logger import logger
@@ -94,7 +95,7 @@ class Node(Base):
         nullable=False,
         default=consts.NODE_STATUSES.discover
     )
-    meta = Column(MutableDict.as_mutable(JSON), default={})
+    meta = Column(MutableDict.as_mutable(JSONB), default={})
     mac = Column(psql.MACADDR, nullable=False, unique=True)
     ip = Column(psql.INET)
     hostname = Column(String(255), nullable=False,
@@ -112,7 +113,7 @@ class Node(Base):
     timestamp = Column(DateTime, nullable=False)
     online = Column(Boolean, default=True)
     labels = Column(
-        MutableDict.as_mutable(JSON), nullable=False, server_default='{}')
+        MutableDict.as_mutable(JSONB), nullable=False, server_default='{}')
     tags = relationship('NodeTag', cascade='delete, delete-orphan')
     roles = Column(psql.ARRAY(String(consts.ROLE_NAME_MAX_SIZE)),
                    default=[], nullable=False, server_default='{}')
@@ -128,6 +129,10 @@ class Node(Base):
                                    order_by="NodeBondInterface.name")
     # hash function from raw node agent request data - for caching purposes
     agent_checksum = Column(String(40), nullable=True)
+    # checksums of sections of meta reported by agent - to apply
+    # only the changed sections
+    meta_checksums = Column(MutableDict.as_mutable(JSON), default={},
+                            nullable=False, server_default='{}')
 
     ip_addrs = relationship("IPAddr", viewonly=True)
     replaced_deployment_info = Column(MutableList.as_mutable(JSON), default=[])
@@ -140,7 +145,7 @@ class Node(Base):
     vms_conf = Column(MutableList.as_mutable(JSON),
                       default=[], server_default='[]', nullable=False)
     attributes = Column(
-        MutableDict.as_mutable(JSON),
+        MutableDict.as_mutable(JSONB),
         default={}, server_default='{}', nullable=False)
 
     @property
@@ -22,11 +22,24 @@ from nailgun.db.sqlalchemy.models.base import Base
 from nailgun.db.sqlalchemy.models.fields import JSON
 
 
+class DeploymentInfoSnapshot(Base):
+    """The deployment info blob, which is stored once per its content."""
+
+    __tablename__ = 'deployment_info_snapshots'
+
+    checksum = sa.Column(sa.String(40), primary_key=True)
+
+    deployment_info = deferred(sa.Column(MutableDict.as_mutable(JSON),
+                                         nullable=False))
+
+
 class NodeDeploymentInfo(Base):
     __tablename__ = 'node_deployment_info'
     __table_args__ = (
         sa.Index('node_deployment_info_task_id_and_node_uid',
                  'task_id', 'node_uid'),
+        sa.Index('node_deployment_info_snapshot_checksum',
+                 'snapshot_checksum'),
     )
 
     id = sa.Column(sa.Integer, primary_key=True, nullable=False)
@@ -41,3 +54,10 @@ class NodeDeploymentInfo(Base):
 
     deployment_info = deferred(sa.Column(MutableDict.as_mutable(JSON),
                                          nullable=True))
+
+    # the deployment info is stored in snapshots, the column deployment_info
+    # is filled only for records, that were created before snapshots
+    snapshot_checksum = sa.Column(
+        sa.String(40),
+        sa.ForeignKey('deployment_info_snapshots.checksum'),
+        nullable=True)
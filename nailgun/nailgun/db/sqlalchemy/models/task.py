@@ -91,6 +91,8 @@ class Task(Base):
 
     tasks_snapshot = deferred(Column(MutableList.as_mutable(JSON),
                                      nullable=True))
+    # durations, row counts and sizes of the transaction phases
+    stats = deferred(Column(MutableDict.as_mutable(JSON), nullable=True))
 
     deployment_history = relationship(
         "DeploymentHistory", backref="task", cascade="all,delete")
@@ -14,6 +14,19 @@
 
 
 from nailgun.expression.expression_parser import parse
+from nailgun.utils.lru import LRUCache
+
+# the same restrictions and conditions are evaluated many times
+# with different models, so the parsed expressions are reused
+compiled_expressions = LRUCache(size=2048)
+
+
+def compile_expression(expression_text, strict=True):
+    """Get the compiled expression, parse it only on first use."""
+    return compiled_expressions.get_or_create(
+        (expression_text, strict),
+        lambda: parse(expression_text, strict)
+    )
 
 
 class Expression(object):
@@ -21,7 +34,7 @@ class Expression(object):
         self.expression_text = expression_text
         self.models = models if models is not None else {}
         self.strict = strict
-        self.compiled_expression = parse(self)
+        self.compiled_expression = compile_expression(expression_text, strict)
 
     def evaluate(self):
-        return self.compiled_expression()
+        return self.compiled_expression(self.models)
@@ -14,6 +14,8 @@
 
 # flake8: noqa
 # This is done because grammar definition in docstrings cause H405
+import threading
+
 import ply.lex
 import ply.yacc
 
@@ -77,8 +79,6 @@ def t_error(t):
     t.lexer.skip(1)
 
 
-expression = None
-
 precedence = (
     ('left', 'OR'),
     ('left', 'AND'),
@@ -96,15 +96,15 @@ def p_expression_binop(p):
     """
     result, arg1, op, arg2 = p
     if op == '==':
-        result = lambda: arg1() == arg2()
+        result = lambda models: arg1(models) == arg2(models)
     elif op == '!=':
-        result = lambda: arg1() != arg2()
+        result = lambda models: arg1(models) != arg2(models)
     elif op == 'or':
-        result = lambda: arg1() or arg2()
+        result = lambda models: arg1(models) or arg2(models)
     elif op == 'and':
-        result = lambda: arg1() and arg2()
+        result = lambda models: arg1(models) and arg2(models)
     elif op == 'in':
-        result = lambda: arg1() in arg2()
+        result = lambda models: arg1(models) in arg2(models)
     p[0] = SubexpressionWrapper(result)
 
 
@@ -112,7 +112,7 @@ def p_not_expression(p):
     """expression : NOT expression
     """
     subexpression = p[2]
-    p[0] = SubexpressionWrapper(lambda: not subexpression())
+    p[0] = SubexpressionWrapper(lambda models: not subexpression(models))
 
 
 def p_expression_group(p):
@@ -134,7 +134,7 @@ def p_expression_scalar(p):
 def p_expression_modelpath(p):
     """expression : MODELPATH
     """
-    p[0] = ModelPathWrapper(p[1], expression)
+    p[0] = ModelPathWrapper(p[1], p.parser.strict)
 
 
 def p_error(p):
@@ -144,8 +144,25 @@ def p_error(p):
 lexer = ply.lex.lex()
 parser = ply.yacc.yacc(debug=False, write_tables=False)
 
+# the lexer and the parser keep the state of the current parsing,
+# so each thread gets its own copies of them
+_local = threading.local()
+
+
+def _get_parser():
+    if not hasattr(_local, 'parser'):
+        _local.lexer = lexer.clone()
+        _local.parser = ply.yacc.yacc(debug=False, write_tables=False)
+    return _local.parser, _local.lexer
 
-def parse(expr):
-    global expression
-    expression = expr
-    return parser.parse(expression.expression_text, lexer=lexer)
+
+def parse(expression_text, strict=True):
+    """Compile the expression text.
+
+    :param expression_text: the text of expression
+    :param strict: disallow undefined values of model paths
+    :returns: callable which takes dict of models and returns the value
+    """
+    parser, lexer = _get_parser()
+    parser.strict = strict
+    return parser.parse(expression_text, lexer=lexer)
@@ -17,10 +17,10 @@ class ScalarWrapper(object):
     def __init__(self, value):
         self.value = value
 
-    def evaluate(self):
+    def evaluate(self, models):
         return self.value
 
-    def __call__(self):
+    def __call__(self, models):
         return self.value
 
 
@@ -28,13 +28,11 @@ class SubexpressionWrapper(object):
     def __init__(self, subexpression):
         self.subexpression = subexpression
 
-    def evaluate(self):
-        self.value = self.subexpression()
-        return self.value
+    def evaluate(self, models):
+        return self.subexpression(models)
 
-    def __call__(self):
-        self.evaluate()
-        return self.value
+    def __call__(self, models):
+        return self.subexpression(models)
 
 
 class ModelPath(object):
@@ -47,38 +45,36 @@ class ModelPath(object):
             self.model_name = path_parts[0]
             self.attribute = path_parts[1]
 
-    def set_model(self, models):
+        self.attribute_path = tuple(self.attribute.split('.'))
+
+    def get_model(self, models):
         if self.model_name not in models:
             raise KeyError('No model with name "{0}" defined'.format(
                 self.model_name))
-        self.model = models[self.model_name]
+        return models[self.model_name]
 
-    def get_value(self):
-        def get_attribute_value(model, path):
-            value = model[path.pop(0)]
-            return get_attribute_value(value, path) if len(path) else value
-        return get_attribute_value(self.model, self.attribute.split('.'))
+    def get_value(self, model):
+        value = model
+        for key in self.attribute_path:
+            value = value[key]
+        return value
 
 
 class ModelPathWrapper(object):
-    def __init__(self, path, expression):
+    def __init__(self, path, strict=True):
         self.path = path
         self.model_path = ModelPath(path)
-        self.expression = expression
+        self.strict = strict
 
-    def evaluate(self):
-        self.model_path.set_model(self.expression.models)
-        result = None
+    def evaluate(self, models):
+        model = self.model_path.get_model(models)
         try:
-            result = self.model_path.get_value()
+            return self.model_path.get_value(model)
         except (KeyError, AttributeError):
-            if self.expression.strict:
+            if self.strict:
                 raise TypeError(
                     'Value of {0} is undefined. Set options.strict'
                     ' to false to allow undefined values.'.format(self.path))
-        self.value = result
-        return self.model_path
 
-    def __call__(self):
-        self.evaluate()
-        return self.value
+    def __call__(self, models):
+        return self.evaluate(models)
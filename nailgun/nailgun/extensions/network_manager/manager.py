@@ -18,7 +18,6 @@ from collections import defaultdict
 
 from itertools import chain
 from itertools import groupby
-from itertools import islice
 
 from netaddr import IPAddress
 from netaddr import IPNetwork
@@ -31,6 +30,7 @@ from nailgun import consts
 from nailgun import errors
 from nailgun.extensions.network_manager.objects.serializers.nic import \
     NodeInterfacesSerializer
+from nailgun.extensions.network_manager.snapshot import get_network_snapshot
 from nailgun.extensions.network_manager import utils
 from nailgun.logger import logger
 from nailgun import objects
@@ -220,6 +220,10 @@ class NetworkManager(object):
             network_name, nodegroup
         )
 
+        snapshot = get_network_snapshot(nodegroup.cluster_id)
+        if network is not None and snapshot is not None:
+            return snapshot.get_vip(network.id, vip_name)
+
         filter_args = {'vip_name': vip_name}
         if network is not None:
             filter_args['network'] = network.id
@@ -430,18 +434,6 @@ class NetworkManager(object):
                 return False
         return True
 
-    @classmethod
-    def _iter_free_ips(cls, ip_ranges, ips_in_use):
-        """Iterator over free IP addresses in given IP ranges.
-
-        IP addresses which exist in ips_in_use are excluded from output.
-        """
-        for ip_range in ip_ranges:
-            for ip_addr in ip_range:
-                ip_str = str(ip_addr)
-                if ip_str not in ips_in_use:
-                    yield ip_str
-
     @classmethod
     def get_free_ips_from_ranges(cls, net_name, ip_ranges, ips_in_use, count):
         """Gets the list of free IP addresses for given IP ranges.
@@ -449,32 +441,18 @@ class NetworkManager(object):
         Required quantity of IPs is set in "count". IP addresses
         which exist in ips_in_use or exist in DB are excluded.
         """
-        result = []
-        ip_iterator = cls._iter_free_ips(ip_ranges, ips_in_use)
-        while count > 0:
-            # Eager IP mining to not run DB query on every single IP when just
-            # 1 or 2 IPs are required and a long series of IPs from this range
-            # are occupied already.
-            free_ips = list(
-                islice(
-                    ip_iterator,
-                    0,
-                    max(count, consts.MIN_IPS_PER_DB_QUERY))
-            )
-            if not free_ips:
-                ranges_str = ','.join(str(r) for r in ip_ranges)
-                raise errors.OutOfIPs(
-                    "Not enough free IP addresses in ranges [{0}] of '{1}' "
-                    "network".format(ranges_str, net_name))
-
-            ips_in_db = objects.IPAddr.get_distinct_in_list(free_ips)
-
-            for ip in ips_in_db:
-                free_ips.remove(ip[0])
-            free_ips = free_ips[:count]
-            result.extend(free_ips)
-            count -= len(free_ips)
-
+        allocator = utils.IPAllocator(ip_ranges, ips_in_use)
+        if ip_ranges:
+            allocator.add_used(
+                ip[0] for ip in
+                objects.IPAddr.get_distinct_in_ranges(ip_ranges))
+
+        result = allocator.allocate(count)
+        if len(result) < count:
+            ranges_str = ','.join(str(r) for r in ip_ranges)
+            raise errors.OutOfIPs(
+                "Not enough free IP addresses in ranges [{0}] of '{1}' "
+                "network".format(ranges_str, net_name))
         return result
 
     @classmethod
@@ -774,6 +752,18 @@ class NetworkManager(object):
             # Node doesn't belong to any cluster, so it should not have nets
             return []
 
+        snapshot = get_network_snapshot(cluster_db.id)
+        if snapshot is not None and default_admin_net in (
+                None, snapshot.get_admin_network()):
+            networks = snapshot.memoize(
+                ('node_networks', cls.__name__, node.id),
+                lambda: cls._get_node_networks(node))
+            return [dict(n) for n in networks]
+
+        return cls._get_node_networks(node, default_admin_net)
+
+    @classmethod
+    def _get_node_networks(cls, node, default_admin_net=None):
         network_data = []
         for interface in node.interfaces:
             networks_wo_admin = cls._get_networks_except_admin(
@@ -1372,7 +1362,11 @@ class NetworkManager(object):
         :return: The GW from Admin network if it's set. else Admin IP
         """
         node = objects.Node.get_by_uid(node_id)
-        net = objects.NetworkGroup.get_admin_network_group(node)
+        snapshot = get_network_snapshot(node.cluster_id)
+        if snapshot is not None:
+            net = snapshot.get_admin_network(node)
+        else:
+            net = objects.NetworkGroup.get_admin_network_group(node)
         return net.gateway or settings.MASTER_IP
 
     @classmethod
@@ -1386,7 +1380,11 @@ class NetworkManager(object):
             (n.name, n.cidr)
             for n in node.cluster.network_groups if n.cidr
         )
-        admin_net = objects.NetworkGroup.get_admin_network_group()
+        snapshot = get_network_snapshot(node.cluster_id)
+        if snapshot is not None:
+            admin_net = snapshot.get_admin_network()
+        else:
+            admin_net = objects.NetworkGroup.get_admin_network_group()
         all_nets.add((admin_net.name, admin_net.cidr))
 
         output = defaultdict(list)
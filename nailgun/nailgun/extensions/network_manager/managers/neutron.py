@@ -31,6 +31,7 @@ from nailgun.extensions.network_manager.manager import AssignIPs61Mixin
 from nailgun.extensions.network_manager.manager import AssignIPs70Mixin
 from nailgun.extensions.network_manager.manager import AssignIPsLegacyMixin
 from nailgun.extensions.network_manager.manager import NetworkManager
+from nailgun.extensions.network_manager.snapshot import get_network_snapshot
 from nailgun import objects
 
 from nailgun.extensions.network_manager.serializers.neutron_serializers \
@@ -183,9 +184,24 @@ class NeutronManager70(
         if not node.group_id:
             return {}
 
-        ngs = objects.IPAddr.get_networks_ips(node)
-        if not ngs:
-            return {}
+        snapshot = get_network_snapshot(node.cluster_id)
+        if snapshot is not None:
+            networks = snapshot.memoize(
+                ('node_networks_with_ips', cls.__name__, node.id),
+                lambda: cls._get_node_networks_with_ips(node, snapshot))
+            return dict((k, dict(v)) for k, v in six.iteritems(networks))
+
+        return cls._get_node_networks_with_ips(node)
+
+    @classmethod
+    def _get_node_networks_with_ips(cls, node, snapshot=None):
+        if snapshot is not None:
+            ngs = [(ip.network_data, ip.ip_addr) for ip in node.ip_addrs
+                   if ip.network_data.group_id == node.group_id]
+        else:
+            ngs = objects.IPAddr.get_networks_ips(node)
+            if not ngs:
+                return {}
 
         networks = {}
         for ng, ip in ngs:
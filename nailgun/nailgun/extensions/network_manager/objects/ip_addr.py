@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import sqlalchemy as sa
 from sqlalchemy.orm import joinedload
 from sqlalchemy.sql import not_
 
@@ -123,6 +124,23 @@ class IPAddr(NailgunObject):
             models.IPAddr.ip_addr.in_(ip_list)
         )
 
+    @classmethod
+    def get_distinct_in_ranges(cls, ip_ranges):
+        """Find IPs which exist in database and belong to IP ranges.
+
+        :param ip_ranges: List of IP ranges
+        :type ip_ranges: list of netaddr.IPRange
+        :returns: set of IPs from ip_ranges that exist in database
+        """
+        return db().query(
+            models.IPAddr.ip_addr.distinct()
+        ).filter(
+            sa.or_(*(
+                models.IPAddr.ip_addr.between(str(r[0]), str(r[-1]))
+                for r in ip_ranges
+            ))
+        )
+
     @classmethod
     def get_assigned_vips_for_controller_group(cls, cluster):
         """Get VIPs assigned in specified cluster's controller node group
@@ -25,6 +25,7 @@ from six.moves import range
 
 from nailgun.extensions.network_manager.serializers.base \
     import NetworkDeploymentSerializer
+from nailgun.extensions.network_manager.snapshot import get_network_snapshot
 
 from nailgun import consts
 from nailgun.db import db
@@ -73,6 +74,14 @@ class NeutronNetworkDeploymentSerializer(
 
         return node_attrs
 
+    @classmethod
+    def _has_multiple_node_groups(cls, cluster):
+        snapshot = get_network_snapshot(cluster.id)
+        if snapshot is not None:
+            return len(snapshot.get_node_groups()) > 1
+        return objects.NodeGroupCollection.get_by_cluster_id(
+            cluster.id).count() > 1
+
     @classmethod
     def _node_has_role_by_name(cls, node, rolename):
         if rolename in node.pending_roles or rolename in node.roles:
@@ -710,8 +719,7 @@ class NeutronNetworkDeploymentSerializer61(
         attrs['transformations'] = cls.generate_transformations(
             node, nm, nets_by_ifaces, is_public, prv_base_ep)
 
-        if objects.NodeGroupCollection.get_by_cluster_id(
-                node.cluster.id).count() > 1:
+        if cls._has_multiple_node_groups(node.cluster):
             cls.generate_routes(node, attrs, nm, netgroup_mapping, netgroups,
                                 networks)
 
@@ -875,6 +883,15 @@ class NeutronNetworkDeploymentSerializer70(
 
         return mapping
 
+    @classmethod
+    def _get_cluster_network_roles(cls, cluster):
+        snapshot = get_network_snapshot(cluster.id)
+        if snapshot is None:
+            return objects.Cluster.get_network_roles(cluster)
+        return snapshot.memoize(
+            ('network_roles',),
+            lambda: objects.Cluster.get_network_roles(cluster))
+
     @classmethod
     def _get_network_role_mapping(cls, node, mapping):
         """Aggregates common logic for mapping retrieval methods
@@ -884,7 +901,7 @@ class NeutronNetworkDeploymentSerializer70(
         - 'get_network_role_mapping_to_interfaces'.
         """
         roles = dict()
-        for role in objects.Cluster.get_network_roles(node.cluster):
+        for role in cls._get_cluster_network_roles(node.cluster):
             default_mapping = mapping.get(role['default_mapping'])
             if default_mapping:
                 roles[role['id']] = default_mapping
@@ -1027,8 +1044,7 @@ class NeutronNetworkDeploymentSerializer70(
         attrs['transformations'] = cls.generate_transformations(
             node, nm, nets_by_ifaces, is_public, prv_base_ep)
 
-        if objects.NodeGroupCollection.get_by_cluster_id(
-                node.cluster.id).count() > 1:
+        if cls._has_multiple_node_groups(node.cluster):
             cls.generate_routes(node, attrs, nm, netgroup_mapping, netgroups,
                                 networks)
 
@@ -1209,8 +1225,7 @@ class NeutronNetworkTemplateSerializer70(
 
         attrs['transformations'] = cls.generate_transformations(node)
 
-        if objects.NodeGroupCollection.get_by_cluster_id(
-                node.cluster.id).count() > 1:
+        if cls._has_multiple_node_groups(node.cluster):
             cls.generate_routes(node, attrs, nm, netgroup_mapping, netgroups,
                                 networks)
 
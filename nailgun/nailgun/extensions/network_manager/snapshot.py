@@ -0,0 +1,230 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+import itertools
+
+import six
+import sqlalchemy as sa
+from sqlalchemy.orm import subqueryload
+from sqlalchemy.orm import subqueryload_all
+
+from nailgun import consts
+from nailgun.db import db
+from nailgun.db.sqlalchemy import models
+
+
+#: models which change affects network snapshot
+_SNAPSHOT_DEPENDENCIES = (
+    models.IPAddr,
+    models.NetworkBondAssignment,
+    models.NetworkGroup,
+    models.NetworkingConfig,
+    models.NetworkNICAssignment,
+    models.Node,
+    models.NodeBondInterface,
+    models.NodeGroup,
+    models.NodeNICInterface,
+)
+_SNAPSHOTS = 'network_snapshots'
+
+
+def _invalidate_snapshots(session, vips_only=False):
+    for snapshot in six.itervalues(session.info.get(_SNAPSHOTS, {})):
+        snapshot.invalidate(vips_only)
+
+
+def _is_vip(obj):
+    return isinstance(obj, models.IPAddr) and obj.node is None
+
+
+@sa.event.listens_for(sa.orm.Session, 'after_flush')
+def _on_after_flush(session, flush_context):
+    if not session.info.get(_SNAPSHOTS):
+        return
+    changed = [
+        o for o in itertools.chain(
+            session.new, session.dirty, session.deleted)
+        if isinstance(o, _SNAPSHOT_DEPENDENCIES)
+    ]
+    if changed:
+        # the allocation of VIPs does not affect the nodes
+        _invalidate_snapshots(session, all(_is_vip(o) for o in changed))
+
+
+@sa.event.listens_for(sa.orm.Session, 'after_bulk_update')
+@sa.event.listens_for(sa.orm.Session, 'after_bulk_delete')
+def _on_after_bulk_operation(context):
+    _invalidate_snapshots(context.session)
+
+
+@sa.event.listens_for(sa.orm.Session, 'after_commit')
+@sa.event.listens_for(sa.orm.Session, 'after_rollback')
+def _on_transaction_end(session):
+    # the loaded instances are expired after the transaction ends
+    _invalidate_snapshots(session)
+
+
+class NetworkSnapshot(object):
+    """Network configuration of all nodes of cluster.
+
+    The nodes are loaded together with their interfaces, bonds,
+    assigned networks and IP addresses, the node groups with their
+    networks and VIPs of cluster are loaded as well. It takes the fixed
+    number of queries, after that the relationships of nodes can be
+    walked without queries. The snapshot is reloaded on demand after
+    the network configuration is flushed to DB.
+    """
+
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self._loaded = False
+        self._nodes = {}
+        self._node_groups = {}
+        self._admin_networks = {}
+        self._default_admin_network = None
+        self._vips = None
+        self._memo = {}
+
+    def invalidate(self, vips_only=False):
+        """Drops the loaded data, it will be loaded again on demand.
+
+        :param vips_only: drop only VIPs of cluster
+        """
+        self._vips = None
+        if vips_only:
+            return
+        self._loaded = False
+        self._nodes.clear()
+        self._node_groups.clear()
+        self._admin_networks.clear()
+        self._default_admin_network = None
+        self._memo.clear()
+
+    def _load(self):
+        nodes = db().query(models.Node).filter_by(
+            cluster_id=self.cluster.id
+        ).options(
+            subqueryload_all('nic_interfaces.assigned_networks_list'),
+            subqueryload_all('bond_interfaces.assigned_networks_list'),
+            subqueryload_all('bond_interfaces.slaves'),
+            subqueryload_all('ip_addrs.network_data'),
+        )
+        self._nodes = dict((n.id, n) for n in nodes)
+
+        node_groups = db().query(models.NodeGroup).filter_by(
+            cluster_id=self.cluster.id
+        ).options(subqueryload('networks'))
+        self._node_groups = dict((g.id, g) for g in node_groups)
+        for node_group in six.itervalues(self._node_groups):
+            for network in node_group.networks:
+                if network.name == consts.NETWORKS.fuelweb_admin:
+                    self._admin_networks[node_group.id] = network
+
+        self._default_admin_network = db().query(
+            models.NetworkGroup
+        ).filter_by(
+            group_id=None, name=consts.NETWORKS.fuelweb_admin
+        ).first()
+        self._loaded = True
+
+    def _load_vips(self):
+        self._ensure_loaded()
+        networks_ids = [
+            network.id
+            for node_group in six.itervalues(self._node_groups)
+            for network in node_group.networks
+        ]
+        if self._default_admin_network is not None:
+            networks_ids.append(self._default_admin_network.id)
+
+        self._vips = {}
+        if not networks_ids:
+            return
+
+        vips = db().query(models.IPAddr).filter(
+            models.IPAddr.network.in_(networks_ids),
+            models.IPAddr.vip_name.isnot(None)
+        ).order_by(models.IPAddr.id)
+        for vip in vips:
+            self._vips.setdefault((vip.network, vip.vip_name), vip)
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._load()
+
+    def get_node(self, node_id):
+        """Gets node of cluster by id, None if there is no such node."""
+        self._ensure_loaded()
+        return self._nodes.get(node_id)
+
+    def get_node_groups(self):
+        """Gets the list of node groups of cluster."""
+        self._ensure_loaded()
+        return list(six.itervalues(self._node_groups))
+
+    def get_admin_network(self, node=None):
+        """Gets admin network of node or the default admin network."""
+        self._ensure_loaded()
+        network = None
+        if node is not None:
+            network = self._admin_networks.get(node.group_id)
+        return network or self._default_admin_network
+
+    def get_vip(self, network_id, vip_name):
+        """Gets VIP with the name assigned in the network or None."""
+        if self._vips is None:
+            self._load_vips()
+        return self._vips.get((network_id, vip_name))
+
+    def memoize(self, key, factory):
+        """Gets the result computed from the snapshot data.
+
+        The result is computed by factory on the first call
+        and is dropped with the snapshot data.
+
+        :param key: the hashable key of result
+        :param factory: the callable without arguments
+        """
+        self._ensure_loaded()
+        try:
+            return self._memo[key]
+        except KeyError:
+            result = self._memo[key] = factory()
+            return result
+
+
+def get_network_snapshot(cluster_id):
+    """Gets the snapshot which is used for cluster now or None."""
+    return db().info.get(_SNAPSHOTS, {}).get(cluster_id)
+
+
+@contextlib.contextmanager
+def network_snapshot(cluster):
+    """Uses the network snapshot for cluster within the context.
+
+    The nested contexts for the same cluster share the snapshot.
+
+    :param cluster: the Cluster instance
+    """
+    snapshots = db().info.setdefault(_SNAPSHOTS, {})
+    if cluster.id in snapshots:
+        yield snapshots[cluster.id]
+        return
+
+    snapshot = snapshots[cluster.id] = NetworkSnapshot(cluster)
+    try:
+        yield snapshot
+    finally:
+        db().info.get(_SNAPSHOTS, {}).pop(cluster.id, None)
@@ -0,0 +1,113 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+
+import sqlalchemy as sa
+
+from nailgun import consts
+from nailgun.db import engine
+from nailgun.extensions.network_manager.snapshot import get_network_snapshot
+from nailgun.extensions.network_manager.snapshot import network_snapshot
+from nailgun import objects
+from nailgun.orchestrator import deployment_serializers
+from nailgun.test.base import BaseIntegrationTest
+
+
+@contextlib.contextmanager
+def count_queries():
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        queries.append(statement)
+
+    sa.event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        sa.event.remove(
+            engine, 'before_cursor_execute', before_cursor_execute)
+
+
+class TestNetworkSnapshot(BaseIntegrationTest):
+
+    # Max number of queries to serialize networks of all nodes
+    MAX_QUERIES_COUNT = 25
+
+    def setUp(self):
+        super(TestNetworkSnapshot, self).setUp()
+        self.env.create(
+            release_kwargs={'version': 'mitaka-9.0'},
+            cluster_kwargs={
+                'mode': consts.CLUSTER_MODES.ha_compact,
+                'net_provider': consts.CLUSTER_NET_PROVIDERS.neutron,
+                'net_segment_type': consts.NEUTRON_SEGMENT_TYPES.vlan},
+            nodes_kwargs=[{'roles': ['controller'],
+                           'pending_addition': True}])
+        self.cluster = self.env.clusters[-1]
+
+    def add_nodes(self, count):
+        self.env.create_nodes_w_interfaces_count(
+            nodes_count=count, if_count=3, roles=['compute'],
+            pending_addition=True, cluster_id=self.cluster.id)
+        objects.Cluster.prepare_for_deployment(self.cluster)
+
+    def serialize_networks(self):
+        net_serializer = deployment_serializers.get_serializer_for_cluster(
+            self.cluster).get_net_provider_serializer(self.cluster)
+        nodes = objects.Cluster.get_nodes_not_for_deletion(self.cluster).all()
+        # the warm up, VIPs are allocated on the first serialization
+        net_serializer.generate_network_metadata(self.cluster)
+        self.db.flush()
+        self.db.expire_all()
+
+        with count_queries() as queries:
+            with network_snapshot(self.cluster):
+                net_serializer.generate_network_metadata(self.cluster)
+                for node in nodes:
+                    net_serializer.get_node_attrs(node)
+        return len(queries)
+
+    def test_queries_count_does_not_depend_on_nodes_count(self):
+        self.add_nodes(2)
+        queries_count = self.serialize_networks()
+        self.assertLessEqual(queries_count, self.MAX_QUERIES_COUNT)
+
+        self.add_nodes(4)
+        self.assertEqual(queries_count, self.serialize_networks())
+
+    def test_snapshot_is_reloaded_after_changes(self):
+        self.add_nodes(1)
+        node = self.cluster.nodes[0]
+        nm = objects.Cluster.get_network_manager(self.cluster)
+
+        with network_snapshot(self.cluster) as snapshot:
+            self.assertIs(snapshot, get_network_snapshot(self.cluster.id))
+            networks = nm.get_node_networks(node)
+            admin_ip = next(
+                n['ip'] for n in networks
+                if n['name'] == consts.NETWORKS.fuelweb_admin)
+
+            ip = next(ip for ip in node.ip_addrs
+                      if ip.network_data.name == consts.NETWORKS.management)
+            ip.ip_addr = '192.168.0.200'
+            self.db.flush()
+
+            networks = nm.get_node_networks(node)
+            self.assertIn(
+                '192.168.0.200/24',
+                [n.get('ip') for n in networks])
+            self.assertIn(admin_ip, [n.get('ip') for n in networks])
+
+        self.assertIsNone(get_network_snapshot(self.cluster.id))
@@ -42,3 +42,28 @@ class TestNetworkUtils(BaseUnitTest):
     def test_compare_macs_raise_exception(self):
         with self.assertRaises(ValueError):
             utils.is_same_mac('QWERTY', 'ASDF')
+
+
+class TestIPAllocator(BaseUnitTest):
+
+    def test_allocate_skips_used_ips(self):
+        allocator = utils.IPAllocator(
+            [netaddr.IPRange('10.0.0.2', '10.0.0.6'),
+             netaddr.IPRange('10.0.1.1', '10.0.1.3')],
+            ['10.0.0.3', '10.0.0.5', '10.0.0.6', '10.0.1.1', '10.0.2.1']
+        )
+        self.assertEqual(
+            ['10.0.0.2', '10.0.0.4', '10.0.1.2'], allocator.allocate(3))
+        self.assertEqual(['10.0.1.3'], allocator.allocate(3))
+        self.assertEqual([], allocator.allocate(1))
+
+    def test_allocate_from_fully_used_range(self):
+        ip_range = netaddr.IPRange('192.168.0.0', '192.168.255.255')
+        allocator = utils.IPAllocator(
+            [ip_range], (str(ip) for ip in ip_range if ip.words[3] != 7))
+        self.assertEqual(['192.168.0.7', '192.168.1.7'], allocator.allocate(2))
+
+    def test_allocate_ipv6(self):
+        allocator = utils.IPAllocator(
+            [netaddr.IPRange('fd00::1', 'fd00::4')], ['fd00::2'])
+        self.assertEqual(['fd00::1', 'fd00::3'], allocator.allocate(2))
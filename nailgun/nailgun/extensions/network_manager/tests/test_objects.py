@@ -17,6 +17,7 @@
 import mock
 
 from netaddr import IPNetwork
+from netaddr import IPRange
 
 from nailgun import consts
 from nailgun.db.sqlalchemy.models import NodeBondInterface
@@ -297,6 +298,19 @@ class TestIPAddrObject(BaseTestCase):
         db_ips = set(db_ips) - vips
         self.assertItemsEqual(db_ips, assigned_ips)
 
+    def test_get_distinct_in_ranges(self):
+        for addr in ('10.20.0.1', '10.20.0.5', '10.20.0.5', '10.20.0.9',
+                     '10.20.1.3'):
+            self.db.add(objects.IPAddr.model(ip_addr=addr))
+        self.db.flush()
+
+        ranges = [IPRange('10.20.0.2', '10.20.0.9'),
+                  IPRange('10.20.1.1', '10.20.1.10')]
+        self.assertItemsEqual(
+            ['10.20.0.5', '10.20.0.9', '10.20.1.3'],
+            [ip[0] for ip in objects.IPAddr.get_distinct_in_ranges(ranges)]
+        )
+
     def test_get_by_ip_addr(self):
         ng = objects.NetworkGroup.model(name='test')
         self.db.add(ng)
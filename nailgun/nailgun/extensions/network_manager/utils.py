@@ -14,6 +14,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import bisect
+import collections
+from itertools import islice
+
 import netaddr
 
 
@@ -27,3 +31,64 @@ def is_same_mac(mac1, mac2):
         return netaddr.EUI(mac1) == netaddr.EUI(mac2)
     except netaddr.AddrFormatError as e:
         raise ValueError(e)
+
+
+class IPAllocator(object):
+    """Allocator of free IP addresses in the given IP ranges.
+
+    Addresses in use are kept as sorted lists of integers per IP
+    version, so free addresses are found by scanning the gaps between
+    them instead of checking every address of the ranges.
+    """
+
+    def __init__(self, ip_ranges, ips_in_use=()):
+        self.ip_ranges = [netaddr.IPRange(r[0], r[-1]) for r in ip_ranges]
+        self.used = collections.defaultdict(list)
+        self.add_used(ips_in_use)
+
+    def add_used(self, ips):
+        """Mark IP addresses as used.
+
+        :param ips: iterable of IP addresses
+        """
+        values = collections.defaultdict(set)
+        for ip in ips:
+            ip_addr = netaddr.IPAddress(ip)
+            values[ip_addr.version].add(int(ip_addr))
+        for version, version_values in values.items():
+            version_values.update(self.used[version])
+            self.used[version] = sorted(version_values)
+
+    def iter_free(self):
+        """Iterate over free IP addresses in order of ranges.
+
+        :returns: generator of netaddr.IPAddress
+        """
+        for ip_range in self.ip_ranges:
+            version = ip_range.version
+            used = self.used[version]
+            last = ip_range.last
+            index = bisect.bisect_left(used, ip_range.first)
+            start = ip_range.first
+            while start <= last:
+                stop = last + 1
+                if index < len(used):
+                    stop = min(used[index], stop)
+                value = start
+                while value < stop:
+                    yield netaddr.IPAddress(value, version)
+                    value += 1
+                start = stop + 1
+                index += 1
+
+    def allocate(self, count):
+        """Allocate free IP addresses and mark them as used.
+
+        Fewer addresses are returned if there are not enough free ones.
+
+        :param count: the number of IP addresses
+        :returns: list of IP addresses as strings
+        """
+        ips = [str(ip) for ip in islice(self.iter_free(), count)]
+        self.add_used(ips)
+        return ips
@@ -15,8 +15,11 @@
 #    under the License.
 
 import abc
+import collections
+import hashlib
 import re
 
+from oslo_serialization import jsonutils
 import six
 
 from nailgun import consts
@@ -27,6 +30,68 @@ from nailgun import utils
 from nailgun import yaql_ext
 
 
+#: the kinds of data reads, see TrackingDict
+READ_VALUE = 'v'
+READ_KEY = 'k'
+
+_MISSING = object()
+
+
+class TrackingDict(collections.Mapping):
+    """Read-only view of data, which records paths of read values.
+
+    The records are stored in the dict path -> kind of read, where
+    path is tuple of keys from the root and kind is READ_VALUE if
+    the whole value was used or READ_KEY if only presence of the key
+    and whether it refers to a mapping was checked.
+    """
+
+    __slots__ = ('_data', '_path', '_reads')
+
+    def __init__(self, data, path, reads):
+        self._data = data
+        self._path = path
+        self._reads = reads
+
+    def _add_read(self, path, kind):
+        if self._reads.get(path) != READ_VALUE:
+            self._reads[path] = kind
+
+    def __getitem__(self, key):
+        path = self._path + (key,)
+        try:
+            value = self._data[key]
+        except KeyError:
+            self._add_read(path, READ_KEY)
+            raise
+
+        if isinstance(value, collections.Mapping):
+            self._add_read(path, READ_KEY)
+            return TrackingDict(value, path, self._reads)
+        self._add_read(path, READ_VALUE)
+        return value
+
+    def __contains__(self, key):
+        self._add_read(self._path + (key,), READ_KEY)
+        return key in self._data
+
+    def __iter__(self):
+        self._add_read(self._path, READ_VALUE)
+        return iter(self._data)
+
+    def __len__(self):
+        self._add_read(self._path, READ_VALUE)
+        return len(self._data)
+
+
+def _to_primitive(value):
+    if isinstance(value, collections.Mapping):
+        return {k: _to_primitive(v) for k, v in six.iteritems(value)}
+    if isinstance(value, (list, tuple)):
+        return [_to_primitive(v) for v in value]
+    return value
+
+
 class Context(object):
     # Because condition runs on serialized data instead of raw data
     # we have to modify name of variables, the following transformations
@@ -59,19 +124,106 @@ class Context(object):
         )
         self._yaql_engine = yaql_ext.create_engine()
         self._yaql_expressions_cache = {}
+        # the views of deployment info are reused for all tasks of node
+        self._new_data_cache = {}
+        self._old_data_cache = {}
+        # the dumps of data and templates are shared between nodes,
+        # objects are kept to not reuse their ids
+        self._dumps_cache = {}
 
     def get_transaction_option(self, name, default=None):
         return self._transaction.options.get(name, default)
 
     def get_new_data(self, node_id):
-        return self._transaction.get_new_data(node_id)
+        try:
+            return self._new_data_cache[node_id]
+        except KeyError:
+            data = self._transaction.get_new_data(node_id)
+            self._new_data_cache[node_id] = data
+            return data
+
+    def get_old_data(self, node_id, task_id):
+        key = (node_id, task_id)
+        try:
+            return self._old_data_cache[key]
+        except KeyError:
+            data = self._transaction.get_old_data(node_id, task_id)
+            self._old_data_cache[key] = data
+            return data
+
+    def get_root_data(self, root, node_id, task_id):
+        """Gets the data, which paths of reads are started from.
+
+        :param root: the name of data - new, old, node or common
+        :param node_id: the target node_id
+        :param task_id: the ID of task
+        """
+        if root == 'new':
+            return self.get_new_data(node_id)
+        if root == 'old':
+            return self.get_old_data(node_id, task_id)
+        if root == 'node':
+            return self._transaction.get_new_node_data(node_id)
+        if root == 'common':
+            return self._transaction.get_new_common_data()
+        raise ValueError("Unknown data: {0}".format(root))
+
+    def _get_data(self, root, node_id, task_id, reads):
+        data = self.get_root_data(root, node_id, task_id)
+        if reads is None:
+            return data
+        return TrackingDict(data, (root,), reads)
+
+    def _dumps(self, value):
+        if not isinstance(value, (collections.Mapping, list, tuple)):
+            return jsonutils.dumps(value)
+        try:
+            return self._dumps_cache[id(value)][1]
+        except KeyError:
+            dump = jsonutils.dumps(_to_primitive(value), sort_keys=True)
+            self._dumps_cache[id(value)] = (value, dump)
+            return dump
+
+    def _resolve_read(self, node_id, task_id, path, kind):
+        value = self.get_root_data(path[0], node_id, task_id)
+        for key in path[1:]:
+            if not isinstance(value, collections.Mapping):
+                return '-'
+            value = value.get(key, _MISSING)
+            if value is _MISSING:
+                return '-'
+        if kind == READ_KEY and isinstance(value, collections.Mapping):
+            return '{}'
+        return self._dumps(value)
+
+    def get_inputs_digest(self, node_id, task, reads):
+        """Calculates the checksum of all inputs of the task serialization.
+
+        The inputs are the task template and the values, which are read
+        from deployment info while serialization.
 
-    def get_yaql_interpreter(self, node_id, task_id):
+        :param node_id: the target node_id
+        :param task: the task template
+        :param reads: the sequence of pairs (path, kind) of reads
+        :return: the hex digest
+        """
+        task_id = task['id']
+        digest = hashlib.sha1()
+        digest.update(self._dumps(task).encode('utf-8'))
+        digest.update(jsonutils.dumps(settings.MASTER_IP).encode('utf-8'))
+        for path, kind in reads:
+            digest.update(jsonutils.dumps([path, kind]).encode('utf-8'))
+            digest.update(self._resolve_read(
+                node_id, task_id, path, kind).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_yaql_interpreter(self, node_id, task_id, reads=None):
         context = self._yaql_context.create_child_context()
-        context['$%new'] = self._transaction.get_new_data(node_id)
-        context['$%old'] = self._transaction.get_old_data(node_id, task_id)
-        context['$node'] = self._transaction.get_new_node_data(node_id)
-        context['$common'] = self._transaction.get_new_common_data()
+        context['$%new'] = self._get_data('new', node_id, task_id, reads)
+        context['$%old'] = self._get_data('old', node_id, task_id, reads)
+        context['$node'] = self._get_data('node', node_id, task_id, reads)
+        context['$common'] = self._get_data(
+            'common', node_id, task_id, reads)
         context['$'] = context['$%new']
         cache = self._yaql_expressions_cache
 
@@ -85,8 +237,8 @@ class Context(object):
             return parsed_exp.evaluate(context=context)
         return evaluate
 
-    def get_legacy_interpreter(self, node_id):
-        deployment_info = self._transaction.get_new_data(node_id)
+    def get_legacy_interpreter(self, node_id, reads=None):
+        deployment_info = self._get_data('new', node_id, None, reads)
         context = {
             'cluster': deployment_info.get('cluster', {}),
             'settings': deployment_info
@@ -109,8 +261,8 @@ class Context(object):
 
         return evaluate
 
-    def get_formatter_context(self, node_id):
-        data = self._transaction.get_new_data(node_id)
+    def get_formatter_context(self, node_id, reads=None):
+        data = self._get_data('new', node_id, None, reads)
         return {
             'CLUSTER_ID': data.get('cluster', {}).get('id'),
             'OPENSTACK_VERSION': data.get('openstack_version'),
@@ -147,23 +299,25 @@ class DeploymentTaskSerializer(object):
         :return: the result
         """
 
-    def serialize(self, node_id):
+    def serialize(self, node_id, reads=None):
         """Serialize task in expected by orchestrator format.
 
         :param node_id: the target node_id
+        :param reads: the dict to record paths of read data if specified
         """
 
         logger.debug(
             "serialize task %s for node %s",
             self.task_template['id'], node_id
         )
+        self.reads = reads
         task = utils.traverse(
             self.task_template,
             utils.text_format_safe,
-            self.context.get_formatter_context(node_id),
+            self.context.get_formatter_context(node_id, reads),
             {
                 'yaql_exp': self.context.get_yaql_interpreter(
-                    node_id, self.task_template['id'])
+                    node_id, self.task_template['id'], reads)
             }
         )
         return self.normalize(self.finalize(task, node_id))
@@ -185,6 +339,7 @@ class NoopTaskSerializer(DeploymentTaskSerializer):
     def __init__(self, context, task_template):
         self.task_template = task_template
         self.context = context
+        self.reads = None
 
     def finalize(self, task, node_id):
         task.pop('parameters', None)
@@ -200,7 +355,8 @@ class DefaultTaskSerializer(NoopTaskSerializer):
         if isinstance(condition, six.string_types):
             # string condition interprets as legacy condition
             # and it should be evaluated
-            interpreter = self.context.get_legacy_interpreter(node_id)
+            interpreter = self.context.get_legacy_interpreter(
+                node_id, self.reads)
             return interpreter(condition)
         return condition
 
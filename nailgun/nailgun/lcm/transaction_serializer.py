@@ -15,32 +15,50 @@
 #    under the License.
 
 from distutils.version import StrictVersion
+import atexit
+import copy
+import itertools
 import multiprocessing
+import os
+import tempfile
 
 import six
+from six.moves import cPickle as pickle
 
 from nailgun import consts
 from nailgun import errors
 from nailgun.lcm.task_serializer import TasksSerializersFactory
 from nailgun.logger import logger
 from nailgun.settings import settings
+from nailgun import utils
+from nailgun.utils.lru import LRUCache
 from nailgun.utils.role_resolver import NameMatchingPolicy
 
 
+# the transaction context is handed over to workers through the file
+# in shared memory if it is available
+_SHM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
 # This class has similar functional with TasksSerializer from task deploy
 # but there is no chance to re-use TasksSerializer until bug
 # https://bugs.launchpad.net/fuel/+bug/1562292 is not fixed
 
 
-def _serialize_task_for_node(factory, node_and_task):
+def _serialize_task_for_node(factory, node_and_task, track_inputs=False):
     node_id, task = node_and_task
     logger.debug(
         "applying task '%s' for node: %s", task['id'], node_id
     )
     try:
         task_serializer = factory.create_serializer(task)
-        serialized = task_serializer.serialize(node_id)
-        return node_id, serialized
+        if not track_inputs:
+            return node_id, task_serializer.serialize(node_id), None
+        reads = {}
+        serialized = task_serializer.serialize(node_id, reads)
+        reads = tuple(sorted(six.iteritems(reads)))
+        digest = factory.context.get_inputs_digest(node_id, task, reads)
+        return node_id, serialized, (reads, digest)
     except Exception:
         logger.exception(
             "failed to serialize task '%s' for node: %s", task['id'], node_id
@@ -48,61 +66,148 @@ def _serialize_task_for_node(factory, node_and_task):
         raise
 
 
-def _initialize_worker(serializers_factory, context):
-    globals()['__factory'] = serializers_factory(context)
-
-
-def _serialize_task_for_node_in_worker(node_and_task):
-    return _serialize_task_for_node(globals()['__factory'], node_and_task)
+def _get_factory_in_worker(serializers_factory, context_version,
+                           context_path):
+    # the factory is kept between transactions and re-created
+    # only when the worker receives a task from a new context
+    cached = globals().get('__factory')
+    if cached is None or cached[0] != context_version:
+        with open(context_path, 'rb') as stream:
+            context = pickle.load(stream)
+        cached = (context_version, serializers_factory(context))
+        globals()['__factory'] = cached
+    return cached[1]
+
+
+def _serialize_task_for_node_in_worker(payload):
+    (serializers_factory, context_version, context_path, node_and_task,
+     track_inputs) = payload
+    factory = _get_factory_in_worker(
+        serializers_factory, context_version, context_path
+    )
+    return _serialize_task_for_node(factory, node_and_task, track_inputs)
 
 
 class SingleWorkerConcurrencyPolicy(object):
-    def execute(self, context, serializers_factory, tasks):
+    def execute(self, context, serializers_factory, tasks,
+                track_inputs=False):
         """Executes task serialization synchronously, task by task.
 
         :param context: the transaction context
         :param serializers_factory: the serializers factory
         :param tasks: the tasks to serialize
-        :return sequence of serialized tasks
+        :param track_inputs: collect inputs of serialization if True
+        :return sequence of (node_id, serialized task, inputs)
         """
         factory = serializers_factory(context)
         return six.moves.map(
-            lambda x: _serialize_task_for_node(factory, x),
+            lambda x: _serialize_task_for_node(factory, x, track_inputs),
             tasks
         )
 
 
 class MultiProcessingConcurrencyPolicy(object):
+    """Serializes tasks in the pool of long-living worker processes.
+
+    The pool is shared between transactions, so workers are forked
+    only once per process. The context of transaction is pickled only
+    once and is handed over to workers through the file in shared memory,
+    each worker loads it when it receives the first task
+    of the new transaction.
+    """
+
+    _pool = None
+    _pool_pid = None
+    _pool_size = None
+    _context_version = itertools.count(1)
+
     def __init__(self, workers_num):
         self.workers_num = workers_num
 
-    def execute(self, context, serializers_factory, tasks):
+    @classmethod
+    def get_pool(cls, workers_num):
+        """Gets the shared pool of workers, creates it if necessary.
+
+        :param workers_num: the number of workers in pool
+        :return: the pool instance
+        """
+        # the pool cannot be used in the forked process,
+        # so the new pool is created for each process
+        if (cls._pool is not None and
+                (cls._pool_pid != os.getpid() or
+                 cls._pool_size != workers_num)):
+            cls.shutdown()
+
+        if cls._pool is None:
+            cls._pool = multiprocessing.Pool(processes=workers_num)
+            cls._pool_pid = os.getpid()
+            cls._pool_size = workers_num
+        return cls._pool
+
+    @classmethod
+    def shutdown(cls, terminate=False):
+        """Stops the shared pool of workers.
+
+        :param terminate: stop workers immediately if True
+        """
+        pool = cls._pool
+        cls._pool = None
+        cls._pool_pid = None
+        cls._pool_size = None
+        if pool is None:
+            return
+        if terminate:
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
+
+    @classmethod
+    def dump_context(cls, context):
+        """Saves the transaction context to be shared between workers.
+
+        :param context: the transaction context
+        :return: the tuple (version, path to file)
+        """
+        fd, path = tempfile.mkstemp(prefix='lcm-context-', dir=_SHM_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                pickle.dump(context, stream, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            os.unlink(path)
+            raise
+        return next(cls._context_version), path
+
+    def execute(self, context, serializers_factory, tasks,
+                track_inputs=False):
         """Executes task serialization in parallel.
 
         :param context: the transaction context
         :param serializers_factory: the serializers factory
         :param tasks: the tasks to serialize
-        :return sequence of serialized tasks
+        :param track_inputs: collect inputs of serialization if True
+        :return sequence of (node_id, serialized task, inputs)
         """
-        pool = multiprocessing.Pool(
-            processes=self.workers_num,
-            initializer=_initialize_worker,
-            initargs=(serializers_factory, context)
-        )
-
+        pool = self.get_pool(self.workers_num)
+        context_version, context_path = self.dump_context(context)
         try:
             result = pool.imap_unordered(
-                _serialize_task_for_node_in_worker, tasks
+                _serialize_task_for_node_in_worker,
+                six.moves.map(
+                    lambda x: (serializers_factory, context_version,
+                               context_path, x, track_inputs),
+                    tasks
+                )
             )
             for r in result:
                 yield r
-        except Exception:
-            pool.terminate()
+        except BaseException:
+            # including GeneratorExit, the queued tasks cannot be
+            # completed without the context
+            self.shutdown(terminate=True)
             raise
-        else:
-            pool.close()
         finally:
-            pool.join()
+            os.unlink(context_path)
 
 
 def get_concurrency_policy():
@@ -118,6 +223,73 @@ def get_concurrency_policy():
     return SingleWorkerConcurrencyPolicy()
 
 
+atexit.register(MultiProcessingConcurrencyPolicy.shutdown)
+
+
+class SerializedTasksCache(object):
+    """Keeps serialized tasks between transactions.
+
+    Each task is stored along with paths of deployment info, that were
+    read during serialization, and the digest of its inputs. The task
+    is reused if the digest, calculated over the same paths of the new
+    deployment info, is not changed, because the serialization would
+    take the same way and give the same result.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._tasks = LRUCache(size or 0)
+
+    @property
+    def enabled(self):
+        return bool(self.size)
+
+    @staticmethod
+    def _get_key(context, node_id, task_id):
+        cluster_id = utils.get_in(context.new, 'common', 'cluster', 'id')
+        return cluster_id, task_id, node_id
+
+    def get(self, context, tasks_context, node_id, task):
+        """Gets the serialized task if its inputs are not changed.
+
+        :param context: the transaction context
+        :param tasks_context: the context of tasks serializers
+        :param node_id: the target node_id
+        :param task: the task template
+        :return: the copy of serialized task or None
+        """
+        entry = self._tasks.get(self._get_key(context, node_id, task['id']))
+        if entry is None:
+            return None
+
+        reads, digest, serialized = entry
+        if tasks_context.get_inputs_digest(node_id, task, reads) != digest:
+            return None
+        return copy.deepcopy(serialized)
+
+    def put(self, context, node_id, serialized, inputs):
+        """Stores the serialized task.
+
+        :param context: the transaction context
+        :param node_id: the target node_id
+        :param serialized: the serialized task
+        :param inputs: the tuple (reads, digest)
+        """
+        reads, digest = inputs
+        self._tasks.put(
+            self._get_key(context, node_id, serialized['id']),
+            (reads, digest, copy.deepcopy(serialized))
+        )
+
+    def clear(self):
+        self._tasks.clear()
+
+
+serialized_tasks_cache = SerializedTasksCache(
+    settings.LCM_SERIALIZATION_CACHE_SIZE
+)
+
+
 class TransactionSerializer(object):
     """The deploy tasks serializer."""
 
@@ -140,6 +312,11 @@ class TransactionSerializer(object):
         # and deployment will not be interrupted
         self.fault_tolerance_groups = []
         self.concurrency_policy = get_concurrency_policy()
+        self.tasks_cache = serialized_tasks_cache
+        # the names of all tasks in graph and the mapping
+        # name of task or pattern -> names of matched tasks
+        self.tasks_names = frozenset()
+        self.tasks_names_index = None
 
     @classmethod
     def serialize(cls, context, tasks, role_resolver):
@@ -158,6 +335,10 @@ class TransactionSerializer(object):
             tasks_graph[node_id] = list(
                 six.itervalues(tasks_graph[node_id])
             )
+        logger.info(
+            "Roles of tasks were resolved, the resolver stats: %s",
+            role_resolver.get_stats()
+        )
 
         return (
             serializer.tasks_dictionary,
@@ -193,11 +374,7 @@ class TransactionSerializer(object):
         :param tasks: the deployment tasks
         :return the mapping tasks per node
         """
-        serialized = self.concurrency_policy.execute(
-            self.context,
-            self.serializer_factory_class,
-            self.expand_tasks(tasks)
-        )
+        serialized = self.serialize_tasks(self.expand_tasks(tasks))
 
         for node_and_task in serialized:
             node_id, task = node_and_task
@@ -210,6 +387,70 @@ class TransactionSerializer(object):
 
         # make sure that null node is present
         self.tasks_graph.setdefault(None, {})
+        self.build_tasks_names_index()
+
+    def serialize_tasks(self, tasks):
+        """Serializes tasks, reuses ones which inputs are not changed.
+
+        :param tasks: the sequence of (node_id, task template)
+        :return: the sequence of (node_id, serialized task)
+        """
+        cache = self.tasks_cache
+        if not cache.enabled:
+            for node_id, task, _ in self.concurrency_policy.execute(
+                    self.context, self.serializer_factory_class, tasks):
+                yield node_id, task
+            return
+
+        tasks_context = self.serializer_factory_class(self.context).context
+        changed = []
+        reused = 0
+        for node_id, task in tasks:
+            serialized = cache.get(self.context, tasks_context, node_id, task)
+            if serialized is None:
+                changed.append((node_id, task))
+            else:
+                reused += 1
+                yield node_id, serialized
+
+        logger.info(
+            "%d tasks are reused, %d tasks are serialized",
+            reused, len(changed)
+        )
+        serialized = self.concurrency_policy.execute(
+            self.context, self.serializer_factory_class, changed,
+            track_inputs=True
+        )
+        for node_id, task, inputs in serialized:
+            cache.put(self.context, node_id, task, inputs)
+            yield node_id, task
+
+    def build_tasks_names_index(self):
+        """Builds the index to lookup tasks by name or pattern."""
+        names = set()
+        for node_tasks in six.itervalues(self.tasks_graph):
+            names.update(node_tasks)
+        self.tasks_names = frozenset(names)
+        self.tasks_names_index = {}
+
+    def find_tasks_names(self, name):
+        """Finds names of all tasks in graph which match the name.
+
+        :param name: the name of task or pattern
+        :return: the sequence of names of tasks
+        """
+        if self.tasks_names_index is None:
+            self.build_tasks_names_index()
+
+        try:
+            return self.tasks_names_index[name]
+        except KeyError:
+            pass
+
+        match_policy = NameMatchingPolicy.create(name)
+        matched = tuple(n for n in self.tasks_names if match_policy.match(n))
+        self.tasks_names_index[name] = matched
+        return matched
 
     def expand_tasks(self, tasks):
         groups = []
@@ -340,13 +581,17 @@ class TransactionSerializer(object):
         :param node_ids: the ID of nodes where need to search
         :param excludes: the nodes to exclude
         """
-        match_policy = NameMatchingPolicy.create(name)
+        tasks_names = self.find_tasks_names(name)
         for node_id in node_ids:
-            for task_name in self.tasks_graph.get(node_id, ()):
+            node_tasks = self.tasks_graph.get(node_id)
+            if not node_tasks:
+                continue
+            for task_name in tasks_names:
+                if task_name not in node_tasks:
+                    continue
                 if excludes and (task_name, node_id) in excludes:
                     continue
-                if match_policy.match(task_name):
-                    yield task_name, node_id
+                yield task_name, node_id
 
     @classmethod
     def need_update_task(cls, tasks, task):
@@ -12,20 +12,27 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import atexit
 import datetime
 import hashlib
 import itertools
+import threading
+import time
+
 import six
+from six.moves import queue
 
 from nailgun.middleware import utils
 
 from nailgun.db import db
 from nailgun.db.sqlalchemy.models import ActionLog
+from nailgun.logger import logger
+from nailgun.settings import settings
 
 from nailgun import consts
 
 
-compiled_urls_actions_mapping = utils.compile_mapping_keys(
+urls_actions_router = utils.compile_mapping_router(
     {
         r'.*/clusters/(?P<cluster_id>\d+)/changes/?$': {
             'action_name': 'deploy_changes',
@@ -118,18 +125,148 @@ compiled_urls_actions_mapping = utils.compile_mapping_keys(
 )
 
 
+class ActionLogWriter(object):
+    """Writes action log entries to DB in the current session."""
+
+    def write(self, entry):
+        db.add(ActionLog(**entry))
+        db.commit()
+
+
+class AsyncActionLogWriter(ActionLogWriter):
+    """Writes action log entries to DB in the background thread.
+
+    Entries are put to the bounded queue and inserted to DB by batches,
+    entries which do not fit into the queue are dropped. Entries, which
+    waited longer than max_delay seconds to be written, are counted as
+    late ones.
+    """
+
+    def __init__(self, queue_size, batch_size, flush_interval, max_delay):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_delay = max_delay
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self.late = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.run, name='action-log-writer')
+        self._thread.daemon = True
+        self._thread.start()
+        # the queued entries are written before the process exits
+        atexit.register(self.stop)
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def write(self, entry):
+        try:
+            self.queue.put_nowait((time.time(), entry))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def get_stats(self):
+        return {
+            'queued': self.queue.qsize(),
+            'written': self.written,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'late': self.late,
+        }
+
+    def run(self):
+        dropped = 0
+        while not (self._stop_event.is_set() and self.queue.empty()):
+            batch = self._get_batch()
+            if batch:
+                self.flush(batch)
+            if self.dropped != dropped:
+                dropped = self.dropped
+                logger.warning(
+                    'Action log queue is full, entries written: %(written)d, '
+                    'failed: %(failed)d, dropped: %(dropped)d, '
+                    'late: %(late)d', self.get_stats())
+
+    def flush(self, batch):
+        now = time.time()
+        self.late += sum(
+            1 for queued_at, _ in batch if now - queued_at > self.max_delay)
+        try:
+            db().execute(
+                ActionLog.__table__.insert(), [entry for _, entry in batch])
+            db().commit()
+            self.written += len(batch)
+        except Exception:
+            logger.exception('Failed to write %d action log entries',
+                             len(batch))
+            db().rollback()
+            self.failed += len(batch)
+        finally:
+            db.remove()
+
+    def _get_batch(self):
+        batch = []
+        deadline = time.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+
+_action_log_writer = None
+_action_log_writer_lock = threading.Lock()
+
+
+def get_action_log_writer():
+    """Get the writer of action logs shared by the process.
+
+    Entries are written in the background if ACTION_LOG_QUEUE_SIZE
+    is set, otherwise they are written in the request session.
+    """
+    global _action_log_writer
+
+    with _action_log_writer_lock:
+        if _action_log_writer is None:
+            if settings.ACTION_LOG_QUEUE_SIZE:
+                _action_log_writer = AsyncActionLogWriter(
+                    queue_size=settings.ACTION_LOG_QUEUE_SIZE,
+                    batch_size=settings.ACTION_LOG_BATCH_SIZE,
+                    flush_interval=settings.ACTION_LOG_FLUSH_INTERVAL,
+                    max_delay=settings.ACTION_LOG_MAX_DELAY)
+                _action_log_writer.start()
+            else:
+                _action_log_writer = ActionLogWriter()
+        return _action_log_writer
+
+
 class ConnectionMonitorMiddleware(object):
 
     methods_to_analyze = ('POST', 'PUT', 'DELETE', 'PATCH')
 
-    def __init__(self, app):
+    def __init__(self, app, action_log_writer=None):
         self.app = app
         self.status = None
+        self.action_log_writer = action_log_writer
 
     def __call__(self, env, start_response):
         if env['REQUEST_METHOD'] in self.methods_to_analyze:
-            url_matcher = self._get_url_matcher(url=env['PATH_INFO'])
-            if url_matcher:
+            action, url_match = urls_actions_router.match(env['PATH_INFO'])
+            if action is not None:
                 request_body = utils.get_body_from_env(env)
 
                 def save_headers_start_response(status, headers, *args):
@@ -150,49 +287,33 @@ class ConnectionMonitorMiddleware(object):
                 response = self.app(env, save_headers_start_response)
                 create_kwargs['end_timestamp'] = datetime.datetime.utcnow()
 
-                # since responce is iterator to avoid its exhaustion in
-                # analysing process we make two copies of it: one to be
-                # processed in stats collection logic and the other to
-                # propagate further on middleware stack
-                response_to_analyse, response_to_propagate = \
-                    itertools.tee(response)
-
-                create_kwargs['action_name'] = \
-                    compiled_urls_actions_mapping[url_matcher]['action_name']
-                create_kwargs['action_group'] = \
-                    compiled_urls_actions_mapping[url_matcher]['action_group']
+                create_kwargs['action_name'] = action['action_name']
+                create_kwargs['action_group'] = action['action_group']
 
                 create_kwargs['action_type'] = \
                     consts.ACTION_TYPES.http_request
 
-                create_kwargs['additional_info'] = \
-                    self._get_additional_info(env,
-                                              request_body,
-                                              response_to_analyse)
+                response_data, response = self._get_response_data(response)
+                create_kwargs['additional_info'] = {
+                    'request_data': self._get_request_data(env, request_body),
+                    'response_data': response_data
+                }
 
                 # get cluster_id from url
-                cluster_id = utils.get_group_from_matcher(url_matcher,
-                                                          env['PATH_INFO'],
-                                                          'cluster_id')
+                cluster_id = url_match.groupdict().get('cluster_id')
                 if cluster_id:
                     cluster_id = int(cluster_id)
 
                 create_kwargs['cluster_id'] = cluster_id
 
-                db.add(ActionLog(**create_kwargs))
-                db.commit()
+                if self.action_log_writer is None:
+                    self.action_log_writer = get_action_log_writer()
+                self.action_log_writer.write(create_kwargs)
 
-                return response_to_propagate
+                return response
 
         return self.app(env, start_response)
 
-    def _get_url_matcher(self, url):
-        for url_matcher in six.iterkeys(compiled_urls_actions_mapping):
-            if url_matcher.match(url):
-                return url_matcher
-
-        return None
-
     def _get_actor_id(self, env):
         token_id = env.get('HTTP_X_AUTH_TOKEN')
 
@@ -201,13 +322,6 @@ class ConnectionMonitorMiddleware(object):
 
         return hashlib.sha256(token_id).hexdigest()
 
-    def _get_additional_info(self, env, request_body, response_to_analyse):
-        additional_info = {
-            'request_data': self._get_request_data(env, request_body),
-            'response_data': self._get_response_data(response_to_analyse)
-        }
-        return additional_info
-
     def _get_request_data(self, env, request_body):
         request_data = {
             'http_method': env['REQUEST_METHOD'],
@@ -222,7 +336,8 @@ class ConnectionMonitorMiddleware(object):
 
         :param response_iterator: iterator over response data
         :returns: python dict with response data, status and
-        http message if any
+        http message if any; and the iterator over the whole
+        response data to propagate further on middleware stack
         """
         response_data = {
             'status': self.status,
@@ -232,7 +347,10 @@ class ConnectionMonitorMiddleware(object):
         # check whether request was failed
         if not self.status.startswith('20'):
             # useful data always will be stored in first element of
-            # response
-            response_data['data'] = {'message': six.next(response_iterator)}
+            # response, so only this element is read and then
+            # put back in front of the rest of response
+            message = six.next(response_iterator)
+            response_data['data'] = {'message': message}
+            response_iterator = itertools.chain((message,), response_iterator)
 
-        return response_data
+        return response_data, response_iterator
@@ -21,7 +21,9 @@ import six
 
 from nailgun.api.v1 import urls as api_urls
 from nailgun.fake_keystone import validate_token
+from nailgun.middleware import utils
 from nailgun.settings import settings
+from nailgun.utils import routing
 
 from keystonemiddleware import auth_token
 
@@ -44,7 +46,8 @@ class CookieTokenMixin(object):
     for a particular set of urls, from a cookie.
     """
 
-    cookie_routes_regexs = [re.compile(r) for r in api_urls.cookie_urls()]
+    cookie_routes = routing.Router(
+        (r, True) for r in api_urls.cookie_urls())
 
     def get_auth_token(self, env):
         token = env.get('HTTP_X_AUTH_TOKEN', '')
@@ -52,7 +55,7 @@ class CookieTokenMixin(object):
             return token
 
         path = env.get('PATH_INFO', '/')
-        if any(r.match(path) for r in self.cookie_routes_regexs):
+        if self.cookie_routes.match(path)[0]:
             c = Cookie.SimpleCookie(env.get('HTTP_COOKIE', ''))
             token = c.get('token')
             if token:
@@ -64,11 +67,10 @@ class CookieTokenMixin(object):
 class SkipAuthMixin(object):
     """Skips verification of authentication tokens for public routes in API."""
     def __init__(self, app):
-        self.public_api_routes = {}
         self.app = app
         try:
-            for route_tpl, methods in six.iteritems(public_urls()):
-                self.public_api_routes[re.compile(route_tpl)] = methods
+            self.public_api_routes = utils.compile_mapping_router(
+                public_urls())
         except re.error as e:
             msg = 'Cannot compile public API routes: {0}'.format(e)
             raise Exception(msg)
@@ -82,12 +84,8 @@ class SkipAuthMixin(object):
         # The information whether the API call is being performed against the
         # public API may be useful. Saving it to the
         # WSGI environment is reasonable thereby.
-        env['is_public_api'] = False
-        for pattern, methods in six.iteritems(self.public_api_routes):
-            if re.match(pattern, path):
-                if method in methods:
-                    env['is_public_api'] = True
-                    break
+        methods, _ = self.public_api_routes.match(path)
+        env['is_public_api'] = methods is not None and method in methods
 
         if env['is_public_api']:
             return self.app(env, start_response)
@@ -15,6 +15,8 @@
 import re
 import six
 
+from nailgun.utils import routing
+
 
 def get_body_from_env(env):
     """Exctracts request body from wsgi environment variable"""
@@ -36,6 +38,14 @@ def compile_mapping_keys(mapping):
     )
 
 
+def compile_mapping_router(mapping):
+    """Compiles mapping {pattern: value} into routing.Router
+
+    Patterns are matched in the sorted order.
+    """
+    return routing.Router(sorted(six.iteritems(mapping)))
+
+
 def get_group_from_matcher(matcher_obj, string_to_match, group_name):
     """Get value corresponding to group_name if it's present in matcher_obj"""
     matched = matcher_obj.match(string_to_match)
@@ -39,6 +39,10 @@ from nailgun.objects.cluster import VmwareAttributes
 from nailgun.objects.task import Task
 from nailgun.objects.task import TaskCollection
 
+from nailgun.objects.node_deployment_info import DeploymentInfoSnapshot
+from nailgun.objects.node_deployment_info import \
+    DeploymentInfoSnapshotCollection
+
 from nailgun.objects.transaction import Transaction
 from nailgun.objects.transaction import TransactionCollection
 
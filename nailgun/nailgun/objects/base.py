@@ -26,8 +26,10 @@ import operator
 from oslo_serialization import jsonutils
 import six
 
-from sqlalchemy import and_, not_
+from sqlalchemy import and_, cast, literal, not_, or_
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import load_only
 from sqlalchemy.orm import Query
 
 from nailgun.objects.serializers.base import BasicSerializer
@@ -166,6 +168,10 @@ class NailgunCollection(object):
     #: Single object class
     single = NailgunObject
 
+    #: Model columns, that are used by serializer regardless
+    #: of the requested fields
+    required_columns = ('id',)
+
     @classmethod
     def _is_iterable(cls, obj):
         return isinstance(
@@ -251,11 +257,44 @@ class NailgunCollection(object):
         else:
             return cls._iterable_order_by(iterable, order_by)
 
+    @classmethod
+    def _get_field_value(cls, instance, name):
+        """Get value of field, name may contain JSON path after dot."""
+        path = name.split('.')
+        value = getattr(instance, path[0])
+        for key in path[1:]:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+
+    @classmethod
+    def _get_json_path_condition(cls, name, value):
+        """Get SQL condition for value of JSON path of JSONB field.
+
+        :param name: the field name followed by keys separated by dots
+        :param value: the expected value
+        :returns: SQLAlchemy expression
+        """
+        path = name.split('.')
+        column = getattr(cls.single.model, path[0])
+        element = column[tuple(path[1:])]
+        if value is None:
+            # the missing key and JSON null are the same as for iterables
+            return or_(
+                element.is_(None),
+                element == cast(literal('null'), column.type)
+            )
+        return element == cast(value, column.type)
+
     @classmethod
     def filter_by(cls, iterable, **kwargs):
         """Filter given iterable by specified kwargs.
 
-        In case if iterable=None filters all object instances
+        In case if iterable=None filters all object instances.
+        The name of JSONB field may be followed by the path of keys
+        separated by dots, e.g. **{'meta.system.manufacturer': 'Dell'},
+        so the value inside JSON document is filtered by database.
 
         :param iterable: iterable (SQLAlchemy query)
         :param order_by: tuple of model fields names for ORDER BY criterion
@@ -268,11 +307,21 @@ class NailgunCollection(object):
         else:
             use_iterable = cls.all()
         if cls._is_query(use_iterable):
-            return use_iterable.filter_by(**kwargs)
+            json_paths = dict(
+                (k, kwargs.pop(k)) for k in list(kwargs) if '.' in k)
+            if kwargs:
+                use_iterable = use_iterable.filter_by(**kwargs)
+            if json_paths:
+                use_iterable = use_iterable.filter(*(
+                    cls._get_json_path_condition(k, v)
+                    for k, v in six.iteritems(json_paths)
+                ))
+            return use_iterable
         elif cls._is_iterable(use_iterable):
             return ifilter(
                 lambda i: all(
-                    (getattr(i, k) == v for k, v in six.iteritems(kwargs))
+                    (cls._get_field_value(i, k) == v
+                     for k, v in six.iteritems(kwargs))
                 ),
                 use_iterable
             )
@@ -439,6 +488,65 @@ class NailgunCollection(object):
             )
         )
 
+    @classmethod
+    def load_only(cls, query, fields):
+        """Restrict columns, that are loaded from DB, to the given fields
+
+        Fields, that are not model columns, are loaded on access
+        as usual, for relations the foreign keys are loaded as well.
+
+        :param query: SQLAlchemy query
+        :param fields: names of fields to load
+        :returns: SQLAlchemy query
+        """
+        mapper = sa_inspect(cls.single.model)
+        columns = set(mapper.column_attrs.keys())
+        names = set(fields)
+        names.update(cls.required_columns)
+        for name in fields:
+            if name in mapper.relationships:
+                names.update(
+                    c.key for c in mapper.relationships[name].local_columns)
+        return query.options(load_only(*(names & columns)))
+
+    @classmethod
+    def iter_chunks(cls, query, chunk_size, marker=None, offset=None,
+                    limit=None):
+        """Fetch objects from DB by chunks ordered by id
+
+        Every next chunk is selected by id of the last object
+        of the previous one, so fetching of a chunk does not
+        depend on its position in the collection.
+
+        :param query: SQLAlchemy query
+        :param chunk_size: the max number of objects in chunk
+        :param marker: id of object, after which objects are fetched
+        :param offset: the number of objects to skip
+        :param limit: the max number of objects to fetch
+        :returns: generator of lists of objects (models) instances
+        """
+        model = cls.single.model
+        query = query.order_by(None).order_by(model.id)
+        last_id = marker
+        while limit is None or limit > 0:
+            size = chunk_size if limit is None else min(chunk_size, limit)
+            # the current session is used for every chunk, because
+            # the generator can outlive the session of request
+            chunk_query = query.with_session(db())
+            if last_id is not None:
+                chunk_query = chunk_query.filter(model.id > last_id)
+            if offset:
+                chunk_query = chunk_query.offset(offset)
+                offset = None
+            chunk = chunk_query.limit(size).all()
+            if chunk:
+                yield chunk
+            if len(chunk) < size:
+                break
+            last_id = chunk[-1].id
+            if limit is not None:
+                limit -= len(chunk)
+
     @classmethod
     def create(cls, data):
         """Create object instance with specified parameters in DB
@@ -42,6 +42,8 @@ from nailgun.logger import logger
 from nailgun.objects import DeploymentGraph
 from nailgun.objects import NailgunCollection
 from nailgun.objects import NailgunObject
+from nailgun.objects.node_deployment_info import \
+    DeploymentInfoSnapshotCollection
 from nailgun.objects.plugin import ClusterPlugin
 from nailgun.objects import Release
 from nailgun.objects.serializers.cluster import ClusterSerializer
@@ -51,10 +53,48 @@ from nailgun.settings import settings
 from nailgun.utils import AttributesGenerator
 from nailgun.utils import dict_merge
 from nailgun.utils import dict_update
+from nailgun.utils import ReadOnlyDict
 from nailgun.utils import text_format_safe
 from nailgun.utils import traverse
 
 
+#: models which change affects merged cluster attributes
+_ATTRIBUTES_DEPENDENCIES = (
+    models.Attributes,
+    models.Cluster,
+    models.ClusterPlugin,
+    models.Plugin,
+    models.Release,
+)
+_ATTRIBUTES_CACHE = 'cluster_attributes_cache'
+_ATTRIBUTES_REVISION = 'cluster_attributes_revision'
+
+
+def _bump_attributes_revision(session):
+    session.info[_ATTRIBUTES_REVISION] = \
+        session.info.get(_ATTRIBUTES_REVISION, 0) + 1
+
+
+@sa.event.listens_for(sa.orm.Session, 'after_flush')
+def _on_after_flush(session, flush_context):
+    changed = itertools.chain(session.new, session.dirty, session.deleted)
+    if any(isinstance(o, _ATTRIBUTES_DEPENDENCIES) for o in changed):
+        _bump_attributes_revision(session)
+
+
+@sa.event.listens_for(sa.orm.Session, 'after_bulk_update')
+@sa.event.listens_for(sa.orm.Session, 'after_bulk_delete')
+def _on_after_bulk_operation(context):
+    _bump_attributes_revision(context.session)
+
+
+@sa.event.listens_for(sa.orm.Session, 'after_commit')
+@sa.event.listens_for(sa.orm.Session, 'after_rollback')
+def _on_transaction_end(session):
+    # other processes may change the data after the transaction ends
+    session.info.pop(_ATTRIBUTES_CACHE, None)
+
+
 class Attributes(NailgunObject):
     """Cluster attributes object."""
 
@@ -262,6 +302,7 @@ class Cluster(NailgunObject):
         fire_callback_on_node_collection_delete(node_ids)
         fire_callback_on_cluster_delete(instance)
         super(Cluster, cls).delete(instance)
+        DeploymentInfoSnapshotCollection.delete_unused()
 
     @classmethod
     def get_default_kernel_params(cls, instance):
@@ -328,14 +369,21 @@ class Cluster(NailgunObject):
         return editable
 
     @classmethod
-    def get_attributes(cls, instance, all_plugins_versions=False):
-        """Get attributes for current Cluster instance.
+    def _get_merged_attributes(cls, instance, all_plugins_versions):
+        """Get attributes merged with plugins' ones, cached per session.
+
+        The cache is keyed by a revision which is bumped on every flush
+        of models the attributes depend on and is dropped at the end of
+        the transaction. The returned data is shared and must not be
+        changed.
 
         :param instance: Cluster instance
         :param all_plugins_versions: Get attributes of all versions of plugins
-        :returns: dict
+        :returns: tuple (attributes, editable, generated)
         """
         try:
+            # the query also flushes pending changes, so the revision
+            # is actual after it
             attrs = db().query(models.Attributes).filter(
                 models.Attributes.cluster_id == instance.id
             ).one()
@@ -349,7 +397,18 @@ class Cluster(NailgunObject):
                 u"No attributes were found for cluster '{0}'"
                 .format(instance.name)
             )
-        attrs = copy.deepcopy(attrs)
+
+        session = db()
+        revision = session.info.get(_ATTRIBUTES_REVISION, 0)
+        cache = session.info.setdefault(_ATTRIBUTES_CACHE, {})
+        key = (instance.id, all_plugins_versions)
+        # changes which are not flushed yet are not tracked by revision
+        modified = (sa.inspect(attrs).modified or
+                    sa.inspect(instance).modified)
+
+        cached = cache.get(key)
+        if not modified and cached is not None and cached[0] == revision:
+            return (attrs,) + cached[1:]
 
         # Merge plugins attributes into editable ones
         plugin_attrs = PluginManager.get_plugins_attributes(
@@ -361,19 +420,48 @@ class Cluster(NailgunObject):
             formatter_context={'cluster': instance, 'settings': settings},
             keywords={'generator': AttributesGenerator.evaluate}
         )
-        attrs['editable'].update(plugin_attrs)
+        editable = copy.deepcopy(dict(attrs.editable or {}))
+        editable.update(plugin_attrs)
+        generated = copy.deepcopy(dict(attrs.generated or {}))
 
-        return attrs
+        if modified:
+            cache.pop(key, None)
+        else:
+            cache[key] = (revision, editable, generated)
+        return attrs, editable, generated
+
+    @classmethod
+    def get_attributes(cls, instance, all_plugins_versions=False):
+        """Get attributes for current Cluster instance.
+
+        :param instance: Cluster instance
+        :param all_plugins_versions: Get attributes of all versions of plugins
+        :returns: detached copy of Attributes which may be changed freely
+        """
+        attrs, editable, generated = cls._get_merged_attributes(
+            instance, all_plugins_versions)
+        return models.Attributes(
+            id=attrs.id,
+            cluster_id=attrs.cluster_id,
+            editable=copy.deepcopy(editable),
+            generated=copy.deepcopy(generated),
+        )
 
     @classmethod
-    def get_editable_attributes(cls, instance, all_plugins_versions=False):
+    def get_editable_attributes(cls, instance, all_plugins_versions=False,
+                                readonly=False):
         """Get editable attributes for current Cluster instance.
 
         :param instance: Cluster instance
         :param all_plugins_versions: Get attributes of all versions of plugins
-        :return: dict
+        :param readonly: return read-only view instead of copy
+        :return: dict or ReadOnlyDict if readonly is True
         """
-        return cls.get_attributes(instance, all_plugins_versions)['editable']
+        _, editable, _ = cls._get_merged_attributes(
+            instance, all_plugins_versions)
+        if readonly:
+            return ReadOnlyDict(editable)
+        return copy.deepcopy(editable)
 
     @classmethod
     def update_attributes(cls, instance, data):
@@ -1591,7 +1679,8 @@ class Cluster(NailgunObject):
         :return: dict with models
         """
         return {
-            'settings': attrs or cls.get_editable_attributes(instance),
+            'settings': attrs or cls.get_editable_attributes(
+                instance, readonly=True),
             'cluster': instance,
             'version': settings.VERSION,
             'networking_parameters': instance.network_config,
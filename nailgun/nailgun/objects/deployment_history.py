@@ -17,6 +17,7 @@
 from datetime import datetime
 import six
 
+import sqlalchemy as sa
 from sqlalchemy.orm import undefer
 
 from nailgun.consts import HISTORY_TASK_STATUSES
@@ -140,6 +141,62 @@ class DeploymentHistoryCollection(NailgunCollection):
 
         db().bulk_save_objects(entries)
 
+    @classmethod
+    def bulk_update_if_exist(cls, task_id, updates):
+        """Updates the history of several tasks at once.
+
+        All history records are selected by one query, the status
+        transitions are the same as in DeploymentHistory.update_if_exist.
+
+        :param task_id: the ID of transaction
+        :param updates: the list of tuples
+                        (node_id, deployment_graph_task_name, status,
+                         summary, custom) in order of arrival
+        """
+        if not updates:
+            return
+
+        model = cls.single.model
+        keys = set()
+        null_node_tasks = set()
+        for node_id, task_name, _, _, _ in updates:
+            if node_id is None:
+                null_node_tasks.add(task_name)
+            else:
+                keys.add((node_id, task_name))
+
+        criteria = []
+        if keys:
+            criteria.append(
+                sa.tuple_(
+                    model.node_id, model.deployment_graph_task_name
+                ).in_(list(keys))
+            )
+        if null_node_tasks:
+            criteria.append(sa.and_(
+                model.node_id.is_(None),
+                model.deployment_graph_task_name.in_(list(null_node_tasks))
+            ))
+
+        query = cls.options(None, undefer('summary')).filter(
+            model.task_id == task_id, sa.or_(*criteria)
+        )
+        history_records = {
+            (x.node_id, x.deployment_graph_task_name): x for x in query
+        }
+
+        for node_id, task_name, status, summary, custom in updates:
+            history_record = history_records.get((node_id, task_name))
+            if history_record is None:
+                logger.warn("Failed to find task in history for transaction "
+                            "id %s, node_id %s and deployment_graph_task_name"
+                            " %s", task_id, node_id, task_name)
+                continue
+
+            getattr(cls.single, 'to_{0}'.format(status))(history_record)
+            history_record.custom.update(custom or {})
+            history_record.summary.update(summary or {})
+
     @classmethod
     def get_history(cls, transaction, nodes_ids=None, statuses=None,
                     tasks_names=None, include_summary=False):
@@ -21,6 +21,7 @@ Node-related objects and collections
 import collections
 import copy
 from datetime import datetime
+import hashlib
 import itertools
 import math
 import operator
@@ -600,9 +601,16 @@ class Node(NailgunObject):
         roles = data.pop("roles", None)
         pending_roles = data.pop("pending_roles", None)
         new_meta = data.pop("meta", None)
+        is_agent = bool(data.pop('is_agent', None))
+
+        changed_sections = ()
+        if new_meta:
+            changed_sections = cls.get_changed_meta_sections(
+                instance, new_meta, is_agent)
 
         disks_changed = None
-        if new_meta and "disks" in new_meta and "disks" in instance.meta:
+        if "disks" in changed_sections and "disks" in new_meta and \
+                "disks" in instance.meta:
             key = operator.itemgetter("name")
 
             new_disks = sorted(new_meta["disks"], key=key)
@@ -615,24 +623,31 @@ class Node(NailgunObject):
             cluster_id = data.pop("cluster", None)
             data["cluster_id"] = cluster_id
 
-        if new_meta:
+        if changed_sections:
             instance.update_meta(new_meta)
             # The call to update_interfaces will execute a select query for
             # the current instance. This appears to overwrite the object in the
             # current session and we lose the meta changes.
             db().flush()
-            is_agent = bool(data.pop('is_agent', None))
+        if new_meta:
             if cls.is_interfaces_configuration_locked(instance, is_agent):
                 logger.debug("Interfaces are locked for update on node %s",
                              instance.human_readable_name)
+                # the interfaces will be applied by the next agent update
+                if instance.meta_checksums:
+                    instance.meta_checksums.pop('interfaces', None)
             else:
-                instance.ip = data.pop("ip", None) or instance.ip
-                instance.mac = data.pop("mac", None) or instance.mac
-                db().flush()
-                cls.update_interfaces(instance)
-                cls.update_interfaces_offloading_modes(
-                    instance,
-                    is_agent)
+                ip = data.pop("ip", None) or instance.ip
+                mac = data.pop("mac", None) or instance.mac
+                if "interfaces" in changed_sections or \
+                        (ip, mac) != (instance.ip, instance.mac):
+                    instance.ip = ip
+                    instance.mac = mac
+                    db().flush()
+                    cls.update_interfaces(instance)
+                    cls.update_interfaces_offloading_modes(
+                        instance,
+                        is_agent)
 
         cluster_changed = False
         add_to_cluster = False
@@ -708,6 +723,53 @@ class Node(NailgunObject):
 
         return instance
 
+    @classmethod
+    def get_meta_checksums(cls, meta):
+        """Calculates checksums of top-level sections of node meta.
+
+        The sections are e.g. 'cpu', 'disks', 'interfaces', 'memory'
+        and 'system'.
+
+        :param meta: node meta
+        :returns: dict of section name and checksum of its data
+        """
+        return dict(
+            (section, hashlib.sha1(
+                jsonutils.dumps(value, sort_keys=True).encode('utf-8')
+            ).hexdigest())
+            for section, value in six.iteritems(meta)
+        )
+
+    @classmethod
+    def get_changed_meta_sections(cls, instance, meta, is_agent=False):
+        """Gets sections of meta which are changed since the last update.
+
+        The checksums of sections reported by agent are saved in node,
+        the section is considered as changed if its checksum differs from
+        the saved one. The update from the other source is considered as
+        changing all sections and drops the saved checksums.
+
+        :param instance: Node instance
+        :param meta: the new node meta
+        :param is_agent: True if meta is reported by agent
+        :returns: set of names of changed sections
+        """
+        if not is_agent:
+            instance.meta_checksums = {}
+            return set(meta)
+
+        old_checksums = instance.meta_checksums or {}
+        new_checksums = cls.get_meta_checksums(meta)
+        changed = set(
+            section for section, checksum in six.iteritems(new_checksums)
+            if old_checksums.get(section) != checksum
+        )
+        if changed or set(old_checksums) != set(new_checksums):
+            # the removed sections are changed as well
+            changed.update(set(old_checksums) - set(new_checksums))
+            instance.meta_checksums = new_checksums
+        return changed
+
     @classmethod
     def reset_to_discover(cls, instance):
         """Flush database objects which is not consistent with actual node
@@ -1297,6 +1359,10 @@ class NodeCollection(NailgunCollection):
     #: Single Node object class
     single = Node
 
+    #: fqdn and status of node are always serialized
+    required_columns = ('id', 'hostname', 'status', 'progress',
+                        'pending_addition', 'pending_deletion')
+
     @classmethod
     def eager_nodes_handlers(cls, iterable):
         """Eager load objects instances that is used in nodes handler.
@@ -14,11 +14,127 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+
+from oslo_serialization import jsonutils
+import six
+import sqlalchemy as sa
+from sqlalchemy import exc as sa_exc
+
+from nailgun.db import db
 from nailgun.db.sqlalchemy import models
 from nailgun.objects import NailgunCollection
 from nailgun.objects import NailgunObject
 
 
+class DeploymentInfoSnapshot(NailgunObject):
+
+    model = models.DeploymentInfoSnapshot
+
+    @classmethod
+    def get_checksum(cls, deployment_info):
+        """Calculates the checksum of deployment info content.
+
+        :param deployment_info: the deployment info
+        :return: the hex digest
+        """
+        data = jsonutils.dumps(deployment_info, sort_keys=True)
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class DeploymentInfoSnapshotCollection(NailgunCollection):
+
+    single = DeploymentInfoSnapshot
+
+    @classmethod
+    def store(cls, deployment_infos):
+        """Stores the deployment info blobs, that are not stored yet.
+
+        :param deployment_infos: the sequence of deployment info
+        :return: the list of checksums in the same order as deployment_infos
+        """
+        checksums = []
+        new_snapshots = {}
+        for info in deployment_infos:
+            checksum = cls.single.get_checksum(info)
+            checksums.append(checksum)
+            new_snapshots[checksum] = info
+
+        if new_snapshots:
+            # the stored snapshots are locked, so they are not deleted
+            # as unused before the transaction, which refers them,
+            # is committed
+            for checksum in cls._lock_existing(list(new_snapshots)):
+                del new_snapshots[checksum]
+
+        if new_snapshots:
+            cls._insert(
+                [{'checksum': checksum, 'deployment_info': info}
+                 for checksum, info in sorted(six.iteritems(new_snapshots))]
+            )
+        return checksums
+
+    @classmethod
+    def _lock_existing(cls, checksums):
+        """Locks the stored snapshots for share.
+
+        :param checksums: the checksums of snapshots
+        :return: the checksums of stored snapshots
+        """
+        table = cls.single.model.__table__
+        existing = db().execute(
+            sa.select([table.c.checksum]).where(
+                table.c.checksum.in_(checksums)
+            ).order_by(table.c.checksum).with_for_update(read=True)
+        )
+        return [checksum for (checksum,) in existing]
+
+    @classmethod
+    def _insert(cls, snapshots):
+        """Inserts snapshots, that may be stored concurrently.
+
+        :param snapshots: the list of dicts with checksum and deployment_info
+        """
+        table = cls.single.model.__table__
+        try:
+            with db().begin_nested():
+                db().execute(table.insert(), snapshots)
+        except sa_exc.IntegrityError:
+            # the snapshots are stored by another transaction
+            # in the meantime, so they are inserted one by one
+            for snapshot in snapshots:
+                try:
+                    with db().begin_nested():
+                        db().execute(table.insert(), snapshot)
+                except sa_exc.IntegrityError:
+                    cls._lock_existing([snapshot['checksum']])
+
+    @classmethod
+    def delete_unused(cls):
+        """Deletes snapshots, those are not referred by any transaction."""
+        table = cls.single.model.__table__
+        node_di = models.NodeDeploymentInfo.__table__
+        is_unused = ~sa.exists().where(
+            node_di.c.snapshot_checksum == table.c.checksum
+        )
+        # the snapshots are locked the same way as in store, the new
+        # statement checks the references again, because the snapshot
+        # may be referred by transaction, that holds the lock
+        unused = [
+            checksum for (checksum,) in db().execute(
+                sa.select([table.c.checksum]).where(
+                    is_unused
+                ).order_by(table.c.checksum).with_for_update()
+            )
+        ]
+        if unused:
+            db().execute(
+                table.delete().where(
+                    sa.and_(table.c.checksum.in_(unused), is_unused)
+                )
+            )
+
+
 class NodeDeploymentInfo(NailgunObject):
 
     model = models.NodeDeploymentInfo
@@ -16,6 +16,7 @@
 
 from datetime import datetime
 
+from nailgun.db import db
 from nailgun.db.sqlalchemy import models
 
 from nailgun import errors
@@ -90,3 +91,23 @@ class Notification(NailgunObject):
 class NotificationCollection(NailgunCollection):
 
     single = Notification
+
+    @classmethod
+    def bulk_create(cls, notifications):
+        """Creates several notifications by the single query.
+
+        Unlike Notification.create the existing notifications
+        are not checked.
+
+        :param notifications: list of dicts with notification data
+        """
+        if not notifications:
+            return
+
+        model = cls.single.model
+        now = datetime.now()
+        for data in notifications:
+            data.setdefault("datetime", now)
+        db().execute(model.__table__.insert().values(notifications))
+        logger.info(u"Notifications: %d notifications are created",
+                    len(notifications))
@@ -16,14 +16,17 @@
 
 from datetime import datetime
 
+import six
+import sqlalchemy as sa
+
 from nailgun import consts
 from nailgun.db import db
 from nailgun.db.sqlalchemy import models
 from nailgun import errors
 from nailgun.objects import NailgunCollection
 from nailgun.objects import NailgunObject
-from nailgun.objects.node_deployment_info import NodeDeploymentInfo
-from nailgun.objects.node_deployment_info import NodeDeploymentInfoCollection
+from nailgun.objects.node_deployment_info import \
+    DeploymentInfoSnapshotCollection
 from nailgun.objects.serializers.transaction import TransactionSerializer
 
 
@@ -49,10 +52,18 @@ class Transaction(NailgunObject):
 
     @classmethod
     def attach_deployment_info(cls, instance, deployment_info):
-        for uid, dinfo in deployment_info['nodes'].items():
-            NodeDeploymentInfo.create({'task_id': instance.id,
-                                       'node_uid': uid,
-                                       'deployment_info': dinfo})
+        nodes_uids = list(deployment_info['nodes'])
+        checksums = DeploymentInfoSnapshotCollection.store(
+            deployment_info['nodes'][uid] for uid in nodes_uids
+        )
+        if nodes_uids:
+            db().execute(
+                models.NodeDeploymentInfo.__table__.insert(),
+                [{'task_id': instance.id,
+                  'node_uid': uid,
+                  'snapshot_checksum': checksum}
+                 for uid, checksum in six.moves.zip(nodes_uids, checksums)]
+            )
         if 'common' in deployment_info:
             instance.deployment_info = deployment_info['common']
 
@@ -61,14 +72,18 @@ class Transaction(NailgunObject):
         if instance is None:
             return {}
 
-        node_di_list = NodeDeploymentInfoCollection.filter_by(
-            None, task_id=instance.id)
+        query = _get_nodes_deployment_info_query().filter(
+            models.NodeDeploymentInfo.task_id == instance.id
+        )
         if node_uids:
-            node_di_list = NodeDeploymentInfoCollection.filter_by_list(
-                node_di_list, "node_uid", node_uids)
+            query = query.filter(
+                models.NodeDeploymentInfo.node_uid.in_(node_uids)
+            )
 
-        nodes_info = {node_di.node_uid: node_di.deployment_info
-                      for node_di in node_di_list}
+        nodes_info = {
+            node_uid: info for _, node_uid, info in
+            _iter_nodes_deployment_info(query)
+        }
         if nodes_info or instance.deployment_info:
             return {'common': instance.deployment_info or {},
                     'nodes': nodes_info}
@@ -101,6 +116,15 @@ class Transaction(NailgunObject):
         if instance is not None:
             return instance.tasks_snapshot
 
+    @classmethod
+    def attach_stats(cls, instance, stats):
+        instance.stats = stats
+
+    @classmethod
+    def get_stats(cls, instance):
+        if instance is not None:
+            return instance.stats
+
     @classmethod
     def on_start(cls, instance):
         cls.update(instance, {
@@ -197,3 +221,61 @@ class TransactionCollection(NailgunCollection):
             history.deployment_graph_task_name, history.node_id
         )
         return transactions
+
+    @classmethod
+    def get_deployment_info(cls, nodes_per_transaction):
+        """Gets deployment info of several transactions at once.
+
+        All requested data is loaded by two queries, one for the common
+        part of every transaction and one for all requested nodes,
+        each blob is decoded only once.
+
+        :param nodes_per_transaction: the mapping
+                                      {transaction: [node_uid, ...], ...}
+        :returns: {transaction: {'common': {...}, 'nodes': {...}}, ...}
+        """
+        if not nodes_per_transaction:
+            return {}
+
+        model = cls.single.model
+        transactions = {tx.id: tx for tx in nodes_per_transaction}
+        query = db().query(model.id, model.deployment_info).filter(
+            model.id.in_(list(transactions))
+        )
+        result = {
+            transactions[tx_id]: {'common': common or {}, 'nodes': {}}
+            for tx_id, common in query
+        }
+
+        node_di = models.NodeDeploymentInfo
+        criteria = [
+            sa.and_(node_di.task_id == tx.id, node_di.node_uid.in_(uids))
+            for tx, uids in six.iteritems(nodes_per_transaction) if uids
+        ]
+        if criteria:
+            query = _get_nodes_deployment_info_query().filter(
+                sa.or_(*criteria)
+            )
+            for tx_id, node_uid, info in _iter_nodes_deployment_info(query):
+                result[transactions[tx_id]]['nodes'][node_uid] = info
+        return result
+
+
+def _get_nodes_deployment_info_query():
+    node_di = models.NodeDeploymentInfo
+    snapshot = models.DeploymentInfoSnapshot
+    return db().query(
+        node_di.task_id,
+        node_di.node_uid,
+        node_di.deployment_info,
+        snapshot.deployment_info
+    ).outerjoin(snapshot, node_di.snapshot_checksum == snapshot.checksum)
+
+
+def _iter_nodes_deployment_info(query):
+    # the deployment info of records, which were created before
+    # snapshots, is stored in the record itself
+    for task_id, node_uid, legacy_info, snapshot_info in query:
+        if snapshot_info is None:
+            snapshot_info = legacy_info
+        yield task_id, node_uid, snapshot_info
@@ -39,6 +39,7 @@ from nailgun.orchestrator.provisioning_serializers import \
 
 from nailgun.extensions.network_manager.serializers import neutron_serializers
 from nailgun.extensions.network_manager.serializers import nova_serializers
+from nailgun.extensions.network_manager.snapshot import network_snapshot
 
 
 class DeploymentMultinodeSerializer(object):
@@ -879,10 +880,13 @@ def _invoke_serializer(serializer, cluster, nodes,
         )
 
     objects.Cluster.set_primary_roles(cluster, nodes)
-    return serializer.serialize(
-        cluster, nodes,
-        ignore_customized=ignore_customized, skip_extensions=skip_extensions
-    )
+    # network configuration of all nodes is loaded at once
+    with network_snapshot(cluster):
+        return serializer.serialize(
+            cluster, nodes,
+            ignore_customized=ignore_customized,
+            skip_extensions=skip_extensions
+        )
 
 
 def serialize(orchestrator_graph, cluster, nodes,
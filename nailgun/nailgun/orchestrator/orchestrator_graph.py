@@ -15,12 +15,16 @@
 #    under the License.
 
 from collections import defaultdict
+import functools
+import hashlib
 try:
     from collections import OrderedDict
 except ImportError:
     from ordereddict import OrderedDict
+import threading
 
 import networkx as nx
+from oslo_serialization import jsonutils
 import six
 
 from nailgun import consts
@@ -33,6 +37,121 @@ from nailgun.policy.name_match import NameMatchingPolicy
 from nailgun.utils.role_resolver import RoleResolver
 
 
+class CompiledGraph(object):
+    """Immutable form of the graph structure used for the traversal
+
+    Topological order, reachability and group membership are computed
+    once. Ancestors and descendants of each task are stored as bitsets
+    (python integers), where bit N stands for the task with position N
+    in the topological order.
+    """
+
+    __slots__ = ('order', 'index', 'ancestors', 'descendants', 'groups')
+
+    def __init__(self, graph):
+        self.order = tuple(nx.topological_sort(graph))
+        self.index = dict((n, i) for i, n in enumerate(self.order))
+
+        ancestors = [0] * len(self.order)
+        for i, node in enumerate(self.order):
+            for pred in graph.predecessors_iter(node):
+                j = self.index[pred]
+                ancestors[i] |= ancestors[j] | (1 << j)
+
+        descendants = [0] * len(self.order)
+        for i in six.moves.range(len(self.order) - 1, -1, -1):
+            for succ in graph.successors_iter(self.order[i]):
+                j = self.index[succ]
+                descendants[i] |= descendants[j] | (1 << j)
+
+        self.ancestors = tuple(ancestors)
+        self.descendants = tuple(descendants)
+        self.groups = OrderedDict(
+            (n, tuple(sorted(graph.predecessors_iter(n),
+                             key=self.index.__getitem__)))
+            for n, t in graph.nodes_iter(data=True)
+            if t.get('type') == consts.ORCHESTRATOR_TASK_TYPES.group
+        )
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def get_mask(self, nodes):
+        """Get bitset for the nodes, unknown nodes are ignored."""
+        mask = 0
+        for node in nodes:
+            i = self.index.get(node)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+
+    def get_ancestors_mask(self, node):
+        """Get bitset for the node and all nodes it is reachable from.
+
+        :raises: KeyError if there is no such node
+        """
+        i = self.index[node]
+        return self.ancestors[i] | (1 << i)
+
+    def get_descendants_mask(self, node):
+        """Get bitset for the node and all nodes reachable from it.
+
+        :raises: KeyError if there is no such node
+        """
+        i = self.index[node]
+        return self.descendants[i] | (1 << i)
+
+    def get_nodes(self, mask):
+        """Get the nodes from bitset in topological order."""
+        return [n for i, n in enumerate(self.order) if mask >> i & 1]
+
+
+class CompiledGraphCache(object):
+    """Thread-safe cache of compiled graphs keyed by graph content hash."""
+
+    def __init__(self, size):
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(graph):
+        data = jsonutils.dumps([
+            graph.nodes(),
+            graph.edges(),
+            [n for n, t in graph.nodes_iter(data=True)
+             if t.get('type') == consts.ORCHESTRATOR_TASK_TYPES.group]
+        ])
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def get(self, graph):
+        key = self.get_key(graph)
+        with self._lock:
+            compiled = self._items.pop(key, None)
+            if compiled is not None:
+                self._items[key] = compiled
+                return compiled
+
+        compiled = CompiledGraph(graph)
+        with self._lock:
+            self._items[key] = compiled
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+        return compiled
+
+
+compiled_graphs = CompiledGraphCache(size=32)
+
+
+def _resets_compiled(method):
+    """Drop the compiled form of the graph when its structure changes."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._compiled = None
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
 class GraphSolver(nx.DiGraph):
     """DirectedGraph used to generate configs for speficific orchestrators
 
@@ -64,10 +183,20 @@ class GraphSolver(nx.DiGraph):
         self.adj = self.adjlist_dict_factory()
         self.pred = self.adjlist_dict_factory()
         self.succ = self.adj  # successor
+        self._compiled = None
 
         if tasks is not None:
             self.add_tasks(tasks)
 
+    add_nodes_from = _resets_compiled(nx.DiGraph.add_nodes_from)
+    add_edges_from = _resets_compiled(nx.DiGraph.add_edges_from)
+    remove_node = _resets_compiled(nx.DiGraph.remove_node)
+    remove_nodes_from = _resets_compiled(nx.DiGraph.remove_nodes_from)
+    remove_edge = _resets_compiled(nx.DiGraph.remove_edge)
+    remove_edges_from = _resets_compiled(nx.DiGraph.remove_edges_from)
+    clear = _resets_compiled(nx.DiGraph.clear)
+
+    @_resets_compiled
     def add_node(self, n, **attr):
         if n not in self.succ:
             self.succ[n] = self.adjlist_dict_factory()
@@ -75,6 +204,7 @@ class GraphSolver(nx.DiGraph):
             self.node[n] = attr
         super(GraphSolver, self).add_node(n, **attr)
 
+    @_resets_compiled
     def add_edge(self, u, v, **attr):
         if u not in self.succ:
             self.succ[u] = self.adjlist_dict_factory()
@@ -109,10 +239,11 @@ class GraphSolver(nx.DiGraph):
     def _update_dependencies(self):
         """Create dependencies that rely on regexp matching."""
 
+        all_groups = self.get_group_names()
         for task in six.itervalues(self.node):
             # tasks and groups should be used for declaring dependencies
             # between tasks and roles (which are simply group of tasks)
-            available_groups = self.get_groups_subgraph().nodes()
+            available_groups = all_groups
             for group in task.get('groups', ()):
                 pattern = NameMatchingPolicy.create(group)
                 not_matched = []
@@ -137,6 +268,19 @@ class GraphSolver(nx.DiGraph):
         """Verify that graph doesnot contain any cycles in it."""
         return nx.is_directed_acyclic_graph(self)
 
+    def compile(self):
+        """Get the compiled form of the graph.
+
+        It is computed once and reused until the structure of the graph
+        is changed, graphs with the same content share the compiled form.
+
+        :returns: CompiledGraph instance
+        :raises: NetworkXUnfeasible if the graph contains cycles
+        """
+        if self._compiled is None:
+            self._compiled = compiled_graphs.get(self)
+        return self._compiled
+
     def get_next_groups(self, processed_nodes):
         """Get nodes that have predecessors in processed_nodes list.
 
@@ -146,35 +290,35 @@ class GraphSolver(nx.DiGraph):
         :param processed_nodes: set of nodes names
         :returns: list of nodes names
         """
+        compiled = self.compile()
+        not_processed = ~compiled.get_mask(processed_nodes)
         result = []
-        for node in self.nodes():
+        for node in self.nodes_iter():
             if node in processed_nodes:
                 continue
 
-            predecessors = nx.dfs_predecessors(self.reverse(), node)
-            if (set(predecessors.keys()) <= processed_nodes):
+            if not compiled.ancestors[compiled.index[node]] & not_processed:
                 result.append(node)
 
         return result
 
+    def get_group_names(self):
+        """Return names of all the groups of tasks."""
+        return [t['id'] for t in six.itervalues(self.node)
+                if t.get('type') == consts.ORCHESTRATOR_TASK_TYPES.group]
+
     def get_groups_subgraph(self):
         """Return subgraph containing all the groups of tasks."""
-        roles = [t['id'] for t in six.itervalues(self.node)
-                 if t.get('type') == consts.ORCHESTRATOR_TASK_TYPES.group]
-        return self.subgraph(roles)
+        return self.subgraph(self.get_group_names())
 
     def get_group_tasks(self, group_name):
-        rst = []
-        predecessors = self.predecessors(group_name)
-        for task in nx.topological_sort(self):
-
-            if task not in predecessors:
-                continue
-            elif self.should_exclude_task(task):
-                continue
-
-            rst.append(self.node[task])
-        return rst
+        compiled = self.compile()
+        tasks = compiled.groups.get(group_name)
+        if tasks is None:
+            tasks = sorted(self.predecessors(group_name),
+                           key=compiled.index.__getitem__)
+        return [self.node[task] for task in tasks
+                if not self.should_exclude_task(task)]
 
     def should_exclude_task(self, task):
         """Stores all conditions when task should be excluded from execution.
@@ -193,7 +337,7 @@ class GraphSolver(nx.DiGraph):
 
     @property
     def topology(self):
-        return map(lambda t: self.node[t], nx.topological_sort(self))
+        return map(lambda t: self.node[t], self.compile().order)
 
     def make_skipped_task(self, task):
         """Make some task in graph skipped
@@ -250,25 +394,27 @@ class GraphSolver(nx.DiGraph):
         :param start: task name
         :param include: iterable with task names
         :returns: GraphSolver instance (subgraph from original)
+        :raises: KeyError if start or end is not reachable
         """
-        working_graph = self
+        if not start and not end:
+            return self
+
+        compiled = self.compile()
+        mask = ~0
 
         if start:
-            # simply traverse starting from root,
+            # all the tasks reachable from start,
             # A->B, B->C, B->D, C->E
-            working_graph = self.subgraph(
-                nx.dfs_postorder_nodes(working_graph, start))
+            mask &= compiled.get_descendants_mask(start)
 
         if end:
-            # nx.dfs_postorder_nodes traverses graph from specified point
-            # to the end by following successors, here is example:
+            # all the tasks end is reachable from, here is example:
             # A->B, C->D, B->D , and we want to traverse up to the D
-            # for this we need to reverse graph and make it
-            # B->A, D->C, D->B and use dfs_postorder
-            working_graph = self.subgraph(nx.dfs_postorder_nodes(
-                working_graph.reverse(), end))
+            if not mask >> compiled.index[end] & 1:
+                raise KeyError(end)
+            mask &= compiled.get_ancestors_mask(end)
 
-        return working_graph
+        return self.subgraph(compiled.get_nodes(mask))
 
     def filter_subgraph(self, start=None, end=None, include=()):
         """Exclude tasks that is not meant to be executed
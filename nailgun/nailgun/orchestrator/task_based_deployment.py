@@ -448,6 +448,10 @@ class TasksSerializer(object):
             tasks_connections[node_id] = list(
                 six.itervalues(tasks_connections[node_id])
             )
+        logger.info(
+            "Roles of tasks were resolved, the resolver stats: %s",
+            serializer.role_resolver.get_stats()
+        )
         return tasks_dictionary, tasks_connections
 
     def resolve_nodes(self, tasks):
@@ -57,8 +57,8 @@ class ExpressionBasedTask(DeploymentHook):
     @property
     def _expression_context(self):
         return {'cluster': self.cluster,
-                'settings':
-                objects.Cluster.get_editable_attributes(self.cluster)}
+                'settings': objects.Cluster.get_editable_attributes(
+                    self.cluster, readonly=True)}
 
     def should_execute(self):
         if 'condition' not in self.task:
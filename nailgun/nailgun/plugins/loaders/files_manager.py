@@ -15,12 +15,22 @@
 #    under the License.
 
 import glob
+import hashlib
 import json
 import os
+import stat
+import tempfile
 
+import six
+from six.moves import cPickle as pickle
 import yaml
 
 from nailgun import errors
+from nailgun.logger import logger
+from nailgun.settings import settings
+
+#: libyaml based loader is several times faster than pure python one
+YamlLoader = getattr(yaml, 'CLoader', yaml.Loader)
 
 
 def deserializer_json(raw_data, *args, **kwargs):
@@ -35,7 +45,7 @@ def deserializer_json(raw_data, *args, **kwargs):
     return json.load(raw_data, *args, **kwargs)
 
 
-def deserializer_yaml(raw_data, loader=yaml.Loader, *args, **kwargs):
+def deserializer_yaml(raw_data, loader=YamlLoader, *args, **kwargs):
     """Load YAML data from file object.
 
     :param raw_data: raw data
@@ -117,6 +127,126 @@ SERIALIZERS = {
 }
 
 
+class FilesCache(object):
+    """On-disk cache of deserialized files.
+
+    Entries are stored in pickle format and keyed by file path,
+    an entry is used only if file mtime and size are not changed
+    since it was saved.
+    """
+
+    def __init__(self, path):
+        """Initialize cache.
+
+        :param path: cache directory, caching is disabled if it is None
+        :type path: str|None
+        """
+        self.path = path
+        self._is_trusted = None
+
+    def _check_path(self):
+        """Check that cache directory can be trusted.
+
+        The entries are unpickled, so they are used only if the directory
+        is owned by the process and is not writable by others.
+
+        :return: True if the directory can be used for cache
+        :rtype: bool
+        """
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path, 0o700)
+        except OSError as e:
+            # the directory may be created by another process
+            if not os.path.isdir(self.path):
+                logger.warning("Cannot create files cache %s: %s",
+                               self.path, e)
+                return False
+
+        path_stat = os.stat(self.path)
+        if (path_stat.st_uid != os.getuid() or
+                path_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)):
+            logger.warning(
+                "Files cache %s is disabled, the directory must be owned "
+                "by the process and must not be writable by others.",
+                self.path
+            )
+            return False
+        return True
+
+    def _get_entry_path(self, path):
+        key = hashlib.sha1(six.b(os.path.abspath(path))).hexdigest()
+        return os.path.join(self.path, key + '.pickle')
+
+    def _load_entry(self, entry_path, stamp):
+        try:
+            with open(entry_path, 'rb') as f:
+                entry_stamp, data = pickle.load(f)
+        except Exception as e:
+            if os.path.exists(entry_path):
+                logger.debug("Cannot load cache entry %s: %s", entry_path, e)
+            return None, False
+        return data, entry_stamp == stamp
+
+    def _save_entry(self, entry_path, stamp, data):
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.path)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((stamp, data), f, pickle.HIGHEST_PROTOCOL)
+            # rename is atomic, so concurrent readers get either
+            # old or new entry
+            os.rename(tmp_path, entry_path)
+        except Exception as e:
+            logger.debug("Cannot save cache entry %s: %s", entry_path, e)
+
+    def get(self, path, loader):
+        """Get deserialized file content.
+
+        :param path: path to file
+        :type path: str
+        :param loader: callable which deserializes file by path
+        :type loader: callable
+        :return: data
+        :rtype: list|dict
+        """
+        if self.path is None:
+            return loader(path)
+        if self._is_trusted is None:
+            self._is_trusted = self._check_path()
+        if not self._is_trusted:
+            return loader(path)
+
+        stat = os.stat(path)
+        stamp = (stat.st_mtime, stat.st_size)
+        entry_path = self._get_entry_path(path)
+        data, is_actual = self._load_entry(entry_path, stamp)
+        if not is_actual:
+            data = loader(path)
+            self._save_entry(entry_path, stamp, data)
+        return data
+
+
+#: deserializers which results are cached
+CACHED_FORMATS = frozenset(('json', 'yaml'))
+
+files_cache = FilesCache(settings.PLUGINS_CACHE_PATH)
+
+
+def load_yaml_file(path):
+    """Load YAML file using files cache.
+
+    :param path: path to file
+    :type path: str
+    :return: data
+    :rtype: list|dict
+    """
+    def loader(path):
+        with open(path, 'r') as f:
+            return deserializer_yaml(f.read())
+
+    return files_cache.get(path, loader)
+
+
 class FilesManager(object):
     """Files Manager is responsive for data serialization and files operations.
 
@@ -199,6 +329,28 @@ class FilesManager(object):
                 merged_dict.update(dict_to_merge)
             return merged_dict
 
+    def _load_file(self, path, extension, *args, **kwargs):
+        """Load single file, use cache for known formats.
+
+        :param path: path to file
+        :type path: str
+        :param extension: normalized file extension
+        :type extension: str
+
+        :return: data
+        :rtype: list|dict|basestring
+        """
+        deserializer = DESERIALIZERS[extension]
+
+        def loader(path):
+            with open(path, 'r') as content_file:
+                return deserializer(content_file.read(), *args, **kwargs)
+
+        # custom deserializer arguments may change the result
+        if extension in CACHED_FORMATS and not args and not kwargs:
+            return files_cache.get(path, loader)
+        return loader(path)
+
     def load(self, path_mask, skip_unknown_files=False, *args, **kwargs):
         """Load file from path mask or direct path.
 
@@ -218,11 +370,9 @@ class FilesManager(object):
             deserializer = DESERIALIZERS.get(extension)
 
             if deserializer is not None:
-                with open(path, 'r') as content_file:
-                    raw_content = content_file.read()
-                    data_records.append(
-                        deserializer(raw_content, *args, **kwargs)
-                    )
+                data_records.append(
+                    self._load_file(path, extension, *args, **kwargs)
+                )
             elif not skip_unknown_files:
                 raise IOError(
                     path,
@@ -13,9 +13,7 @@
 #    under the License.
 
 import copy
-import io
 import os
-import yaml
 
 
 from distutils.version import StrictVersion
@@ -30,6 +28,7 @@ from nailgun.logger import logger
 from nailgun.objects.plugin import ClusterPlugin
 from nailgun.objects.plugin import Plugin
 from nailgun.objects.plugin import PluginCollection
+from nailgun.plugins.loaders.files_manager import load_yaml_file
 from nailgun.settings import settings
 from nailgun.utils import dict_update
 from nailgun.utils import get_in
@@ -498,10 +497,7 @@ class PluginManager(object):
         :param str path: path to yaml file
         :returns: deserialized file
         """
-        with io.open(path, encoding='utf-8') as f:
-            data = yaml.load(f)
-
-        return data
+        return load_yaml_file(path)
 
     @classmethod
     def _list_plugins_on_fs(cls):
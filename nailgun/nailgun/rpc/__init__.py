@@ -16,11 +16,13 @@
 
 import logging
 import six
-import functools
+import threading
+import time
 
 import amqp.exceptions as amqp_exceptions
 from kombu import Connection
 from kombu import Exchange
+from kombu import pools
 from oslo_serialization import jsonutils
 from kombu import Queue
 
@@ -79,27 +81,91 @@ nailgun_queue = Queue(
 )
 
 
+# the broker confirms every published message, so the message
+# is not lost if the connection is broken right after publishing
+connection = Connection(
+    conn_str, transport_options={'confirm_publish': True}
+)
+
+
+class PublishStats(object):
+    """Counters of messages published by the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total_size = 0
+        self.max_size = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def add(self, size, publish_time):
+        with self._lock:
+            self.count += 1
+            self.total_size += size
+            self.max_size = max(self.max_size, size)
+            self.total_time += publish_time
+            self.max_time = max(self.max_time, publish_time)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'count': self.count,
+                'total_size': self.total_size,
+                'max_size': self.max_size,
+                'total_time': self.total_time,
+                'max_time': self.max_time,
+            }
+
+
+publish_stats = PublishStats()
+
+
+def _publish(producer, body, exchange, queue, routing_key):
+    # entities are declared on every publishing, because temporary
+    # queues could be removed since the previous one
+    queue(producer.channel).declare()
+    producer.publish(
+        body, exchange=exchange, routing_key=routing_key,
+        content_type='application/json', content_encoding='utf-8',
+        compression='gzip')
+
+
 def cast(name, message, service=False):
-    logger.debug(
-        "RPC cast to orchestrator:\n{0}".format(
-            jsonutils.dumps(message, indent=4)
-        )
-    )
+    """Publishes the message, returns the size of published body."""
+    # the message is serialized once, the same body is logged and sent
+    body = jsonutils.dumps(message)
+    if logger.isEnabledFor(logging.DEBUG):
+        max_size = settings.RPC_LOG_MAX_BODY_SIZE
+        logger.debug(
+            "RPC cast to orchestrator (%d bytes):\n%s", len(body),
+            body if not max_size or len(body) <= max_size
+            else body[:max_size] + '...')
+
     use_queue = naily_queue if not service else naily_service_queue
     use_exchange = naily_exchange if not service else naily_service_exchange
-    with Connection(conn_str) as conn:
-        with conn.Producer(serializer='json', compression='gzip') as producer:
-            publish = functools.partial(
-                producer.publish, message,
-                exchange=use_exchange, routing_key=name, declare=[use_queue]
-            )
-            try:
-                publish()
-            except amqp_exceptions.PreconditionFailed as e:
-                logger.warning(six.text_type(e))
-                # (dshulyak) we should drop both exchanges/queues in order
-                # for astute to be able to recover temporary queues
-                utils.delete_entities(
-                    conn, naily_service_exchange, naily_service_queue,
-                    naily_exchange, naily_queue)
-                publish()
+    started = time.time()
+    with pools.producers[connection].acquire(block=True) as producer:
+        publish = producer.connection.ensure(
+            producer, _publish, max_retries=settings.RPC_PUBLISH_MAX_RETRIES)
+        try:
+            publish(producer, body, use_exchange, use_queue, name)
+        except amqp_exceptions.PreconditionFailed as e:
+            logger.warning(six.text_type(e))
+            # (dshulyak) we should drop both exchanges/queues in order
+            # for astute to be able to recover temporary queues
+            utils.delete_entities(
+                producer.connection, naily_service_exchange,
+                naily_service_queue, naily_exchange, naily_queue)
+            # the channel is closed by broker on such error
+            producer.revive(producer.connection.channel())
+            publish(producer, body, use_exchange, use_queue, name)
+
+    publish_time = time.time() - started
+    publish_stats.add(len(body), publish_time)
+    logger.debug("RPC cast %s: %d bytes published in %.3f s",
+                 name, len(body), publish_time)
+    return len(body)
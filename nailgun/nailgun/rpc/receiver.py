@@ -349,17 +349,17 @@ class NailgunReceiver(object):
                 logger.warning("The following nodes are not found: %s",
                                ",".join(sorted(nodes_by_id)))
 
-        for node in nodes:
-            if node.get('deployment_graph_task_name') \
-                    and node.get('task_status'):
-                objects.DeploymentHistory.update_if_exist(
-                    task.id,
-                    node['uid'],
-                    node['deployment_graph_task_name'],
-                    node['task_status'],
-                    node.get('summary', {}),
-                    node.get('custom', {})
-                )
+        objects.DeploymentHistoryCollection.bulk_update_if_exist(
+            task.id,
+            [
+                (node['uid'], node['deployment_graph_task_name'],
+                 node['task_status'], node.get('summary', {}),
+                 node.get('custom', {}))
+                for node in nodes
+                if node.get('deployment_graph_task_name') and
+                node.get('task_status')
+            ]
+        )
         db().flush()
 
         if nodes and not progress:
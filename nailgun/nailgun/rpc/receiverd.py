@@ -17,6 +17,7 @@
 import logging
 import os
 import sys
+import time
 
 sys.path.insert(0, os.path.dirname(__file__))
 
@@ -26,6 +27,7 @@ from kombu.mixins import ConsumerMixin
 import six
 from sqlalchemy.exc import OperationalError
 
+from nailgun import consts
 from nailgun.db import db
 from nailgun import errors
 import nailgun.rpc as rpc
@@ -40,15 +42,143 @@ logger = logging.getLogger('receiverd')
 
 class RPCConsumer(ConsumerMixin):
 
-    def __init__(self, connection, receiver):
+    # the consecutive messages of these methods for the same task
+    # can be processed in one database transaction
+    coalesced_methods = frozenset(('deploy_resp', 'transaction_resp'))
+
+    final_statuses = frozenset((
+        consts.TASK_STATUSES.ready, consts.TASK_STATUSES.error
+    ))
+
+    def __init__(self, connection, receiver, batch_size=None,
+                 batch_timeout=None):
+        """Initializes.
+
+        :param connection: the AMQP connection
+        :param receiver: the receiver of messages
+        :param batch_size: the max number of messages, that are collected
+                           before processing, the batching is disabled
+                           if it is less than 2
+        :param batch_timeout: the max time in seconds to wait
+                              for the next message of batch
+        """
         self.connection = connection
         self.receiver = receiver
+        self.batch_size = batch_size or 0
+        self.batch_timeout = batch_timeout or 1
+        self.pending_messages = []
+        self.last_received = 0
 
     def get_consumers(self, Consumer, channel):
         return [Consumer(queues=[rpc.nailgun_queue],
                          callbacks=[self.consume_msg])]
 
     def consume_msg(self, body, msg):
+        if self.batch_size < 2:
+            self.process_msg(body, msg)
+            return
+
+        self.pending_messages.append((body, msg))
+        self.last_received = time.time()
+        if len(self.pending_messages) >= self.batch_size:
+            self.flush()
+
+    def on_iteration(self):
+        if (self.pending_messages and
+                time.time() - self.last_received >= self.batch_timeout):
+            self.flush()
+
+    def on_consume_end(self, connection, channel):
+        self.flush()
+
+    def on_connection_revived(self):
+        # the messages of broken channel cannot be acked and
+        # they are redelivered by broker via the new one
+        if self.pending_messages:
+            logger.warning(
+                "Connection is revived, %d unacknowledged messages "
+                "are dropped.", len(self.pending_messages)
+            )
+        self.pending_messages = []
+
+    def flush(self):
+        """Processes all collected messages in order of arrival."""
+        messages, self.pending_messages = self.pending_messages, []
+        for group in self.group_messages(messages):
+            if len(group) == 1:
+                self.process_msg(*group[0])
+            else:
+                self.process_group(group)
+
+    @classmethod
+    def can_coalesce(cls, previous, body):
+        """Checks that message can be processed along with previous one.
+
+        :param previous: the body of previous message
+        :param body: the body of message
+        """
+        return (
+            previous['method'] in cls.coalesced_methods and
+            previous['method'] == body['method'] and
+            previous['args'].get('task_uuid') ==
+            body['args'].get('task_uuid') and
+            # the message with final status may commit the changes and
+            # start the next transaction, so it is processed alone
+            previous['args'].get('status') not in cls.final_statuses and
+            body['args'].get('status') not in cls.final_statuses
+        )
+
+    @classmethod
+    def group_messages(cls, messages):
+        """Splits messages to groups, that can be processed together.
+
+        :param messages: the list of tuples (body, message)
+        :return: the sequence of groups
+        """
+        group = []
+        for body, msg in messages:
+            if group and not cls.can_coalesce(group[-1][0], body):
+                yield group
+                group = []
+            group.append((body, msg))
+        if group:
+            yield group
+
+    def process_group(self, group):
+        """Processes group of messages in one database transaction.
+
+        The cluster and task locks are acquired by the first message
+        and are held until the commit. If any of messages fails,
+        the changes are rolled back and messages are processed one by one.
+
+        :param group: the list of tuples (body, message)
+        """
+        try:
+            for body, _ in group:
+                getattr(self.receiver, body["method"])(**body["args"])
+            db.commit()
+        except KeyboardInterrupt:
+            logger.error("Receiverd interrupted.")
+            db.rollback()
+            for _, msg in group:
+                msg.requeue()
+            raise
+        except Exception:
+            logger.warning(
+                "Failed to process %d messages at once, "
+                "process them one by one.", len(group), exc_info=True
+            )
+            db.rollback()
+            db.remove()
+            for body, msg in group:
+                self.process_msg(body, msg)
+        else:
+            for _, msg in group:
+                msg.ack()
+        finally:
+            db.remove()
+
+    def process_msg(self, body, msg):
         callback = getattr(self.receiver, body["method"])
         try:
             callback(**body["args"])
@@ -98,6 +228,10 @@ def run():
     with Connection(rpc.conn_str,
                     heartbeat=settings.RPC_HEARTBEAT_INTERVAL) as conn:
         try:
-            RPCConsumer(conn, NailgunReceiver).run()
+            RPCConsumer(
+                conn, NailgunReceiver,
+                batch_size=settings.RPC_CONSUMER_BATCH_SIZE,
+                batch_timeout=settings.RPC_CONSUMER_BATCH_TIMEOUT
+            ).run()
         except (KeyboardInterrupt, SystemExit):
             logger.info("Stopping standalone RPC consumer...")
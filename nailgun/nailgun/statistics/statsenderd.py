@@ -30,6 +30,7 @@ from nailgun.settings import settings
 from nailgun.statistics.fuel_statistics.installation_info \
     import InstallationInfo
 from nailgun.statistics.utils import dithered
+from nailgun.statistics.utils import gzip_compress
 from nailgun.statistics.utils import prepare_logger
 
 
@@ -66,10 +67,15 @@ class StatsSender(object):
                 'content-type': 'application/json',
                 'master-node-uid': InstallationInfo().get_master_node_uid()
             }
+            data = jsonutils.dumps(data)
+            threshold = settings.COLLECTOR_COMPRESS_THRESHOLD
+            if threshold is not None and len(data) > threshold:
+                data = gzip_compress(data)
+                headers['content-encoding'] = 'gzip'
             resp = requests.post(
                 url,
                 headers=headers,
-                data=jsonutils.dumps(data),
+                data=data,
                 timeout=settings.COLLECTOR_RESP_TIMEOUT)
         except (urllib3.exceptions.DecodeError,
                 urllib3.exceptions.ProxyError,
@@ -131,20 +137,17 @@ class StatsSender(object):
                              six.text_type(resp.text))
 
     def send_action_log(self):
-        action_log = db().query(models.ActionLog).order_by(
-            models.ActionLog.id
-        ).filter_by(
-            is_sent=False
-        ).limit(settings.STATS_SEND_COUNT)
+        action_log = db().query(models.ActionLog).filter_by(is_sent=False)
         logger.info("Action log has %d unsent records", action_log.count())
 
         uid = InstallationInfo().get_master_node_uid()
-        offset = 0
-        while True:
-            log_chunk = action_log.offset(offset)
+        # records are fetched by id after the last one of previous chunk,
+        # because sent records do not match the query anymore
+        for log_chunk in objects.ActionLogCollection.iter_chunks(
+                action_log, settings.STATS_SEND_COUNT):
             records = []
             ids = []
-            logger.info("Send records: %s", six.text_type(log_chunk.count()))
+            logger.info("Send records: %d", len(log_chunk))
             for log_record in log_chunk:
                 body = objects.ActionLog.to_dict(log_record)
                 record = {
@@ -155,9 +158,6 @@ class StatsSender(object):
                 records.append(record)
                 ids.append(log_record.id)
             self.send_log_serialized(records, ids)
-            if log_chunk.count() < settings.STATS_SEND_COUNT:
-                break
-            offset += settings.STATS_SEND_COUNT
 
     def send_installation_info(self):
         logger.info("Sending installation structure info")
@@ -206,15 +206,14 @@ class StatsSender(object):
     def send_oswl_info(self):
         logger.info("Sending OpenStack workload info")
         oswl_data = objects.OpenStackWorkloadStatsCollection\
-            .get_ready_to_send().limit(settings.OSWL_SEND_COUNT)
+            .get_ready_to_send()
         logger.info("Pending records count: %s",
                     six.text_type(oswl_data.count()))
         uid = InstallationInfo().get_master_node_uid()
-        offset = 0
-        records = []
-        ids = []
-        while True:
-            data_chunk = oswl_data.offset(offset)
+        for data_chunk in objects.OpenStackWorkloadStatsCollection\
+                .iter_chunks(oswl_data, settings.OSWL_SEND_COUNT):
+            records = []
+            ids = []
             for rec in data_chunk:
                 rec_data = objects.OpenStackWorkloadStats.to_dict(rec)
                 rec_data['master_node_uid'] = uid
@@ -223,9 +222,6 @@ class StatsSender(object):
                 records.append(rec_data)
                 ids.append(rec_data['id'])
             self.send_oswl_serialized(records, ids)
-            if data_chunk.count() < settings.OSWL_SEND_COUNT:
-                break
-            offset += settings.OSWL_SEND_COUNT
 
         logger.info("OpenStack workload info is sent")
 
@@ -15,6 +15,7 @@ from collections import namedtuple
 import logging
 import os
 import random
+import zlib
 
 from contextlib import contextmanager
 
@@ -145,6 +146,12 @@ def dithered(medium, interval=(0.9, 1.1)):
     return random.randint(int(medium * interval[0]), int(medium * interval[1]))
 
 
+def gzip_compress(data, level=6):
+    """Compress data to the gzip format."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
 def get_version_info(cluster):
     """Returns current Fuel and OpenStack version info
 
@@ -864,6 +864,7 @@ class ClearTaskHistory(TaskManager):
             self.cluster.id
         )
         cluster_tasks.delete(synchronize_session='fetch')
+        objects.DeploymentInfoSnapshotCollection.delete_unused()
 
 
 class ResetEnvironmentTaskManager(ClearTaskHistory):
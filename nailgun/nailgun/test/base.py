@@ -78,9 +78,12 @@ from nailgun.app import build_app
 from nailgun.consts import NETWORK_INTERFACE_TYPES
 from nailgun.extensions.network_manager.manager import NetworkManager
 from nailgun.extensions.network_manager.template import NetworkTemplate
+from nailgun.middleware.connection_monitor import ActionLogWriter
 from nailgun.middleware.connection_monitor import ConnectionMonitorMiddleware
 from nailgun.middleware.keystone import NailgunFakeKeystoneAuthMiddleware
+from nailgun.plugins.loaders import files_manager
 from nailgun.utils import dict_merge
+from nailgun.utils import heartbeat
 from nailgun.utils import reverse
 
 
@@ -103,6 +106,15 @@ def test_db_driver(handler):
         # we do not remove session in tests
 
 
+# action logs are written in the request session in tests,
+# so they are available right after the request
+connection_monitor_middleware = functools.partial(
+    ConnectionMonitorMiddleware, action_log_writer=ActionLogWriter())
+
+# plugin files are not cached on disk in tests
+files_manager.files_cache = files_manager.FilesCache(None)
+
+
 class EnvironmentManager(object):
     _regex_type = type(re.compile("regex"))
 
@@ -1490,13 +1502,20 @@ class BaseTestCase(BaseUnitTest):
     def setUpClass(cls):
         cls.app = app.TestApp(
             build_app(db_driver=test_db_driver).wsgifunc(
-                ConnectionMonitorMiddleware)
+                connection_monitor_middleware)
         )
         syncdb()
         # syncdb disables logger, we need to enable it again
         logger.disabled = 0
 
     def setUp(self):
+        # heartbeats of nodes are written in the request in tests,
+        # the background writer does not touch the test database
+        heartbeat_writer_patcher = mock.patch.object(
+            heartbeat, 'get_heartbeat_writer', return_value=None)
+        heartbeat_writer_patcher.start()
+        self.addCleanup(heartbeat_writer_patcher.stop)
+
         self.db = db
         flush()
         self.env = EnvironmentManager(app=self.app, session=self.db)
@@ -1532,7 +1551,8 @@ class BaseAuthenticationIntegrationTest(BaseIntegrationTest):
     def setUpClass(cls):
         super(BaseAuthenticationIntegrationTest, cls).setUpClass()
         cls.app = app.TestApp(build_app(db_driver=test_db_driver).wsgifunc(
-            ConnectionMonitorMiddleware, NailgunFakeKeystoneAuthMiddleware))
+            connection_monitor_middleware,
+            NailgunFakeKeystoneAuthMiddleware))
         syncdb()
 
     def get_auth_token(self):
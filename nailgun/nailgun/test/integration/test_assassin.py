@@ -14,9 +14,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import mock
 
 from nailgun.assassin import assassind
+from nailgun import consts
+from nailgun import objects
 from nailgun.test.base import BaseIntegrationTest
 
 
@@ -45,3 +49,43 @@ class TestKeepalive(BaseIntegrationTest):
         )
         assassind.update_nodes_status(self.ZERO_TIMEOUT, m_logger)
         self.assertEqual(node.online, True)
+
+    def test_gone_away_nodes_are_notified_once(self, m_logger):
+        nodes = self.env.create_nodes(3, status="discover")
+        nodes[0].name = None
+        self.db.flush()
+
+        self.assertEqual(
+            3, assassind.update_nodes_status(self.ZERO_TIMEOUT, m_logger))
+        self.assertEqual(
+            0, assassind.update_nodes_status(self.ZERO_TIMEOUT, m_logger))
+
+        notifications = objects.NotificationCollection.filter_by(
+            None, topic=consts.NOTIFICATION_TOPICS.error
+        ).order_by('node_id').all()
+        self.assertEqual(
+            [(n.id, u"Node '{0}' has gone away".format(n.human_readable_name))
+             for n in nodes],
+            [(n.node_id, n.message) for n in notifications])
+        self.assertTrue(all(
+            n.status == consts.NOTIFICATION_STATUSES.unread
+            for n in notifications))
+
+    def test_next_check_delay(self, m_logger):
+        self.assertEqual(
+            30, assassind.get_next_check_delay(180, 1, 30))
+
+        node = self.env.create_node(status="discover")
+        node.timestamp = datetime.datetime.now() - datetime.timedelta(
+            seconds=170)
+        self.db.flush()
+        self.assertLessEqual(
+            assassind.get_next_check_delay(180, 1, 30), 10)
+
+        node.timestamp -= datetime.timedelta(seconds=20)
+        self.db.flush()
+        self.assertEqual(1, assassind.get_next_check_delay(180, 1, 30))
+
+        node.status = consts.NODE_STATUSES.provisioning
+        self.db.flush()
+        self.assertEqual(30, assassind.get_next_check_delay(180, 1, 30))
@@ -16,6 +16,7 @@
 
 import copy
 
+import mock
 from oslo_serialization import jsonutils
 
 from nailgun.db.sqlalchemy.models import Node
@@ -103,6 +104,66 @@ class TestHandlers(BaseIntegrationTest):
         self.assertEqual(200, resp.status_code)
         self.assertEqual(2, len(resp.json_body))
 
+    def test_node_get_paginated(self):
+        self.env.create_nodes(5)
+        ids = sorted(n.id for n in self.env.nodes)
+
+        resp = self.app.get(
+            reverse('NodeCollectionHandler'),
+            params={'limit': 2, 'offset': 1},
+            headers=self.default_headers
+        )
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(ids[1:3], [n['id'] for n in resp.json_body])
+
+        resp = self.app.get(
+            reverse('NodeCollectionHandler'),
+            params={'limit': 2, 'marker': ids[2]},
+            headers=self.default_headers
+        )
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(ids[3:5], [n['id'] for n in resp.json_body])
+
+    @mock.patch('nailgun.api.v1.handlers.base.settings.'
+                'API_COLLECTION_CHUNK_SIZE', 2)
+    def test_node_get_streamed_by_chunks(self):
+        self.env.create_nodes(5)
+
+        resp = self.app.get(
+            reverse('NodeCollectionHandler'),
+            headers=self.default_headers
+        )
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(
+            sorted(n.id for n in self.env.nodes),
+            [n['id'] for n in resp.json_body]
+        )
+
+    def test_node_get_with_fields(self):
+        self.env.create_nodes(2)
+
+        resp = self.app.get(
+            reverse('NodeCollectionHandler'),
+            params={'fields': 'id,mac'},
+            headers=self.default_headers
+        )
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, len(resp.json_body))
+        for node in resp.json_body:
+            self.assertItemsEqual(
+                ['id', 'mac', 'fqdn', 'status', 'tags'], node)
+
+    def test_node_get_with_invalid_collection_params(self):
+        for params in ({'limit': 'a'}, {'offset': -1},
+                       {'marker': ''}, {'fields': 'id,unknown'}):
+            resp = self.app.get(
+                reverse('NodeCollectionHandler'),
+                params=params,
+                headers=self.default_headers,
+                expect_errors=True
+            )
+            self.assertEqual(400, resp.status_code)
+
     def test_node_get_with_cluster_and_assigned_ip_addrs(self):
         self.env.create(
             cluster_kwargs={},
@@ -0,0 +1,68 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import functools
+import hashlib
+
+from oslo_serialization import jsonutils
+
+from nailgun.test.performance import base
+
+
+class NodeAgentLoadTest(base.BaseUnitLoadTestCase):
+    """Agents of all nodes report their data to NodeAgentHandler."""
+
+    # Number of simulated agents
+    NODES_NUM = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        super(NodeAgentLoadTest, cls).setUpClass()
+        cls.env.create_nodes(cls.NODES_NUM)
+        cls.reports = [
+            {'mac': node.mac, 'meta': copy.deepcopy(node.meta)}
+            for node in cls.env.nodes
+        ]
+
+    def report(self, handler_name, reports):
+        for data in reports:
+            data['agent_checksum'] = hashlib.sha1(
+                jsonutils.dumps(data['meta'], sort_keys=True)).hexdigest()
+            self.put_handler(handler_name, data)
+
+    def check_reports_time(self, reports, max_exec_time):
+        func = functools.partial(self.report, 'NodeAgentHandler', reports)
+        self.check_time_exec(func, max_exec_time)
+
+    @base.evaluate_unit_performance
+    def test_agents_report_not_changed_data(self):
+        self.check_reports_time(self.reports, 60)
+        # only the timestamps of nodes are updated
+        self.check_reports_time(self.reports, 20)
+
+    @base.evaluate_unit_performance
+    def test_agents_report_changed_memory(self):
+        for data in self.reports:
+            data['meta']['memory']['total'] += 1024
+        # the interfaces and disks are not updated
+        self.check_reports_time(self.reports, 30)
+
+    @base.evaluate_unit_performance
+    def test_agents_report_changed_interfaces_speed(self):
+        for data in self.reports:
+            for interface in data['meta']['interfaces']:
+                interface['current_speed'] = (
+                    interface.get('current_speed') or 1000) // 10
+        self.check_reports_time(self.reports, 60)
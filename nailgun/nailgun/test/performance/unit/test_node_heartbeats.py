@@ -0,0 +1,76 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+from timeit import Timer
+
+import mock
+import pytest
+import six
+
+from nailgun.test.base import BaseUnitTest
+from nailgun.utils import heartbeat
+
+
+@pytest.mark.performance
+class TestNodeHeartbeatWriterLoad(BaseUnitTest):
+    """Thousands of agents send heartbeats between flushes of writer."""
+
+    # Number of simulated agents
+    NODES_NUM = 5000
+    # Number of heartbeats of each agent between flushes
+    HEARTBEATS_NUM = 3
+    # Max number of nodes which timestamp is updated at once
+    BATCH_SIZE = 500
+    # Maximal allowed time to save single heartbeat in seconds
+    MAX_HEARTBEAT_TIME = 0.00005
+
+    def setUp(self):
+        super(TestNodeHeartbeatWriterLoad, self).setUp()
+        self.writer = heartbeat.NodeHeartbeatWriter(
+            flush_interval=5, batch_size=self.BATCH_SIZE)
+        self.db_patcher = mock.patch.object(heartbeat, 'db')
+        self.db = self.db_patcher.start()
+
+    def tearDown(self):
+        self.db_patcher.stop()
+        super(TestNodeHeartbeatWriterLoad, self).tearDown()
+
+    def send_heartbeats(self):
+        now = datetime.datetime.now()
+        for _ in six.moves.range(self.HEARTBEATS_NUM):
+            for node_id in six.moves.range(self.NODES_NUM):
+                self.writer.write(node_id, now)
+
+    def test_heartbeats_are_coalesced(self):
+        heartbeats_num = self.NODES_NUM * self.HEARTBEATS_NUM
+        heartbeat_time = Timer(
+            self.send_heartbeats).timeit(number=1) / heartbeats_num
+        self.assertLessEqual(
+            heartbeat_time, self.MAX_HEARTBEAT_TIME,
+            "Heartbeat time: {0} is greater, than expected: {1}".format(
+                heartbeat_time, self.MAX_HEARTBEAT_TIME)
+        )
+
+        self.writer.flush()
+        query = self.db.return_value.query.return_value
+        updates_count = query.filter.return_value.filter_by.return_value\
+            .update.call_count
+        # all heartbeats are sent within 1-2 seconds
+        self.assertLessEqual(
+            updates_count, 2 * (self.NODES_NUM // self.BATCH_SIZE + 1))
+        self.assertEqual(
+            {'pending': 0, 'written': self.NODES_NUM, 'failed': 0,
+             'coalesced': heartbeats_num - self.NODES_NUM},
+            self.writer.get_stats())
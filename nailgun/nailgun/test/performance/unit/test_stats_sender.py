@@ -0,0 +1,79 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import functools
+
+import mock
+import six
+
+from nailgun import consts
+from nailgun.db.sqlalchemy import models
+from nailgun.statistics.statsenderd import StatsSender
+from nailgun.test.performance import base
+
+
+class StatsSenderLoadTest(base.BaseUnitLoadTestCase):
+
+    ACTION_LOGS_NUM = 1000000
+    INSERT_CHUNK_SIZE = 10000
+    MAX_EXEC_TIME = 600
+
+    @classmethod
+    def setUpClass(cls):
+        super(StatsSenderLoadTest, cls).setUpClass()
+        timestamp = datetime.datetime.utcnow()
+        table = models.ActionLog.__table__
+        for start in six.moves.range(
+                0, cls.ACTION_LOGS_NUM, cls.INSERT_CHUNK_SIZE):
+            cls.db.execute(table.insert(), [
+                {
+                    'action_group': 'cluster_changes',
+                    'action_name': 'deploy',
+                    'action_type': consts.ACTION_TYPES.nailgun_task,
+                    'start_timestamp': timestamp,
+                    'end_timestamp': timestamp,
+                    'additional_info': {'n': i},
+                    'is_sent': False,
+                }
+                for i in six.moves.range(start, start + cls.INSERT_CHUNK_SIZE)
+            ])
+        cls.db.commit()
+
+    @staticmethod
+    def collector_response(url, data):
+        return mock.Mock(status_code=200, json=mock.Mock(return_value={
+            'status': consts.LOG_CHUNK_SEND_STATUS.ok,
+            'action_logs': [
+                {'external_id': r['external_id'],
+                 'status': consts.LOG_RECORD_SEND_STATUS.added}
+                for r in data['action_logs']
+            ]
+        }))
+
+    @base.evaluate_unit_performance
+    def test_send_action_log(self):
+        self.db.query(models.ActionLog).update(
+            {'is_sent': False}, synchronize_session=False)
+        self.db.commit()
+
+        sender = StatsSender()
+        with mock.patch.object(sender, 'send_data_to_url',
+                               side_effect=self.collector_response):
+            self.check_time_exec(
+                functools.partial(StatsSender.send_action_log, sender))
+
+        self.assertEqual(
+            0,
+            self.db.query(models.ActionLog).filter_by(is_sent=False).count())
@@ -0,0 +1,82 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from timeit import Timer
+
+import pytest
+import web
+
+from nailgun.api.v1 import urls as api_urls
+from nailgun.middleware import connection_monitor
+from nailgun.middleware import keystone
+from nailgun.middleware import utils as middleware_utils
+from nailgun.test.base import BaseUnitTest
+
+
+@pytest.mark.performance
+class TestUrlDispatchLoad(BaseUnitTest):
+    """Cost of matching the request path against the url patterns."""
+
+    # Number of dispatched requests
+    REQUESTS_NUM = 4000
+    # Maximal allowed time to dispatch single request in seconds
+    MAX_REQUEST_TIME = 0.0002
+
+    PATHS = (
+        '/clusters/1/',
+        '/clusters/1/network_configuration/neutron/',
+        '/nodes/agent/',
+        '/nodes/?cluster_id=1',
+        '/openstack-config/execute/',
+        '/transactions/1/deployment_history/',
+        '/version/',
+        '/unknown/',
+    )
+
+    def setUp(self):
+        super(TestUrlDispatchLoad, self).setUp()
+        self.sequential_app = web.application(*api_urls.get_all_urls())
+        self.routed_app = api_urls.app()
+        self.public_routes = middleware_utils.compile_mapping_router(
+            keystone.public_urls())
+
+    def dispatch(self, app):
+        for path in self.PATHS:
+            app._match(app.mapping, path)
+
+    def dispatch_with_middleware(self):
+        for path in self.PATHS:
+            api_path = '/api/v1' + path
+            connection_monitor.urls_actions_router.match(api_path)
+            self.public_routes.match(api_path)
+            keystone.CookieTokenMixin.cookie_routes.match(api_path)
+            self.routed_app._match(self.routed_app.mapping, path)
+
+    def get_request_time(self, func):
+        repeat = self.REQUESTS_NUM // len(self.PATHS)
+        return Timer(func).timeit(number=repeat) / self.REQUESTS_NUM
+
+    def test_dispatch_request(self):
+        sequential_time = self.get_request_time(
+            lambda: self.dispatch(self.sequential_app))
+        routed_time = self.get_request_time(
+            lambda: self.dispatch(self.routed_app))
+        self.assertLess(routed_time, sequential_time)
+
+        request_time = self.get_request_time(self.dispatch_with_middleware)
+        self.assertLessEqual(
+            request_time, self.MAX_REQUEST_TIME,
+            "Dispatch time: {0} is greater, than expected: {1}".format(
+                request_time, self.MAX_REQUEST_TIME)
+        )
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+from timeit import Timer
+
+import pytest
+import six
+
+from nailgun.lcm.context import TransactionContext
+from nailgun.lcm import task_serializer
+from nailgun.test.base import BaseUnitTest
+
+
+@pytest.mark.performance
+class TestYaqlEvaluationLoad(BaseUnitTest):
+    """Evaluation of YAQL conditions over deployment info of big cluster."""
+
+    # Number of nodes in the deployment info
+    NODES_NUM = 500
+    # Maximal allowed time to evaluate all conditions for all nodes
+    MAX_EXEC_TIME = 60
+
+    CONDITIONS = (
+        "changedAny($.network_scheme, $.dns_nameservers, $.storage)",
+        "changed($.network_metadata.vips)",
+        "'controller' in $.network_metadata.nodes.get("
+        "concat('node-', $.uid)).node_roles",
+        "$.storage.volumes_ceph and not $.storage.objects_ceph",
+    )
+
+    @classmethod
+    def get_node_metadata(cls, uid):
+        roles = ['controller'] if int(uid) <= 3 else ['compute', 'ceph-osd']
+        return {
+            'uid': uid,
+            'name': 'node-{0}'.format(uid),
+            'fqdn': 'node-{0}.test.domain.local'.format(uid),
+            'node_roles': roles,
+            'user_node_name': 'Untitled ({0})'.format(uid),
+            'swift_zone': uid,
+            'network_roles': dict(
+                ('{0}/{1}'.format(role, i),
+                 '192.168.{0}.{1}'.format(i, int(uid) % 250 + 1))
+                for i, role in enumerate(
+                    ('management', 'storage', 'ex', 'keystone', 'neutron',
+                     'swift', 'ceph', 'mgmt', 'heat', 'nova'))
+            )
+        }
+
+    @classmethod
+    def get_deployment_info(cls):
+        uids = [str(i) for i in six.moves.range(1, cls.NODES_NUM + 1)]
+        common = {
+            'network_metadata': {
+                'nodes': dict(
+                    ('node-{0}'.format(uid), cls.get_node_metadata(uid))
+                    for uid in uids
+                ),
+                'vips': {
+                    'management': {'ipaddr': '192.168.0.2'},
+                    'public': {'ipaddr': '172.16.0.2'},
+                }
+            },
+            'dns_nameservers': ['8.8.8.8', '8.8.4.4'],
+            'storage': {
+                'volumes_ceph': True,
+                'objects_ceph': False,
+                'pg_num': 1024,
+            },
+        }
+        nodes = dict(
+            (uid, {
+                'uid': uid,
+                'storage': {'per_pool_pg_nums': {'volumes': 256}},
+                'network_scheme': {
+                    'endpoints': {
+                        'br-mgmt': {'IP': ['192.168.0.{0}/24'.format(uid)]}
+                    }
+                }
+            })
+            for uid in uids
+        )
+        return {'common': common, 'nodes': nodes}
+
+    def setUp(self):
+        super(TestYaqlEvaluationLoad, self).setUp()
+        new_state = self.get_deployment_info()
+        old_state = copy.deepcopy(new_state)
+        old_state['common']['dns_nameservers'] = ['8.8.8.8']
+        self.transaction = TransactionContext(
+            new_state, dict((t, old_state) for t in ('task1', 'task2'))
+        )
+
+    def evaluate_conditions(self):
+        context = task_serializer.Context(self.transaction)
+        for node_id in self.transaction.new['nodes']:
+            for task_id in ('task1', 'task2'):
+                evaluate = context.get_yaql_interpreter(node_id, task_id)
+                for condition in self.CONDITIONS:
+                    evaluate(condition)
+
+    def test_evaluate_conditions_for_all_nodes(self):
+        exec_time = Timer(self.evaluate_conditions).timeit(number=1)
+        self.assertLessEqual(
+            exec_time, self.MAX_EXEC_TIME,
+            "Execution time: {0} is greater, than expected: {1}".format(
+                exec_time, self.MAX_EXEC_TIME)
+        )
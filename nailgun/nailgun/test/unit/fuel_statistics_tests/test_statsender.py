@@ -14,6 +14,7 @@
 
 import datetime
 import json
+import zlib
 from mock import Mock
 from mock import patch
 import requests
@@ -24,6 +25,7 @@ import six
 from nailgun.test.base import BaseTestCase
 
 from nailgun import consts
+from nailgun.objects import ActionLog
 from nailgun.objects import Cluster
 from nailgun.objects import MasterNodeSettings
 from nailgun.objects import OpenStackWorkloadStats
@@ -111,6 +113,19 @@ class TestStatisticsSender(BaseTestCase):
             data='{}',
             timeout=settings.COLLECTOR_RESP_TIMEOUT)
 
+    @patch('nailgun.statistics.statsenderd.requests.post')
+    @patch.object(settings, 'COLLECTOR_COMPRESS_THRESHOLD', 10)
+    def test_send_compressed(self, requests_post):
+        requests_post.return_value = Mock(status_code=200)
+        data = {'action_logs': [{'id': i} for i in six.moves.range(10)]}
+        StatsSender().send_data_to_url(url='', data=data)
+
+        kwargs = requests_post.call_args[1]
+        self.assertEqual('gzip', kwargs['headers']['content-encoding'])
+        self.assertEqual(
+            data,
+            json.loads(zlib.decompress(kwargs['data'], 16 + zlib.MAX_WBITS)))
+
     @patch('nailgun.statistics.statsenderd.requests.post')
     @patch('nailgun.statistics.statsenderd.logger.error')
     def test_send_failed_on_connection_error(self, log_error, requests_post):
@@ -167,6 +182,40 @@ class TestStatisticsSender(BaseTestCase):
                     sender.send_log_serialized([{'external_id': 1}], [1])
                     self.assertEqual(0, mocked_commit.call_count)
 
+    @patch('nailgun.statistics.statsenderd.StatsSender.send_data_to_url')
+    @patch.object(settings, 'STATS_SEND_COUNT', 2)
+    def test_action_logs_sent_by_chunks(self, send_data_to_url):
+        for i in six.moves.range(5):
+            ActionLog.create({
+                'action_group': 'test',
+                'action_name': 'test_{0}'.format(i),
+                'action_type': consts.ACTION_TYPES.http_request,
+                'start_timestamp': datetime.datetime.utcnow(),
+            })
+
+        def send_data(url, data):
+            return Mock(status_code=200, json=Mock(return_value={
+                'status': 'ok',
+                'action_logs': [
+                    {'external_id': r['external_id'], 'status': 'added'}
+                    for r in data['action_logs']
+                ]
+            }))
+
+        send_data_to_url.side_effect = send_data
+        StatsSender().send_action_log()
+
+        sent_ids = [
+            [r['external_id'] for r in c[1]['data']['action_logs']]
+            for c in send_data_to_url.call_args_list
+        ]
+        self.assertEqual([2, 2, 1], [len(ids) for ids in sent_ids])
+        self.assertEqual(
+            sorted(sum(sent_ids, [])), sorted(set(sum(sent_ids, []))))
+        self.assertEqual(
+            0, self.db.query(ActionLog.model).filter_by(is_sent=False).count()
+        )
+
     @patch('nailgun.statistics.statsenderd.time.sleep')
     @patch('nailgun.statistics.statsenderd.dithered')
     @patch('nailgun.db.sqlalchemy.fixman.settings.'
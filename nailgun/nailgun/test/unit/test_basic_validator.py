@@ -0,0 +1,116 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from jsonschema import exceptions
+import mock
+from oslo_serialization import jsonutils
+
+from nailgun.api.v1.handlers import base as handlers_base
+from nailgun.api.v1.validators import base
+from nailgun import errors
+from nailgun.test.base import BaseUnitTest
+
+
+class TestCompiledSchemas(BaseUnitTest):
+
+    schema = {
+        'type': 'object',
+        'properties': {
+            'id': {'type': 'integer'},
+            'ip': {'type': 'string', 'format': 'ipv4'},
+        },
+        'required': ['id'],
+    }
+
+    def test_schema_is_checked_once(self):
+        schema = dict(self.schema)
+        with mock.patch.object(base.jsonschema.Draft4Validator,
+                               'check_schema') as m_check:
+            compiled = base.get_compiled_schema(schema)
+            self.assertIs(compiled, base.get_compiled_schema(schema))
+            self.assertIsNot(
+                compiled, base.get_compiled_schema(schema, check_format=True))
+            self.assertIsNot(
+                compiled, base.get_compiled_schema(dict(self.schema)))
+        self.assertEqual(3, m_check.call_count)
+
+    def test_schema_is_not_cached(self):
+        schema = dict(self.schema)
+        with mock.patch.object(base, '_compiled_schemas') as m_cache:
+            compiled = base.get_compiled_schema(schema, cache=False)
+        self.assertIs(schema, compiled.schema)
+        self.assertFalse(m_cache.get.called)
+        self.assertFalse(m_cache.put.called)
+
+    def test_attribute_schema_is_built_once(self):
+        schema = base.get_attribute_schema('checkbox')
+        self.assertIs(schema, base.get_attribute_schema('checkbox'))
+        self.assertIsNot(schema, base.get_attribute_schema('text'))
+        self.assertIs(base.get_attribute_schema(None),
+                      base.get_attribute_schema('unknown'))
+        self.assertEqual(
+            {'type': 'boolean'}, schema['properties']['value'])
+        self.assertNotIn(
+            'value', base.get_attribute_schema(None)['properties'])
+
+    def test_invalid_schema(self):
+        schema = {'type': 'unknown'}
+        self.assertRaises(
+            exceptions.SchemaError, base.get_compiled_schema, schema)
+        self.assertRaises(
+            errors.InvalidData,
+            base.BasicValidator.validate_schema, {}, schema)
+
+    def test_validate_request(self):
+        base.BasicValidator.validate_request(
+            jsonutils.dumps({'id': 1, 'ip': 'x'}), 'single', self.schema)
+        self.assertRaisesRegexp(
+            errors.JsonValidationError, "'id' is a required property",
+            base.BasicValidator.validate_request,
+            jsonutils.dumps({}), 'single', self.schema)
+
+    def test_validate_schema_checks_formats(self):
+        base.BasicValidator.validate_schema({'id': 1, 'ip': '1.2.3.4'},
+                                            self.schema)
+        self.assertRaisesRegexp(
+            errors.InvalidData, "'x' is not a 'ipv4'",
+            base.BasicValidator.validate_schema, {'id': 1, 'ip': 'x'},
+            self.schema)
+
+
+class TestValidationStats(BaseUnitTest):
+
+    def test_validation_time_is_collected_per_handler(self):
+        stats = handlers_base.ValidationStats()
+        stats.add('NodeHandler', 0.5)
+        stats.add('NodeHandler', 0.25)
+        stats.add('ClusterHandler', 0.1)
+        self.assertEqual(
+            {'NodeHandler': {
+                'count': 2, 'total_time': 0.75, 'max_time': 0.5},
+             'ClusterHandler': {
+                'count': 1, 'total_time': 0.1, 'max_time': 0.1}},
+            stats.to_dict())
+
+        stats.reset()
+        self.assertEqual({}, stats.to_dict())
+
+    @mock.patch.object(handlers_base, 'validation_stats')
+    @mock.patch.object(handlers_base.web, 'data', return_value='{}')
+    def test_checked_data_collects_validation_time(self, _, m_stats):
+        validate = mock.Mock(return_value={'id': 1})
+        self.assertEqual(
+            {'id': 1}, handlers_base.BaseHandler.checked_data(validate))
+        validate.assert_called_once_with('{}')
+        m_stats.add.assert_called_once_with('BaseHandler', mock.ANY)
@@ -0,0 +1,102 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import six
+
+from nailgun.middleware import connection_monitor
+from nailgun.test.base import BaseUnitTest
+
+
+class TestAsyncActionLogWriter(BaseUnitTest):
+
+    def setUp(self):
+        super(TestAsyncActionLogWriter, self).setUp()
+        self.writer = connection_monitor.AsyncActionLogWriter(
+            queue_size=3, batch_size=2, flush_interval=0.01, max_delay=10)
+        self.db_patcher = mock.patch.object(connection_monitor, 'db')
+        self.db = self.db_patcher.start()
+
+    def tearDown(self):
+        self.db_patcher.stop()
+        super(TestAsyncActionLogWriter, self).tearDown()
+
+    def get_inserted_entries(self):
+        return [c[0][1] for c in self.db.return_value.execute.call_args_list]
+
+    def test_entries_are_dropped_if_queue_is_full(self):
+        for i in six.moves.range(5):
+            self.writer.write({'id': i})
+        self.assertEqual(2, self.writer.dropped)
+        self.assertEqual(3, self.writer.get_stats()['queued'])
+
+    def test_entries_are_written_by_batches_on_stop(self):
+        for i in six.moves.range(3):
+            self.writer.write({'id': i})
+        self.writer.start()
+        self.writer.stop(timeout=5)
+
+        self.assertEqual(
+            [[{'id': 0}, {'id': 1}], [{'id': 2}]],
+            self.get_inserted_entries())
+        self.assertEqual(2, self.db.return_value.commit.call_count)
+        self.assertEqual(
+            {'queued': 0, 'written': 3, 'failed': 0, 'dropped': 0, 'late': 0},
+            self.writer.get_stats())
+
+    def test_failed_and_late_entries_are_counted(self):
+        self.db.return_value.execute.side_effect = Exception('error')
+        with mock.patch.object(connection_monitor.time, 'time',
+                               return_value=100):
+            self.writer.flush([(50, {'id': 1}), (95, {'id': 2})])
+
+        self.db.return_value.rollback.assert_called_once_with()
+        self.assertEqual(2, self.writer.failed)
+        self.assertEqual(1, self.writer.late)
+        self.assertEqual(0, self.writer.written)
+
+
+class TestConnectionMonitorMiddleware(BaseUnitTest):
+
+    def call_middleware(self, status, response):
+        def app(env, start_response):
+            start_response(status, [])
+            return iter(response)
+
+        writer = mock.Mock()
+        middleware = connection_monitor.ConnectionMonitorMiddleware(
+            app, action_log_writer=writer)
+        env = {
+            'REQUEST_METHOD': 'PUT',
+            'PATH_INFO': '/api/clusters/1/',
+            'CONTENT_LENGTH': '0',
+            'wsgi.input': six.StringIO(''),
+        }
+        result = list(middleware(env, mock.Mock()))
+        return result, writer.write.call_args[0][0]
+
+    def test_response_is_not_consumed(self):
+        result, entry = self.call_middleware('200 OK', ['a', 'b'])
+        self.assertEqual(['a', 'b'], result)
+        self.assertEqual(
+            {'status': '200 OK', 'data': {}},
+            entry['additional_info']['response_data'])
+        self.assertEqual(1, entry['cluster_id'])
+
+    def test_error_message_is_saved(self):
+        result, entry = self.call_middleware('400 Bad Request', ['a', 'b'])
+        self.assertEqual(['a', 'b'], result)
+        self.assertEqual(
+            {'status': '400 Bad Request', 'data': {'message': 'a'}},
+            entry['additional_info']['response_data'])
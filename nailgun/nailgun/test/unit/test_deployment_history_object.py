@@ -105,6 +105,44 @@ class TestDeploymentHistoryObject(base.BaseTestCase):
 
         self.assertEqual(history.status, consts.HISTORY_TASK_STATUSES.running)
 
+    def test_deployment_history_bulk_update_if_exist(self):
+        statuses = consts.HISTORY_TASK_STATUSES
+        deployment_history.DeploymentHistoryCollection.bulk_update_if_exist(
+            self.task.id,
+            [
+                ('1', 'dns-client', statuses.running, None, {'a': 1}),
+                ('1', 'hiera', statuses.skipped, {'b': 2}, None),
+                (None, 'post_deployment_end', statuses.running, None, None),
+                ('1', 'dns-client', statuses.ready, {'c': 3}, {}),
+                ('2', 'hiera', statuses.running, None, None),
+            ]
+        )
+        self.db.flush()
+
+        history = {
+            (x['node_id'], x['task_name']): x for x in
+            deployment_history.DeploymentHistoryCollection.get_history(
+                self.task, include_summary=True)
+        }
+        self.assertEqual(
+            statuses.ready, history['1', 'dns-client']['status']
+        )
+        self.assertEqual({'c': 3}, history['1', 'dns-client']['summary'])
+        self.assertIsNotNone(history['1', 'dns-client']['time_end'])
+        self.assertEqual(statuses.skipped, history['1', 'hiera']['status'])
+        self.assertEqual({'b': 2}, history['1', 'hiera']['summary'])
+        self.assertEqual(
+            statuses.running, history[None, 'post_deployment_end']['status']
+        )
+        self.assertEqual(
+            statuses.pending, history[None, 'post_deployment_start']['status']
+        )
+        self.assertEqual(
+            {'a': 1},
+            deployment_history.DeploymentHistory.find_history(
+                self.task.id, '1', 'dns-client').custom
+        )
+
     def test_history_move_from_pending(self):
         self._check_status_transitions(
             from_status=consts.HISTORY_TASK_STATUSES.pending,
@@ -14,7 +14,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import alembic
+from oslo_serialization import jsonutils
 import sqlalchemy as sa
 
 from nailgun.db import db
@@ -72,6 +75,8 @@ def prepare():
     cluster_id = result.inserted_primary_key[0]
 
     TestPluginLinksConstraints.prepare(meta, cluster_id)
+    TestDeploymentInfoSnapshots.prepare(meta, cluster_id)
+    TestNodesJSONBFields.prepare(meta, cluster_id)
 
 
 class TestPluginLinksConstraints(base.BaseAlembicMigrationTest):
@@ -118,3 +123,68 @@ class TestNodeTagging(base.BaseAlembicMigrationTest):
         self.assertNotIn('tags_metadata', releases_table.c)
         self.assertNotIn('tags', self.meta.tables)
         self.assertNotIn('node_tags', self.meta.tables)
+
+
+class TestDeploymentInfoSnapshots(base.BaseAlembicMigrationTest):
+
+    @classmethod
+    def prepare(cls, meta, cluster_id):
+        db.execute(
+            meta.tables['tasks'].insert(),
+            [{
+                'id': 77,
+                'uuid': 'f6eb7e37-c0b7-4a1c-9bd9-3a2b5e0ee9e1',
+                'name': 'deployment',
+                'status': 'ready',
+                'cluster_id': cluster_id
+            }]
+        )
+        db.execute(
+            meta.tables['deployment_info_snapshots'].insert(),
+            [{'checksum': 'a' * 40, 'deployment_info': '{"a": "b"}'}]
+        )
+        db.execute(
+            meta.tables['node_deployment_info'].insert(),
+            [{'task_id': 77, 'node_uid': '1', 'snapshot_checksum': 'a' * 40}]
+        )
+
+    def test_downgrade_deployment_info_snapshots(self):
+        self.assertNotIn('deployment_info_snapshots', self.meta.tables)
+        table = self.meta.tables['node_deployment_info']
+        self.assertNotIn('snapshot_checksum', table.c)
+        result = db.execute(
+            sa.select([table.c.deployment_info]).where(
+                table.c.task_id == 77)
+        ).fetchone()
+        self.assertEqual({'a': 'b'}, jsonutils.loads(result[0]))
+
+
+class TestNodesJSONBFields(base.BaseAlembicMigrationTest):
+
+    @classmethod
+    def prepare(cls, meta, cluster_id):
+        db.execute(
+            meta.tables['nodes'].insert(),
+            [{
+                'id': 1,
+                'uuid': '26b508d0-0d76-4159-bce9-f67ec2765480',
+                'cluster_id': cluster_id,
+                'group_id': None,
+                'status': 'ready',
+                'meta': {'system': {'manufacturer': 'Dell'}},
+                'labels': {'rack': '1'},
+                'mac': 'aa:aa:aa:aa:aa:aa',
+                'timestamp': datetime.datetime.utcnow(),
+            }]
+        )
+
+    def test_downgrade_nodes_jsonb_fields(self):
+        nodes = self.meta.tables['nodes']
+        result = db.execute(
+            sa.select([nodes.c.meta, nodes.c.labels, nodes.c.attributes])
+            .where(nodes.c.id == 1)
+        ).fetchone()
+        self.assertEqual(
+            {'system': {'manufacturer': 'Dell'}}, jsonutils.loads(result[0]))
+        self.assertEqual({'rack': '1'}, jsonutils.loads(result[1]))
+        self.assertEqual({}, jsonutils.loads(result[2]))
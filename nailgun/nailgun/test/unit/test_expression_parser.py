@@ -15,10 +15,13 @@
 #    under the License.
 
 import inspect
+import threading
 
 from nailgun import errors
+from nailgun import expression
 from nailgun.expression import Expression
 from nailgun.test.base import BaseTestCase
+from nailgun.test.base import BaseUnitTest
 
 
 class TestExpressionParser(BaseTestCase):
@@ -102,3 +105,54 @@ class TestExpressionParser(BaseTestCase):
             else:
                 self.assertEqual(evaluate_expression(expression, models,
                                                      strict), result)
+
+
+class TestCompiledExpression(BaseUnitTest):
+
+    def setUp(self):
+        super(TestCompiledExpression, self).setUp()
+        expression.compiled_expressions.clear()
+
+    def test_expression_is_parsed_once(self):
+        text = 'settings:common.value == "a" and not cluster:mode'
+        first = Expression(text, {})
+        second = Expression(text, {})
+        self.assertIs(first.compiled_expression, second.compiled_expression)
+        self.assertIsNot(
+            first.compiled_expression,
+            Expression(text, {}, strict=False).compiled_expression)
+        self.assertEqual(1, expression.compiled_expressions.hits)
+
+    def test_models_are_bound_on_evaluation(self):
+        text = 'settings:common.value == "a"'
+        self.assertTrue(Expression(
+            text, {'settings': {'common': {'value': 'a'}}}).evaluate())
+        self.assertFalse(Expression(
+            text, {'settings': {'common': {'value': 'b'}}}).evaluate())
+        self.assertIsNone(Expression(
+            'settings:common.missing', {'settings': {'common': {}}},
+            strict=False).evaluate())
+        self.assertRaises(TypeError, Expression(
+            'settings:common.missing', {'settings': {'common': {}}}
+        ).evaluate)
+
+    def test_invalid_expression_is_not_cached(self):
+        self.assertRaises(errors.ParseError, Expression, 'false and', {})
+        self.assertNotIn(('false and', True), expression.compiled_expressions)
+
+    def test_parse_in_threads(self):
+        results = {}
+
+        def evaluate(value):
+            text = 'settings:value == {0} or ({0} == -1)'.format(value)
+            results[value] = Expression(
+                text, {'settings': {'value': value}}).evaluate()
+
+        threads = [threading.Thread(target=evaluate, args=(i,))
+                   for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(dict((i, True) for i in range(20)), results)
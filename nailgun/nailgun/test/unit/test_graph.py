@@ -84,3 +84,61 @@ class TestGraphSolverViualization(base.BaseUnitTest):
         ]
         dotgraph = self.get_dotgraph_with_tasks(tasks)
         self.assertIn('task_a [color=gray95];', dotgraph)
+
+
+class TestCompiledGraph(base.BaseUnitTest):
+
+    TASKS = [
+        {'id': 'a', 'type': 'puppet'},
+        {'id': 'b', 'type': 'puppet', 'requires': ['a']},
+        {'id': 'c', 'type': 'puppet', 'requires': ['a']},
+        {'id': 'd', 'type': 'puppet', 'requires': ['b', 'c']},
+        {'id': 'e', 'type': 'puppet'},
+        {'id': 'group', 'type': 'group', 'requires': ['e']},
+        {'id': 'f', 'type': 'puppet', 'groups': ['group']},
+        {'id': 'g', 'type': 'puppet', 'groups': ['group'], 'requires': ['f']},
+    ]
+
+    def setUp(self):
+        super(TestCompiledGraph, self).setUp()
+        self.graph = orchestrator_graph.GraphSolver(tasks=self.TASKS)
+
+    def test_reachability(self):
+        compiled = self.graph.compile()
+        self.assertEqual(
+            ['a', 'b', 'c', 'd'],
+            sorted(compiled.get_nodes(compiled.get_ancestors_mask('d'))))
+        self.assertEqual(
+            ['a', 'b', 'c', 'd'],
+            sorted(compiled.get_nodes(compiled.get_descendants_mask('a'))))
+        self.assertEqual(
+            ['e', 'f', 'g', 'group'],
+            sorted(compiled.get_nodes(compiled.get_ancestors_mask('group'))))
+        self.assertItemsEqual(('e', 'f', 'g'), compiled.groups['group'])
+        order = compiled.order
+        self.assertLess(order.index('f'), order.index('g'))
+
+    def test_compiled_graph_is_shared_by_content(self):
+        other = orchestrator_graph.GraphSolver(tasks=self.TASKS)
+        self.assertIs(self.graph.compile(), other.compile())
+        self.assertIs(self.graph.compile(), self.graph.copy().compile())
+
+    def test_compiled_graph_is_reset_on_change(self):
+        compiled = self.graph.compile()
+        self.graph.add_edge('d', 'e')
+        self.assertIsNot(compiled, self.graph.compile())
+        self.assertIn(
+            'a', self.graph.find_subgraph(end='group').nodes())
+        self.graph.remove_edge('d', 'e')
+        self.assertNotIn(
+            'a', self.graph.find_subgraph(end='group').nodes())
+
+    def test_find_subgraph_with_unreachable_end(self):
+        with self.assertRaises(KeyError):
+            self.graph.find_subgraph(start='b', end='c')
+
+    def test_get_next_groups(self):
+        self.assertItemsEqual(
+            ['a', 'e', 'f'], self.graph.get_next_groups(set()))
+        self.assertItemsEqual(
+            ['b', 'c', 'g'], self.graph.get_next_groups({'a', 'e', 'f'}))
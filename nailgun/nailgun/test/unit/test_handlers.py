@@ -132,6 +132,29 @@ class TestHandlers(BaseIntegrationTest):
             web.ctx.headers
         )
 
+    def test_serialize_generator(self):
+
+        class FakeHandler(BaseHandler):
+
+            @serialize
+            def GET(self):
+                return (dict(id=i) for i in range(3))
+
+        fake_handler = FakeHandler()
+        web.ctx.headers = []
+        web.ctx.env = {"HTTP_ACCEPT": "application/json"}
+        self.assertEqual(
+            [{'id': 0}, {'id': 1}, {'id': 2}],
+            json.loads(''.join(fake_handler.GET()))
+        )
+
+        web.ctx.headers = []
+        web.ctx.env = {"HTTP_ACCEPT": "application/x-yaml"}
+        self.assertEqual(
+            "- id: 0\n- id: 1\n- id: 2\n",
+            fake_handler.GET()
+        )
+
     def test_invalid_handler_output(self):
 
         class FakeHandler(object):
@@ -0,0 +1,88 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+import mock
+import six
+
+from nailgun.test.base import BaseUnitTest
+from nailgun.utils import heartbeat
+
+
+class TestNodeHeartbeatWriter(BaseUnitTest):
+
+    def setUp(self):
+        super(TestNodeHeartbeatWriter, self).setUp()
+        self.writer = heartbeat.NodeHeartbeatWriter(
+            flush_interval=0.01, batch_size=2)
+        self.db_patcher = mock.patch.object(heartbeat, 'db')
+        self.db = self.db_patcher.start()
+        self.now = datetime.datetime(2016, 10, 1, 12, 0, 0, 500)
+
+    def tearDown(self):
+        self.db_patcher.stop()
+        super(TestNodeHeartbeatWriter, self).tearDown()
+
+    def test_heartbeats_of_node_are_coalesced(self):
+        for i in six.moves.range(3):
+            self.writer.write(1, self.now + datetime.timedelta(seconds=i))
+        self.writer.write(2, self.now)
+        self.assertEqual(
+            {'pending': 2, 'written': 0, 'failed': 0, 'coalesced': 2},
+            self.writer.get_stats())
+
+    def test_heartbeats_are_written_by_batches_on_stop(self):
+        later = self.now + datetime.timedelta(seconds=1)
+        for node_id in (3, 1, 2):
+            self.writer.write(node_id, self.now)
+        self.writer.write(4, later)
+        with mock.patch.object(self.writer, '_write_batch') as m_write:
+            self.writer.start()
+            self.writer.stop(timeout=5)
+
+        self.assertEqual(
+            [mock.call(self.now.replace(microsecond=0), [1, 2]),
+             mock.call(self.now.replace(microsecond=0), [3]),
+             mock.call(later.replace(microsecond=0), [4])],
+            m_write.call_args_list)
+        self.db.remove.assert_called_once_with()
+        self.assertEqual(0, self.writer.get_stats()['pending'])
+
+    def test_batch_is_written(self):
+        self.writer._write_batch(self.now, [1, 2])
+
+        query = self.db.return_value.query.return_value
+        query.filter.return_value.filter_by.assert_called_once_with(
+            online=True)
+        query.filter.return_value.filter_by.return_value\
+            .update.assert_called_once_with(
+                {'timestamp': self.now}, synchronize_session=False)
+        self.db.return_value.commit.assert_called_once_with()
+        self.assertEqual(2, self.writer.written)
+
+    def test_failed_heartbeats_are_counted(self):
+        self.db.return_value.commit.side_effect = Exception('error')
+        self.writer.write(1, self.now)
+        self.writer.flush()
+
+        self.db.return_value.rollback.assert_called_once_with()
+        self.db.remove.assert_called_once_with()
+        self.assertEqual(1, self.writer.failed)
+        self.assertEqual(0, self.writer.written)
+
+    @mock.patch.object(heartbeat, 'settings')
+    def test_writer_is_not_used_if_disabled(self, m_settings):
+        m_settings.NODE_HEARTBEAT_FLUSH_INTERVAL = 0
+        self.assertIsNone(heartbeat.get_heartbeat_writer())
@@ -82,11 +82,60 @@ class TestTaskSerializerContext(BaseUnitTest):
             self.context.get_new_data('1')
         )
 
+    def test_get_new_data_is_reused(self):
+        self.assertIs(
+            self.context.get_new_data('1'),
+            self.context.get_new_data('1')
+        )
+
     def test_get_legacy_interpreter(self):
         interpreter = self.context.get_legacy_interpreter('1')
         self.assertTrue(interpreter('cluster:id == 1'))
         self.assertTrue(interpreter("settings:common.attribute.value == '1'"))
 
+    def test_reads_are_tracked(self):
+        reads = {}
+        interpreter = self.context.get_yaql_interpreter('1', 'task', reads)
+        interpreter('$.public_ssl.hostname')
+        interpreter('$.get(missing)')
+        interpreter('changed($.cluster)')
+        self.assertEqual(
+            {
+                ('new', 'public_ssl'): task_serializer.READ_KEY,
+                ('new', 'public_ssl', 'hostname'): task_serializer.READ_VALUE,
+                ('new', 'missing'): task_serializer.READ_KEY,
+                ('new', 'cluster'): task_serializer.READ_VALUE,
+                ('new', 'cluster', 'id'): task_serializer.READ_VALUE,
+                ('old', 'cluster'): task_serializer.READ_KEY,
+            },
+            reads
+        )
+
+    def test_get_inputs_digest(self):
+        task = {'id': 'task', 'type': 'puppet'}
+        reads = [
+            (('new', 'public_ssl'), task_serializer.READ_KEY),
+            (('new', 'public_ssl', 'hostname'), task_serializer.READ_VALUE),
+            (('old', 'public_ssl'), task_serializer.READ_KEY),
+        ]
+        digest = self.context.get_inputs_digest('1', task, reads)
+        self.assertEqual(
+            digest, self.context.get_inputs_digest('1', task, reads))
+        self.assertNotEqual(
+            digest, self.context.get_inputs_digest('1', task, reads[:-1]))
+        self.assertNotEqual(
+            digest,
+            self.context.get_inputs_digest('1', dict(task, type='shell'),
+                                           reads)
+        )
+
+        context = task_serializer.Context(TransactionContext({
+            'common': {'public_ssl': {'hostname': 'remote'}},
+            'nodes': {'1': {}}
+        }))
+        self.assertNotEqual(
+            digest, context.get_inputs_digest('1', task, reads))
+
     def test_get_formatter_context(self):
         self.assertEqual(
             {
@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import mock
 import multiprocessing.dummy
 
@@ -189,6 +190,43 @@ class TestTransactionSerializer(BaseUnitTest):
             compare_sorted=True,
         )
 
+    @mock.patch(
+        'nailgun.lcm.transaction_serializer.get_concurrency_policy',
+        new=lcm.transaction_serializer.SingleWorkerConcurrencyPolicy
+    )
+    def test_serialized_tasks_are_reused(self):
+        tasks_cache = lcm.transaction_serializer.SerializedTasksCache(100)
+        with mock.patch.object(lcm.transaction_serializer,
+                               'serialized_tasks_cache', tasks_cache):
+            expected = lcm.TransactionSerializer.serialize(
+                self.context, self.tasks, self.role_resolver
+            )
+            self.assertEqual(0, tasks_cache._tasks.hits)
+            self.assertEqual(
+                expected,
+                lcm.TransactionSerializer.serialize(
+                    self.context, self.tasks, self.role_resolver
+                )
+            )
+            self.assertEqual(len(tasks_cache._tasks), tasks_cache._tasks.hits)
+
+            context = lcm.TransactionContext(copy.deepcopy(self.context.new))
+            context.new['common']['public_ssl']['hostname'] = 'remote'
+            serialized = lcm.TransactionSerializer.serialize(
+                context, self.tasks, self.role_resolver
+            )
+
+        tasks_cache = lcm.transaction_serializer.SerializedTasksCache(0)
+        with mock.patch.object(lcm.transaction_serializer,
+                               'serialized_tasks_cache', tasks_cache):
+            self.assertEqual(
+                lcm.TransactionSerializer.serialize(
+                    context, self.tasks, self.role_resolver
+                ),
+                serialized
+            )
+        self.assertNotEqual(expected, serialized)
+
     def test_resolve_nodes(self):
         serializer = lcm.TransactionSerializer(
             self.context, self.role_resolver
@@ -378,6 +416,36 @@ class TestTransactionSerializer(BaseUnitTest):
             )
         )
 
+    def test_resolve_relation_uses_tasks_names_index(self):
+        serializer = lcm.TransactionSerializer(
+            self.context, self.role_resolver
+        )
+        serializer.tasks_graph = {
+            '1': {'task1': {}, 'task2': {}},
+            '2': {'task2': {}, 'task3': {}},
+            None: {'deploy_start': {}}
+        }
+        serializer.build_tasks_names_index()
+        with mock.patch(
+            'nailgun.lcm.transaction_serializer.NameMatchingPolicy',
+            wraps=lcm.transaction_serializer.NameMatchingPolicy
+        ) as policy_mock:
+            for _ in range(2):
+                self.assertItemsEqual(
+                    [('task2', '1'), ('task2', '2'), ('task3', '2')],
+                    serializer.resolve_relation('/task[23]/', ['1', '2'])
+                )
+                self.assertItemsEqual(
+                    [('task2', '2')],
+                    serializer.resolve_relation(
+                        'task2', ['1', '2', '3'], [('task2', '1')]
+                    )
+                )
+                self.assertItemsEqual(
+                    [], serializer.resolve_relation('task4', ['1', None])
+                )
+        self.assertEqual(3, policy_mock.create.call_count)
+
     def test_need_update_task(self):
         serializer = lcm.TransactionSerializer(
             self.context, self.role_resolver
@@ -431,8 +499,57 @@ class TestTransactionSerializer(BaseUnitTest):
         new=multiprocessing.dummy
     )
     def test_multi_processing_serialization(self):
+        self.addCleanup(
+            lcm.transaction_serializer.MultiProcessingConcurrencyPolicy
+            .shutdown
+        )
         self.test_serialize_integration()
 
+    @mock.patch(
+        'nailgun.lcm.transaction_serializer.settings'
+        '.LCM_SERIALIZERS_CONCURRENCY_FACTOR',
+        new=2
+    )
+    @mock.patch(
+        'nailgun.lcm.transaction_serializer.multiprocessing',
+        new=multiprocessing.dummy
+    )
+    def test_multi_processing_pool_is_reused(self):
+        policy_class = \
+            lcm.transaction_serializer.MultiProcessingConcurrencyPolicy
+        self.addCleanup(policy_class.shutdown)
+        self.test_serialize_integration()
+        pool = policy_class._pool
+        self.assertIsNotNone(pool)
+        self.test_serialize_integration()
+        self.assertIs(pool, policy_class._pool)
+
+    def test_multi_processing_context_is_removed_after_serialization(self):
+        policy = lcm.transaction_serializer.MultiProcessingConcurrencyPolicy(2)
+        with mock.patch.object(policy, 'get_pool') as get_pool_mock:
+            get_pool_mock.return_value.imap_unordered.return_value = []
+            with mock.patch.object(policy, 'dump_context',
+                                   return_value=(1, '/tmp/ctx')), \
+                    mock.patch('nailgun.lcm.transaction_serializer.os'
+                               '.unlink') as unlink_mock:
+                list(policy.execute(self.context, mock.MagicMock(), []))
+        unlink_mock.assert_called_once_with('/tmp/ctx')
+
+    def test_multi_processing_pool_is_terminated_if_not_consumed(self):
+        policy = lcm.transaction_serializer.MultiProcessingConcurrencyPolicy(2)
+        with mock.patch.object(policy, 'get_pool') as get_pool_mock, \
+                mock.patch.object(policy, 'shutdown') as shutdown_mock:
+            get_pool_mock.return_value.imap_unordered.return_value = [1, 2]
+            with mock.patch.object(policy, 'dump_context',
+                                   return_value=(1, '/tmp/ctx')), \
+                    mock.patch('nailgun.lcm.transaction_serializer.os'
+                               '.unlink') as unlink_mock:
+                result = policy.execute(self.context, mock.MagicMock(), [])
+                self.assertEqual(1, next(result))
+                result.close()
+        shutdown_mock.assert_called_once_with(terminate=True)
+        unlink_mock.assert_called_once_with('/tmp/ctx')
+
     def test_get_fault_tolerance(self):
         self.assertEqual(
             11,
@@ -17,6 +17,7 @@ import datetime
 import alembic
 from oslo_serialization import jsonutils
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
 from sqlalchemy.exc import IntegrityError
 
 from nailgun.db import db
@@ -422,6 +423,66 @@ class TestTagExistingNodes(base.BaseAlembicMigrationTest):
         self.assertItemsEqual(tags, ['controller', 'ceph-osd'])
 
 
+class TestDeploymentInfoSnapshots(base.BaseAlembicMigrationTest):
+    def test_deployment_info_snapshots_table_created(self):
+        table = self.meta.tables['deployment_info_snapshots']
+        self.assertIn('checksum', table.c)
+        self.assertIn('deployment_info', table.c)
+
+    def test_node_deployment_info_refers_snapshot(self):
+        db.execute(
+            self.meta.tables['deployment_info_snapshots'].insert(),
+            [{'checksum': 'a' * 40, 'deployment_info': '{"a": "b"}'}]
+        )
+        db.execute(
+            self.meta.tables['node_deployment_info'].insert(),
+            [{'task_id': 55, 'node_uid': '3', 'snapshot_checksum': 'a' * 40}]
+        )
+        with self.assertRaisesRegexp(
+                IntegrityError,
+                'violates foreign key constraint'
+        ):
+            db.execute(
+                self.meta.tables['node_deployment_info'].insert(),
+                [{'task_id': 55, 'node_uid': '4',
+                  'snapshot_checksum': 'b' * 40}]
+            )
+        db.rollback()
+
+
+class TestTransactionsStats(base.BaseAlembicMigrationTest):
+    def test_stats_column_created(self):
+        self.assertIn('stats', self.meta.tables['tasks'].c)
+
+
+class TestNodesMetaChecksums(base.BaseAlembicMigrationTest):
+    def test_meta_checksums_column_created(self):
+        result = db.execute(
+            sa.select([self.meta.tables['nodes'].c.meta_checksums]))
+        for row in result:
+            self.assertEqual({}, jsonutils.loads(row[0]))
+
+
+class TestNodesJSONBFields(base.BaseAlembicMigrationTest):
+    def test_nodes_json_fields_converted_to_jsonb(self):
+        nodes = self.meta.tables['nodes']
+        for column in ('meta', 'labels', 'attributes'):
+            self.assertIsInstance(nodes.c[column].type, psql.JSONB)
+
+    def test_nodes_filtered_by_json_path(self):
+        nodes = self.meta.tables['nodes']
+        db.execute(
+            nodes.update().where(nodes.c.id == 2).values(
+                meta={'system': {'manufacturer': 'Dell'}})
+        )
+        result = db.execute(
+            sa.select([nodes.c.id]).where(
+                nodes.c.meta[('system', 'manufacturer')].astext == 'Dell')
+        ).fetchall()
+        self.assertEqual([(2,)], result)
+        db.rollback()
+
+
 class TestPluginLinksConstraints(base.BaseAlembicMigrationTest):
     # see initial data in setup section
     def test_plugin_links_duplicate_cleanup(self):
@@ -56,6 +56,7 @@ from nailgun.plugins.manager import PluginManager
 from nailgun.settings import settings
 from nailgun.test import base
 from nailgun.utils import dict_merge
+from nailgun.utils import ReadOnlyDict
 
 
 class TestObjects(BaseIntegrationTest):
@@ -106,6 +107,48 @@ class TestObjects(BaseIntegrationTest):
         self.assertIsInstance(iterable_filtered, ifilter)
         self.assertEquals(0, len(list(iterable_filtered)))
 
+    def test_filter_by_json_path(self):
+        nodes = self.env.create_nodes(3)
+        nodes[0].meta = {'system': {'manufacturer': 'Dell'}}
+        nodes[1].meta = {'system': {'manufacturer': 'HP'}}
+        nodes[2].meta = {'system': {}}
+        nodes[2].labels = {'rack': 1}
+        self.db.flush()
+
+        query_filtered = objects.NodeCollection.filter_by(
+            None, **{'meta.system.manufacturer': 'Dell'})
+        self.assertIsInstance(query_filtered, Query)
+        self.assertEqual([nodes[0].id], [n.id for n in query_filtered])
+
+        query_filtered = objects.NodeCollection.filter_by(
+            None, **{'labels.rack': 1, 'id': nodes[2].id})
+        self.assertEqual([nodes[2].id], [n.id for n in query_filtered])
+
+        query_filtered = objects.NodeCollection.filter_by(
+            None, **{'meta.system.manufacturer': None})
+        self.assertEqual([nodes[2].id], [n.id for n in query_filtered])
+
+        iterable_filtered = objects.NodeCollection.filter_by(
+            nodes, **{'meta.system.manufacturer': 'HP'})
+        self.assertEqual([nodes[1]], list(iterable_filtered))
+
+    def test_filter_by_json_path_null(self):
+        nodes = self.env.create_nodes(3)
+        nodes[0].meta = {'system': {}}
+        nodes[1].meta = {'system': {'manufacturer': None}}
+        nodes[2].meta = {'system': {'manufacturer': 'Dell'}}
+        self.db.flush()
+
+        query_filtered = objects.NodeCollection.filter_by(
+            None, **{'meta.system.manufacturer': None})
+        self.assertItemsEqual(
+            [nodes[0].id, nodes[1].id], [n.id for n in query_filtered])
+
+        iterable_filtered = objects.NodeCollection.filter_by(
+            nodes, **{'meta.system.manufacturer': None})
+        self.assertItemsEqual(
+            [nodes[0].id, nodes[1].id], [n.id for n in iterable_filtered])
+
     def test_filter_by_not(self):
         names = cycle('ABCDE')
         os = cycle([consts.RELEASE_OS.centos, consts.RELEASE_OS.ubuntu])
@@ -532,6 +575,54 @@ class TestNodeObject(BaseIntegrationTest):
 
             self.assertEqual(node_db.status, status)
 
+    @mock.patch.object(objects.Node, 'update_interfaces')
+    def test_update_by_agent_applies_changed_meta_sections(self, m_update):
+        node_db = self.env.create_node()
+        meta = copy.deepcopy(node_db.meta)
+
+        def update_by_agent(meta):
+            objects.Node.update_by_agent(
+                node_db, {'meta': copy.deepcopy(meta), 'is_agent': True})
+
+        update_by_agent(meta)
+        self.assertEqual(1, m_update.call_count)
+        self.assertEqual(
+            objects.Node.get_meta_checksums(meta), node_db.meta_checksums)
+
+        update_by_agent(meta)
+        self.assertEqual(1, m_update.call_count)
+
+        meta['memory']['total'] += 1024
+        update_by_agent(meta)
+        self.assertEqual(1, m_update.call_count)
+        self.assertEqual(meta['memory'], node_db.meta['memory'])
+
+        meta['interfaces'][0]['current_speed'] = 10
+        update_by_agent(meta)
+        self.assertEqual(2, m_update.call_count)
+
+    def test_get_changed_meta_sections(self):
+        node_db = self.env.create_node()
+        meta = copy.deepcopy(node_db.meta)
+        self.assertEqual(
+            set(meta),
+            objects.Node.get_changed_meta_sections(node_db, meta, True))
+        self.assertEqual(
+            set(),
+            objects.Node.get_changed_meta_sections(node_db, meta, True))
+
+        disks = meta.pop('disks')
+        meta['cpu']['total'] += 1
+        self.assertEqual(
+            set(['cpu', 'disks']),
+            objects.Node.get_changed_meta_sections(node_db, meta, True))
+
+        meta['disks'] = disks
+        self.assertEqual(
+            set(meta),
+            objects.Node.get_changed_meta_sections(node_db, meta, False))
+        self.assertEqual({}, node_db.meta_checksums)
+
     def test_node_roles_to_pending_roles(self):
         self.env.create(
             cluster_kwargs={},
@@ -1633,6 +1724,38 @@ class TestClusterObject(BaseTestCase):
         plugin_attrs = attr.editable['test_plugin']['metadata']['versions'][0]
         self.assertEqual('{}', plugin_attrs['plugin_name_text']['value'])
 
+    def test_get_attributes_is_cached_until_changed(self):
+        cluster = self.env.create_cluster(api=False)
+        self.db.commit()
+        with mock.patch.object(
+                PluginManager, 'get_plugins_attributes',
+                return_value={}) as m_get_plugins_attrs:
+            attrs = objects.Cluster.get_attributes(cluster)
+            attrs.editable['common']['changed'] = {'value': True}
+            self.assertNotIn(
+                'changed', objects.Cluster.get_editable_attributes(
+                    cluster, readonly=True)['common'])
+            self.assertEqual(1, m_get_plugins_attrs.call_count)
+
+            objects.Cluster.patch_attributes(
+                cluster, {'editable': {'common': {'changed': {'value': 1}}}})
+            calls_count = m_get_plugins_attrs.call_count
+            editable = objects.Cluster.get_editable_attributes(cluster)
+            self.assertEqual(1, editable['common']['changed']['value'])
+            self.assertEqual(calls_count + 1, m_get_plugins_attrs.call_count)
+
+            self.db.commit()
+            objects.Cluster.get_editable_attributes(cluster)
+            self.assertEqual(calls_count + 2, m_get_plugins_attrs.call_count)
+
+    def test_get_editable_attributes_readonly(self):
+        cluster = self.env.create_cluster(api=False)
+        editable = objects.Cluster.get_editable_attributes(
+            cluster, readonly=True)
+        self.assertIsInstance(editable, ReadOnlyDict)
+        self.assertEqual(
+            objects.Cluster.get_editable_attributes(cluster), editable)
+
     @mock.patch.object(objects.Cluster, 'get_editable_attributes')
     def test_cluster_get_restrictions_models(self, m_get_attrs):
         attrs = {'some': {'fake': 'attributes'}}
@@ -0,0 +1,105 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+
+import mock
+
+from nailgun.plugins.loaders import files_manager
+from nailgun.test import base
+
+
+class TestFilesCache(base.BaseUnitTest):
+
+    def setUp(self):
+        super(TestFilesCache, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.cache = files_manager.FilesCache(
+            os.path.join(self.tmp_dir, 'cache'))
+        self.path = os.path.join(self.tmp_dir, 'tasks.yaml')
+        self.write_file('- id: task1\n')
+        patcher = mock.patch.object(files_manager, 'files_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_file(self, content, mtime=1000):
+        with open(self.path, 'w') as f:
+            f.write(content)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_file_is_parsed_once(self):
+        loader = mock.Mock(return_value=[{'id': 'task1'}])
+        self.assertEqual(
+            [{'id': 'task1'}], self.cache.get(self.path, loader))
+        self.assertEqual(
+            [{'id': 'task1'}], self.cache.get(self.path, loader))
+        self.assertEqual(1, loader.call_count)
+
+    def test_changed_file_is_parsed_again(self):
+        self.assertEqual(
+            [{'id': 'task1'}], files_manager.load_yaml_file(self.path))
+
+        self.write_file('- id: task2\n', mtime=2000)
+        self.assertEqual(
+            [{'id': 'task2'}], files_manager.load_yaml_file(self.path))
+
+    def test_cache_is_disabled_without_path(self):
+        cache = files_manager.FilesCache(None)
+        loader = mock.Mock(return_value={})
+        cache.get(self.path, loader)
+        cache.get(self.path, loader)
+        self.assertEqual(2, loader.call_count)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, 'cache')))
+
+    def test_cache_directory_is_private(self):
+        files_manager.load_yaml_file(self.path)
+        self.assertEqual(
+            0o700, os.stat(self.cache.path).st_mode & 0o777)
+
+    def test_cache_is_disabled_for_untrusted_directory(self):
+        os.makedirs(self.cache.path)
+        os.chmod(self.cache.path, 0o777)
+        loader = mock.Mock(return_value={})
+        with mock.patch.object(files_manager.pickle, 'load') as m_load:
+            self.cache.get(self.path, loader)
+            self.cache.get(self.path, loader)
+        self.assertEqual(2, loader.call_count)
+        self.assertFalse(m_load.called)
+        self.assertEqual([], os.listdir(self.cache.path))
+
+    @mock.patch.object(files_manager.os, 'getuid', return_value=-1)
+    def test_cache_is_disabled_for_directory_of_other_user(self, _):
+        loader = mock.Mock(return_value={})
+        self.cache.get(self.path, loader)
+        self.cache.get(self.path, loader)
+        self.assertEqual(2, loader.call_count)
+
+    def test_broken_entry_is_ignored(self):
+        files_manager.load_yaml_file(self.path)
+        entry_path = self.cache._get_entry_path(self.path)
+        with open(entry_path, 'wb') as f:
+            f.write(b'broken')
+
+        self.assertEqual(
+            [{'id': 'task1'}], files_manager.load_yaml_file(self.path))
+
+    def test_files_manager_uses_cache(self):
+        fm = files_manager.FilesManager()
+        with mock.patch.object(self.cache, 'get',
+                               wraps=self.cache.get) as m_get:
+            self.assertEqual([{'id': 'task1'}], fm.load(self.path))
+        self.assertEqual(1, m_get.call_count)
@@ -86,6 +86,35 @@ class TestPatternBasedRoleResolver(BaseUnitTest):
         self.assertEqual(1, len(any_node))
         self.assertTrue(any_node.issubset(all_nodes))
 
+    def test_resolve_any_is_deterministic(self):
+        resolver = role_resolver.RoleResolver(self.nodes)
+        self.assertEqual(
+            {"2"},
+            resolver.resolve(["controller"], consts.NODE_RESOLVE_POLICY.any)
+        )
+        self.assertEqual(
+            {"0"},
+            resolver.resolve("*", consts.NODE_RESOLVE_POLICY.any)
+        )
+
+    def test_resolve_results_are_cached(self):
+        resolver = role_resolver.RoleResolver(self.nodes)
+        result = resolver.resolve(["controller", "/cinder/"])
+        self.assertEqual({"1", "2", "3"}, result)
+        self.assertIsInstance(result, frozenset)
+        self.assertIs(result, resolver.resolve(("/cinder/", "controller")))
+        self.assertIsNot(
+            result,
+            resolver.resolve(
+                ["controller", "/cinder/"], consts.NODE_RESOLVE_POLICY.any
+            )
+        )
+        self.assertIs(resolver.resolve("*"), resolver.resolve("*"))
+        self.assertEqual(
+            {'hits': 2, 'misses': 3, 'hit_rate': 0.4},
+            resolver.get_stats()
+        )
+
     def test_get_all_roles(self):
         resolver = role_resolver.RoleResolver(self.nodes)
         all_roles = {r for roles in self.roles_of_nodes for r in roles}
@@ -110,3 +139,4 @@ class TestNullResolver(BaseUnitTest):
             node_ids,
             role_resolver.NullResolver(node_ids).resolve("controller")
         )
+        self.assertEqual({}, role_resolver.NullResolver(node_ids).get_stats())
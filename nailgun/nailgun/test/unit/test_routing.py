@@ -0,0 +1,121 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import re
+
+import web
+
+from nailgun.api.v1 import urls as api_urls
+from nailgun.test import base
+from nailgun.utils import routing
+
+
+class TestRouter(base.BaseUnitTest):
+
+    def test_get_static_prefix(self):
+        cases = [
+            (r'/clusters/(?P<cluster_id>\d+)/?$', '/clusters/'),
+            (r'^/nodes/?$', '/nodes'),
+            (r'/dump/[a-z]+$', '/dump/'),
+            (r'/logs\.txt', '/logs.txt'),
+            (r'.*/clusters/?$', ''),
+            (r'/nodes|/clusters', ''),
+            (r'/api(/v[0-9]+)?/dump', '/api'),
+        ]
+        for pattern, expected in cases:
+            self.assertEqual(expected, routing.get_static_prefix(pattern))
+
+    def test_first_matching_route_wins(self):
+        router = routing.Router([
+            (r'.*/(?P<obj_id>\d+)/?$', 'any'),
+            (r'/clusters/(?P<cluster_id>\d+)/?$', 'cluster'),
+            (r'/clusters/(?P<cluster_id>\d+)/nodes/?$', 'nodes'),
+            (r'/clusters/?$', 'clusters'),
+        ])
+        value, match = router.match('/clusters/1')
+        self.assertEqual('any', value)
+        self.assertEqual({'obj_id': '1'}, match.groupdict())
+
+        value, match = router.match('/clusters/1/nodes/')
+        self.assertEqual('nodes', value)
+        self.assertEqual({'cluster_id': '1'}, match.groupdict())
+
+        self.assertEqual('clusters', router.match('/clusters')[0])
+        self.assertEqual((None, None), router.match('/releases/'))
+
+    def test_not_combinable_routes(self):
+        router = routing.Router([
+            (r'/a/(\w)\1/?$', 'backref'),
+            (r'(?i)/b/?$', 'flags'),
+            (r'/c/(?P<x>\w)(?P=x)$', 'named backref'),
+            (r'/[]/]/?$', 'class'),
+        ], max_groups=2)
+        self.assertEqual('backref', router.match('/a/xx')[0])
+        self.assertEqual('flags', router.match('/B')[0])
+        self.assertEqual('named backref', router.match('/c/yy')[0])
+        self.assertEqual('class', router.match('/]')[0])
+        self.assertEqual((None, None), router.match('/a/xy'))
+
+    def test_routes_are_split_by_max_groups(self):
+        routes = [(r'/r{0}/(?P<id>\d+)$'.format(i), i) for i in range(10)]
+        router = routing.Router(routes, max_groups=3)
+        for i in range(10):
+            value, match = router.match('/r{0}/5'.format(i))
+            self.assertEqual(i, value)
+            self.assertEqual('5', match.group('id'))
+
+    def test_invalid_pattern(self):
+        self.assertRaises(re.error, routing.Router, [('[bad(', None)])
+
+    def test_same_result_as_sequential_match_for_api_urls(self):
+        urls = api_urls.get_all_urls()[0]
+        routes = [('^' + p + '$', h) for p, h in zip(urls[::2], urls[1::2])]
+        router = routing.Router(routes)
+        paths = [
+            '/clusters/', '/clusters/1/', '/clusters/1/attributes/defaults',
+            '/nodes/agent/', '/nodes/1/interfaces/', '/dump/snapshot.tar',
+            '/releases/2/deployment_graphs/custom-graph/',
+            '/transactions/5/stats', '/plugins/sync/', '/clusters/x/',
+            '/unknown/', '',
+        ]
+        for path in paths:
+            expected = next(
+                ((h, re.match(p, path).groups())
+                 for p, h in routes if re.match(p, path)),
+                (None, None))
+            value, match = router.match(path)
+            self.assertEqual(
+                expected, (value, match.groups() if match else None))
+
+
+class TestRoutedApplication(base.BaseUnitTest):
+
+    def test_match(self):
+        app = api_urls.RoutedApplication(
+            (r'/clusters/(?P<cluster_id>\d+)/?$', 'ClusterHandler',
+             r'/clusters/?$', 'ClusterCollectionHandler'), {})
+        self.assertEqual(
+            ('ClusterHandler', ['1']), app._match(app.mapping, '/clusters/1'))
+        self.assertEqual((None, None), app._match(app.mapping, '/clusters/a'))
+
+        app.add_mapping(r'/nodes/?$', 'NodeCollectionHandler')
+        self.assertEqual(
+            ('NodeCollectionHandler', []), app._match(app.mapping, '/nodes'))
+
+    def test_sub_applications_are_matched_by_prefix(self):
+        sub_app = web.application()
+        app = api_urls.RoutedApplication(('/api', sub_app), {})
+        what, args = app._match(app.mapping, '/api/clusters')
+        self.assertIsNone(args)
+        self.assertTrue(callable(what))
@@ -87,3 +87,124 @@ class TestRpcAcknowledge(base.BaseTestCase):
             self.consumer.consume_msg, self.body, self.msg)
         self.assertFalse(self.msg.ack.called)
         self.assertEqual(self.msg.requeue.call_count, 1)
+
+
+class TestRpcCoalescing(base.BaseUnitTest):
+
+    def setUp(self):
+        super(TestRpcCoalescing, self).setUp()
+        self.receiver = mock.Mock()
+        self.consumer = receiverd.RPCConsumer(
+            mock.Mock(), self.receiver, batch_size=10
+        )
+
+    def _make_msg(self, method, task_uuid, status=None):
+        return (
+            {'method': method,
+             'args': {'task_uuid': task_uuid, 'status': status}},
+            mock.Mock()
+        )
+
+    def test_messages_are_grouped_by_task(self):
+        messages = [
+            self._make_msg('deploy_resp', '1'),
+            self._make_msg('deploy_resp', '1', 'ready'),
+            self._make_msg('deploy_resp', '1'),
+            self._make_msg('deploy_resp', '2'),
+            self._make_msg('transaction_resp', '2'),
+            self._make_msg('transaction_resp', '2', 'running'),
+            self._make_msg('remove_nodes_resp', '2'),
+            self._make_msg('remove_nodes_resp', '2'),
+        ]
+        groups = list(self.consumer.group_messages(messages))
+        self.assertEqual(
+            [messages[:1], messages[1:2], messages[2:3], messages[3:4],
+             messages[4:6], messages[6:7], messages[7:]],
+            groups
+        )
+
+    @mock.patch('nailgun.rpc.receiverd.db')
+    def test_group_is_committed_once(self, db_mock):
+        messages = [self._make_msg('deploy_resp', '1') for _ in range(3)]
+        for body, msg in messages:
+            self.consumer.consume_msg(body, msg)
+
+        self.assertEqual(0, self.receiver.deploy_resp.call_count)
+        self.consumer.flush()
+        self.assertEqual(3, self.receiver.deploy_resp.call_count)
+        self.assertEqual(1, db_mock.commit.call_count)
+        for _, msg in messages:
+            self.assertEqual(1, msg.ack.call_count)
+
+    @mock.patch('nailgun.rpc.receiverd.db')
+    def test_messages_processed_one_by_one_if_group_failed(self, db_mock):
+        messages = [self._make_msg('deploy_resp', '1') for _ in range(2)]
+        self.receiver.deploy_resp.side_effect = [None, Exception, None, None]
+        for body, msg in messages:
+            self.consumer.consume_msg(body, msg)
+        self.consumer.flush()
+
+        self.assertEqual(4, self.receiver.deploy_resp.call_count)
+        self.assertEqual(1, db_mock.rollback.call_count)
+        self.assertEqual(2, db_mock.commit.call_count)
+        for _, msg in messages:
+            self.assertEqual(1, msg.ack.call_count)
+
+    @mock.patch('nailgun.rpc.receiverd.db')
+    def test_batch_is_flushed_when_full(self, db_mock):
+        self.consumer.batch_size = 2
+        for _ in range(2):
+            self.consumer.consume_msg(*self._make_msg('deploy_resp', '1'))
+        self.assertEqual(2, self.receiver.deploy_resp.call_count)
+        self.assertEqual([], self.consumer.pending_messages)
+
+    @mock.patch('nailgun.rpc.receiverd.time')
+    @mock.patch('nailgun.rpc.receiverd.db')
+    def test_batch_is_flushed_on_timeout(self, db_mock, time_mock):
+        time_mock.time.return_value = 10
+        self.consumer.consume_msg(*self._make_msg('deploy_resp', '1'))
+        self.consumer.on_iteration()
+        self.assertEqual(0, self.receiver.deploy_resp.call_count)
+        time_mock.time.return_value = 11
+        self.consumer.on_iteration()
+        self.assertEqual(1, self.receiver.deploy_resp.call_count)
+
+    @mock.patch('nailgun.rpc.receiverd.db')
+    def test_message_with_final_status_is_not_replayed(self, db_mock):
+        messages = [
+            self._make_msg('transaction_resp', '1'),
+            self._make_msg('transaction_resp', '1'),
+            self._make_msg('transaction_resp', '1', 'ready'),
+        ]
+
+        def transaction_resp(task_uuid, status):
+            # the final message commits the changes and fails after that
+            if status == 'ready':
+                db_mock.commit()
+                raise Exception
+
+        self.receiver.transaction_resp.side_effect = transaction_resp
+        for body, msg in messages:
+            self.consumer.consume_msg(body, msg)
+        self.consumer.flush()
+
+        self.assertEqual(3, self.receiver.transaction_resp.call_count)
+        # the group of first messages and the internal commit
+        self.assertEqual(2, db_mock.commit.call_count)
+        self.assertEqual(0, db_mock.rollback.call_count)
+        for _, msg in messages:
+            self.assertEqual(1, msg.ack.call_count)
+
+    @mock.patch('nailgun.rpc.receiverd.db')
+    def test_pending_messages_are_dropped_on_reconnect(self, db_mock):
+        messages = [self._make_msg('deploy_resp', '1') for _ in range(2)]
+        for body, msg in messages:
+            self.consumer.consume_msg(body, msg)
+
+        self.consumer.on_connection_revived()
+        self.assertEqual([], self.consumer.pending_messages)
+        self.consumer.flush()
+        self.assertEqual(0, self.receiver.deploy_resp.call_count)
+        for _, msg in messages:
+            self.assertFalse(msg.ack.called)
+            self.assertFalse(msg.requeue.called)
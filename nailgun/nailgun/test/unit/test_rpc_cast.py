@@ -0,0 +1,78 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import amqp.exceptions as amqp_exceptions
+import mock
+from oslo_serialization import jsonutils
+
+from nailgun import rpc
+from nailgun.test import base
+
+
+class TestRpcCast(base.BaseUnitTest):
+
+    def setUp(self):
+        super(TestRpcCast, self).setUp()
+        self.producer = mock.MagicMock()
+        # call the function wrapped by connection.ensure directly
+        self.producer.connection.ensure.side_effect = \
+            lambda obj, fun, **kwargs: fun
+        pools_patcher = mock.patch('nailgun.rpc.pools')
+        self.pools = pools_patcher.start()
+        self.addCleanup(pools_patcher.stop)
+        self.pools.producers.__getitem__.return_value.acquire.return_value \
+            .__enter__.return_value = self.producer
+        rpc.publish_stats.reset()
+
+    def test_message_is_published_by_pooled_producer(self):
+        message = {'method': 'deploy', 'args': {'task_uuid': '1'}}
+        rpc.cast('naily', message)
+
+        self.pools.producers.__getitem__.assert_called_once_with(
+            rpc.connection)
+        self.producer.publish.assert_called_once_with(
+            jsonutils.dumps(message), exchange=rpc.naily_exchange,
+            routing_key='naily', content_type='application/json',
+            content_encoding='utf-8', compression='gzip')
+        stats = rpc.publish_stats.to_dict()
+        self.assertEqual(1, stats['count'])
+        self.assertEqual(len(jsonutils.dumps(message)), stats['max_size'])
+
+    def test_message_is_published_after_entities_are_deleted(self):
+        self.producer.publish.side_effect = [
+            amqp_exceptions.PreconditionFailed('error'), None]
+        with mock.patch('nailgun.rpc.utils.delete_entities') as m_delete:
+            rpc.cast('naily_service', {}, service=True)
+
+        self.assertEqual(1, m_delete.call_count)
+        self.producer.revive.assert_called_once_with(
+            self.producer.connection.channel.return_value)
+        self.assertEqual(2, self.producer.publish.call_count)
+
+    @mock.patch('nailgun.rpc.settings.RPC_LOG_MAX_BODY_SIZE', 10)
+    @mock.patch('nailgun.rpc.logger')
+    def test_message_is_logged_lazily(self, m_logger):
+        message = {'args': 'x' * 100}
+
+        m_logger.isEnabledFor.return_value = False
+        rpc.cast('naily', message)
+        self.assertEqual(1, m_logger.debug.call_count)
+
+        m_logger.reset_mock()
+        m_logger.isEnabledFor.return_value = True
+        rpc.cast('naily', message)
+        self.assertEqual(2, m_logger.debug.call_count)
+        self.assertEqual(
+            jsonutils.dumps(message)[:10] + '...',
+            m_logger.debug.call_args_list[0][0][2])
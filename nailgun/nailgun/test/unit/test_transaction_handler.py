@@ -238,6 +238,26 @@ class TestTransactionHandlers(BaseTestCase):
         )
         self.assertEqual(resp.status_code, 404)
 
+    def test_get_transaction_stats(self):
+        stats = {
+            'phases': [{'name': 'serialize', 'duration': 1.5, 'rows': 10}],
+            'duration': 1.5
+        }
+        transaction = objects.Transaction.create({
+            'cluster_id': self.cluster_db.id,
+            'status': consts.TASK_STATUSES.ready,
+            'name': consts.TASK_NAMES.deployment
+        })
+        objects.Transaction.attach_stats(transaction, stats)
+        resp = self.app.get(
+            reverse(
+                'TransactionStats',
+                kwargs={'transaction_id': transaction.id}),
+            headers=self.default_headers
+        )
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(stats, resp.json_body)
+
 
 class TestTransactionCollectionHandlers(BaseTestCase):
 
@@ -14,9 +14,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from nailgun.test.base import BaseTestCase
 
 from nailgun import consts
+from nailgun.db.sqlalchemy import models
 from nailgun import objects
 
 
@@ -77,6 +80,119 @@ class TestTransactionObject(BaseTestCase):
         )
         self.assertEqual(objects.Transaction.get_deployment_info(None), {})
 
+    def test_deployment_info_is_stored_once(self):
+        transactions = []
+        for _ in range(2):
+            transaction = objects.Transaction.create({
+                'cluster_id': self.cluster.id,
+                'name': consts.TASK_NAMES.deployment,
+                'status': consts.TASK_STATUSES.ready
+            })
+            objects.Transaction.attach_deployment_info(transaction, {
+                'common': {'a': 'b'},
+                'nodes': {'1': {'c': 'd'}, '2': {'c': 'd'}, '3': {'e': 'f'}}
+            })
+            transactions.append(transaction)
+
+        self.assertEqual(
+            2, objects.DeploymentInfoSnapshotCollection.count()
+        )
+        for transaction in transactions:
+            self.assertEqual(
+                {'common': {'a': 'b'},
+                 'nodes': {'1': {'c': 'd'}, '2': {'c': 'd'}, '3': {'e': 'f'}}},
+                objects.Transaction.get_deployment_info(transaction)
+            )
+
+    def test_delete_unused_deployment_info_snapshots(self):
+        transaction = objects.Transaction.create({
+            'cluster_id': self.cluster.id,
+            'name': consts.TASK_NAMES.deployment,
+            'status': consts.TASK_STATUSES.ready
+        })
+        objects.Transaction.attach_deployment_info(
+            transaction, {'common': {}, 'nodes': {'1': {'a': 'b'}}}
+        )
+        objects.DeploymentInfoSnapshotCollection.store([{'c': 'd'}])
+        self.assertEqual(
+            2, objects.DeploymentInfoSnapshotCollection.count()
+        )
+        objects.DeploymentInfoSnapshotCollection.delete_unused()
+        self.assertEqual(
+            [objects.DeploymentInfoSnapshot.get_checksum({'a': 'b'})],
+            [x.checksum for x in
+             objects.DeploymentInfoSnapshotCollection.all()]
+        )
+
+    def test_store_deployment_info_stored_concurrently(self):
+        collection = objects.DeploymentInfoSnapshotCollection
+        checksums = collection.store([{'a': 'b'}])
+        # the snapshot is stored by another transaction after the check
+        with mock.patch.object(collection, '_lock_existing',
+                               return_value=[]):
+            self.assertEqual(
+                checksums + [objects.DeploymentInfoSnapshot.get_checksum(
+                    {'c': 'd'})],
+                collection.store([{'a': 'b'}, {'c': 'd'}])
+            )
+        self.assertEqual(2, collection.count())
+
+    def test_get_legacy_deployment_info(self):
+        transaction = objects.Transaction.create({
+            'cluster_id': self.cluster.id,
+            'name': consts.TASK_NAMES.deployment,
+            'status': consts.TASK_STATUSES.ready,
+            'deployment_info': {'a': 'b'}
+        })
+        self.db.add(models.NodeDeploymentInfo(
+            task_id=transaction.id, node_uid='1',
+            deployment_info={'c': 'd'}
+        ))
+        self.db.flush()
+        self.assertEqual(
+            {'common': {'a': 'b'}, 'nodes': {'1': {'c': 'd'}}},
+            objects.Transaction.get_deployment_info(transaction)
+        )
+
+    def test_get_deployment_info_for_several_transactions(self):
+        transactions = []
+        for i in range(2):
+            transaction = objects.Transaction.create({
+                'cluster_id': self.cluster.id,
+                'name': consts.TASK_NAMES.deployment,
+                'status': consts.TASK_STATUSES.ready
+            })
+            objects.Transaction.attach_deployment_info(transaction, {
+                'common': {'a': i},
+                'nodes': {'1': {'b': i}, '2': {'c': i}}
+            })
+            transactions.append(transaction)
+        self.db.flush()
+
+        self.assertEqual(
+            {}, objects.TransactionCollection.get_deployment_info({})
+        )
+        self.assertEqual(
+            {
+                transactions[0]: {
+                    'common': {'a': 0}, 'nodes': {'1': {'b': 0}}
+                },
+                transactions[1]: {
+                    'common': {'a': 1},
+                    'nodes': {'1': {'b': 1}, '2': {'c': 1}}
+                }
+            },
+            objects.TransactionCollection.get_deployment_info({
+                transactions[0]: ['1'], transactions[1]: ['1', '2']
+            })
+        )
+        self.assertEqual(
+            {transactions[0]: {'common': {'a': 0}, 'nodes': {}}},
+            objects.TransactionCollection.get_deployment_info({
+                transactions[0]: []
+            })
+        )
+
     def test_get_cluster_settings(self):
         transaction = objects.Transaction.create({
             'cluster_id': self.cluster.id,
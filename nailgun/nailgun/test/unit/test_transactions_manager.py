@@ -18,6 +18,7 @@ import mock
 
 from nailgun import consts
 from nailgun.transactions import manager
+from nailgun.transactions.stats import TransactionStats
 
 from nailgun.test.base import BaseUnitTest
 
@@ -78,6 +79,40 @@ class TestMakeAstuteMessage(BaseUnitTest):
         )
 
 
+class TestTransactionStats(BaseUnitTest):
+
+    @mock.patch('nailgun.transactions.stats.time.time',
+                side_effect=[10, 12.5])
+    def test_phases_are_measured(self, _):
+        stats = TransactionStats()
+        with stats.phase('serialize') as phase:
+            phase['rows'] = 5
+
+        self.assertEqual(
+            {
+                'phases': [{'name': 'serialize', 'duration': 2.5, 'rows': 5}],
+                'duration': 2.5,
+            },
+            stats.to_dict()
+        )
+
+    def test_phases_are_profiled(self):
+        stats = TransactionStats(profile=True)
+        with stats.phase('get_expected_state'):
+            manager._get_node_attributes({}, 'on_success')
+
+        result = stats.to_dict()
+        self.assertEqual('get_expected_state', result['phases'][0]['name'])
+        self.assertIn('_get_node_attributes', result['profile'])
+
+    def test_failed_phase_is_measured(self):
+        stats = TransactionStats()
+        with self.assertRaises(ValueError):
+            with stats.phase('rpc_cast'):
+                raise ValueError()
+        self.assertEqual('rpc_cast', stats.phases[0]['name'])
+
+
 class TestRemoveObsoleteTasks(BaseUnitTest):
 
     @mock.patch('nailgun.transactions.manager.db')
@@ -390,6 +425,39 @@ class TestGetNodesToRun(BaseUnitTest):
             mock.ANY, 'id', [1, 2, 3]
         )
 
+    @mock.patch('nailgun.transactions.manager.objects')
+    def test_node_filter_loads_only_referred_fields(self, obj_mock):
+        nodes_obj_mock = obj_mock.NodeCollection
+        cluster = mock.MagicMock()
+        nodes_obj_mock.to_list.return_value = []
+        manager._get_nodes_to_run(cluster, '$.status = ready')
+        nodes_obj_mock.load_only.assert_called_once_with(
+            mock.ANY, ('id', 'status')
+        )
+        nodes_obj_mock.to_list.assert_called_once_with(
+            nodes_obj_mock.load_only.return_value, fields=('id', 'status')
+        )
+
+    def test_get_node_filter_fields(self):
+        self.assertEqual(
+            ('id', 'status', 'pending_deletion', 'pending_addition',
+             'error_type'),
+            manager._get_node_filter_fields(manager._DEFAULT_NODE_FILTER)
+        )
+        self.assertEqual(
+            ('id', 'meta'),
+            manager._get_node_filter_fields(
+                "$.meta.system.manufacturer = 'Dell'")
+        )
+        self.assertEqual(
+            manager._NODE_FILTER_FIELDS,
+            manager._get_node_filter_fields("'ceph' in $.roles.select($)")
+        )
+        self.assertEqual(
+            manager._NODE_FILTER_FIELDS,
+            manager._get_node_filter_fields("$.network_data != null")
+        )
+
 
 class TestGetCurrentState(BaseUnitTest):
     def setUp(self):
@@ -439,12 +507,13 @@ class TestGetCurrentState(BaseUnitTest):
         txs_mock.get_successful_transactions_per_task.return_value = \
             transactions
 
-        objects_mock.Transaction.get_deployment_info.side_effect = [
-            {'common': {'key1': 'value1'},
-             'nodes': {'1': {'key11': 'value11'}}},
-            {'common': {'key2': 'value2'},
-             'nodes': {'1': {'key21': 'value21'}, '2': {'key22': 'value22'}}},
-        ]
+        txs_mock.get_deployment_info.return_value = {
+            1: {'common': {'key1': 'value1'},
+                'nodes': {'1': {'key11': 'value11'}}},
+            2: {'common': {'key2': 'value2'},
+                'nodes': {'1': {'key21': 'value21'},
+                          '2': {'key22': 'value22'}}},
+        }
 
         current_state = manager._get_current_state(
             self.cluster, self.nodes, self.tasks
@@ -464,3 +533,32 @@ class TestGetCurrentState(BaseUnitTest):
         }
 
         self.assertEqual(expected_state, current_state)
+        txs_mock.get_deployment_info.assert_called_once_with(
+            {1: {'1'}, 2: {'1', '2'}}
+        )
+
+    @mock.patch('nailgun.transactions.manager.objects')
+    def test_assemble_current_state_shares_nodes_info(self, objects_mock):
+        txs_mock = objects_mock.TransactionCollection
+        txs_mock.get_successful_transactions_per_task.return_value = [
+            (1, '1', 'task1'), (1, '1', 'task2'), (1, '2', 'task2')
+        ]
+        self.nodes[1].pending_addition = True
+        txs_mock.get_deployment_info.return_value = {
+            1: {'common': {'key1': 'value1'},
+                'nodes': {'1': {'key11': 'value11'}}},
+        }
+
+        current_state = manager._get_current_state(
+            self.cluster, self.nodes, self.tasks
+        )
+        txs_mock.get_deployment_info.assert_called_once_with({1: {'1'}})
+        self.assertIs(
+            current_state['task1']['nodes']['1'],
+            current_state['task2']['nodes']['1']
+        )
+        self.assertIs(
+            current_state['task1']['common'],
+            current_state['task2']['common']
+        )
+        self.assertEqual({}, current_state['task2']['nodes']['2'])
@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import pickle
+
 import yaml
 
 from oslo_serialization import jsonutils
@@ -103,3 +105,19 @@ f: 6"""
     def test_repr(self):
         d = UnionDict(self.D1, self.D2, self.D3)
         self.assertEquals(eval(repr(d)), self.D)
+
+    def test_nested_view_is_cached(self):
+        d = UnionDict(self.D1, self.D2, self.D3)
+        self.assertIs(d['c'], d['c'])
+
+    def test_contains(self):
+        d = UnionDict(self.D1, self.D2, self.D3)
+        self.assertIn('f', d)
+        self.assertNotIn('g', d)
+        self.assertItemsEqual(self.D, d.keys())
+
+    def test_pickle(self):
+        d = UnionDict(self.D1, self.D2, self.D3)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(
+                self.D, pickle.loads(pickle.dumps(d, protocol)))
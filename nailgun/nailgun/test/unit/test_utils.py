@@ -27,6 +27,7 @@ from nailgun.utils import flatten
 from nailgun.utils import get_lines
 from nailgun.utils import grouper
 from nailgun.utils import parse_bool
+from nailgun.utils import ReadOnlyDict
 from nailgun.utils import text_format_safe
 from nailgun.utils import traverse
 
@@ -280,6 +281,33 @@ class TestTraverse(base.BaseUnitTest):
         generator2.assert_called_once_with('name2')
 
 
+class TestReadOnlyDict(base.BaseUnitTest):
+
+    def setUp(self):
+        super(TestReadOnlyDict, self).setUp()
+        self.data = {'a': {'b': 1}, 'c': [{'d': 2}]}
+        self.view = ReadOnlyDict(self.data)
+
+    def test_view_is_equal_to_data(self):
+        self.assertEqual(self.data, self.view)
+        self.assertEqual(ReadOnlyDict(self.data), self.view)
+        self.assertEqual(1, self.view['a']['b'])
+        self.assertEqual(['a', 'c'], sorted(self.view))
+
+    def test_data_cannot_be_changed(self):
+        self.assertIsInstance(self.view['a'], ReadOnlyDict)
+        self.assertIsInstance(self.view['c'][0], ReadOnlyDict)
+        with self.assertRaises(TypeError):
+            self.view['a']['b'] = 2
+        self.view['c'].append(3)
+        self.assertEqual([{'d': 2}], self.data['c'])
+
+    def test_copy(self):
+        data = self.view.copy()
+        data['a']['b'] = 2
+        self.assertEqual(1, self.data['a']['b'])
+
+
 class TestGetDebianReleaseFile(base.BaseUnitTest):
 
     @mock.patch('nailgun.utils.debian.requests.get')
@@ -14,7 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import itertools
+import re
 
 import six
 
@@ -30,7 +30,7 @@ from nailgun import rpc
 from nailgun.settings import settings
 from nailgun.task import helpers
 from nailgun.task import legacy_tasks_adapter
-from nailgun.utils import dict_update
+from nailgun.transactions.stats import TransactionStats
 from nailgun.utils import get_in
 from nailgun.utils import mule
 from nailgun.utils import role_resolver
@@ -48,6 +48,43 @@ _DEFAULT_NODE_FILTER = (
     "($.status in [ready, provisioned, stopped] or $.error_type = 'deploy')"
 )
 
+# TODO(bgaifullin) remove hard-coded list of fields
+# the field network_data causes fail of following
+# cluster serialization because it modifies attributes of
+# node and this update will be stored in DB.
+_NODE_FILTER_FIELDS = (
+    'id',
+    'name',
+    'status',
+    'pending_deletion',
+    'pending_addition',
+    'error_type',
+    'roles',
+    'pending_roles',
+    'attributes',
+    'meta',
+    'hostname',
+    'labels'
+)
+
+_NODE_FILTER_FIELD_RE = re.compile(r'\$(?:\.(\w+))?')
+
+
+def _get_node_filter_fields(node_filter):
+    """Get fields of node, which are referred by node filter.
+
+    The heavy JSON fields like meta and attributes are loaded
+    only if the filter refers them.
+    """
+    fields = {'id'}
+    for match in _NODE_FILTER_FIELD_RE.finditer(node_filter):
+        field = match.group(1)
+        if field not in _NODE_FILTER_FIELDS:
+            # the node is used as a whole or in nested expression
+            return _NODE_FILTER_FIELDS
+        fields.add(field)
+    return tuple(f for f in _NODE_FILTER_FIELDS if f in fields)
+
 
 def _get_node_attributes(graph, kind):
     r = get_in(graph, kind, 'node_attributes')
@@ -56,10 +93,16 @@ def _get_node_attributes(graph, kind):
     return r
 
 
-def make_astute_message(transaction, context, graph, node_resolver):
-    directory, tasks, metadata = lcm.TransactionSerializer.serialize(
-        context, graph['tasks'], node_resolver
-    )
+def make_astute_message(transaction, context, graph, node_resolver,
+                        stats=None):
+    if stats is None:
+        stats = TransactionStats()
+
+    with stats.phase('serialize') as phase:
+        directory, tasks, metadata = lcm.TransactionSerializer.serialize(
+            context, graph['tasks'], node_resolver
+        )
+        phase['rows'] = sum(len(t) for t in six.itervalues(tasks))
 
     metadata['node_statuses_transitions'] = {
         'successful': _get_node_attributes(graph, 'on_success'),
@@ -69,7 +112,8 @@ def make_astute_message(transaction, context, graph, node_resolver):
     subgraphs = transaction.cache.get('subgraphs')
     if subgraphs:
         metadata['subgraphs'] = subgraphs
-    objects.DeploymentHistoryCollection.create(transaction, tasks)
+    with stats.phase('create_history'):
+        objects.DeploymentHistoryCollection.create(transaction, tasks)
 
     return {
         'api_version': settings.VERSION['api'],
@@ -133,7 +177,7 @@ class TransactionsManager(object):
         self.cluster_id = cluster_id
 
     def execute(self, graphs, dry_run=False, noop_run=False, force=False,
-                debug=False, subgraphs=None):
+                debug=False, subgraphs=None, profile=False):
         """Start a new transaction with a given parameters.
 
         Under the hood starting a new transaction means serialize a lot of
@@ -146,6 +190,7 @@ class TransactionsManager(object):
         :param noop_run: run a new transaction in noop run mode
         :param force: re-evaluate tasks's conditions as it's a first run
         :param debug: enable debug mode for tasks executor
+        :param profile: profile the serialization of transaction
         """
         logger.info(
             'Start new transaction: '
@@ -194,6 +239,7 @@ class TransactionsManager(object):
             cache['dry_run'] = dry_run
             cache['debug'] = debug
             cache['subgraphs'] = subgraphs
+            cache['profile'] = profile
 
             transaction.create_subtask(
                 self.task_name,
@@ -340,11 +386,14 @@ class TransactionsManager(object):
         graph = objects.Cluster.get_deployment_graph(
             cluster, sub_transaction.graph_type
         )
-        nodes = _get_nodes_to_run(
-            cluster,
-            graph.get('node_filter'),
-            sub_transaction.cache.get('nodes')
-        )
+        stats = TransactionStats(sub_transaction.cache.get('profile'))
+        with stats.phase('get_nodes_to_run') as phase:
+            nodes = _get_nodes_to_run(
+                cluster,
+                graph.get('node_filter'),
+                sub_transaction.cache.get('nodes')
+            )
+            phase['rows'] = len(nodes)
         logger.debug(
             "execute graph %s on nodes %s",
             sub_transaction.graph_type, [n.id for n in nodes]
@@ -366,30 +415,46 @@ class TransactionsManager(object):
             resolver,
             sub_transaction.cache.get('tasks'))
 
-        context = lcm.TransactionContext(
-            _get_expected_state(cluster, nodes),
-            _get_current_state(
+        with stats.phase('get_expected_state') as phase:
+            expected_state = _get_expected_state(cluster, nodes)
+            phase['rows'] = len(expected_state['nodes'])
+        with stats.phase('get_current_state') as phase:
+            current_state = _get_current_state(
                 cluster, nodes, graph['tasks'],
                 sub_transaction.cache.get('force')
-            ))
+            )
+            phase['rows'] = len(current_state)
+        context = lcm.TransactionContext(expected_state, current_state)
 
         # Attach desired state to the sub transaction, so when we continue
         # our top-level transaction, the new state will be calculated on
         # top of this.
-        _dump_expected_state(sub_transaction, context.new, graph['tasks'])
+        with stats.phase('dump_expected_state'):
+            _dump_expected_state(
+                sub_transaction, context.new, graph['tasks']
+            )
 
         message = make_astute_message(
-            sub_transaction, context, graph, resolver
+            sub_transaction, context, graph, resolver, stats
         )
         objects.Transaction.on_start(sub_transaction)
         helpers.TaskHelper.create_action_log(sub_transaction)
+        objects.Transaction.attach_stats(sub_transaction, stats.to_dict())
 
         # Once rpc.cast() is called, the message is sent to Astute. By
         # that moment all transaction instanced must exist in database,
         # otherwise we may get wrong result due to RPC receiver won't
         # found entry to update.
         db().commit()
-        rpc.cast('naily', [message])
+        with stats.phase('rpc_cast') as phase:
+            phase['size'] = rpc.cast('naily', [message])
+
+        stats = stats.to_dict()
+        objects.Transaction.attach_stats(sub_transaction, stats)
+        logger.info(
+            "Transaction %s is started in %.3f s",
+            sub_transaction.uuid, stats['duration']
+        )
 
     def _acquire_cluster(self):
         cluster = objects.Cluster.get_by_uid(
@@ -438,27 +503,11 @@ def _get_nodes_to_run(cluster, node_filter, ids=None):
         yaql_exp = yaql_ext.get_default_engine()(
             '$.where({0}).select($.id)'.format(node_filter)
         )
+        fields = _get_node_filter_fields(node_filter)
         ids = yaql_exp.evaluate(
             data=objects.NodeCollection.to_list(
-                nodes,
-                # TODO(bgaifullin) remove hard-coded list of fields
-                # the field network_data causes fail of following
-                # cluster serialization because it modifies attributes of
-                # node and this update will be stored in DB.
-                fields=(
-                    'id',
-                    'name',
-                    'status',
-                    'pending_deletion',
-                    'pending_addition',
-                    'error_type',
-                    'roles',
-                    'pending_roles',
-                    'attributes',
-                    'meta',
-                    'hostname',
-                    'labels'
-                )
+                objects.NodeCollection.load_only(nodes, fields),
+                fields=fields
             ),
             context=yaql_ext.create_context(
                 add_extensions=True, yaqlized=False
@@ -526,31 +575,36 @@ def _get_current_state(cluster, nodes, tasks, force=False):
         t['id'] for t in tasks if t['type'] not in consts.INTERNAL_TASKS
     ]
 
-    txs = objects.TransactionCollection.get_successful_transactions_per_task(
-        cluster.id, tasks_names, nodes
+    txs = list(
+        objects.TransactionCollection.get_successful_transactions_per_task(
+            cluster.id, tasks_names, nodes
+        )
     )
-    state = {}
-    for tx, data in itertools.groupby(txs, lambda x: x[0]):
-        node_ids = []
-        common_attrs = {}
-        deferred_state = {}
-        for _, node_id, task_name in data:
-            t_state = state.setdefault(task_name, {
-                'nodes': {}, 'common': common_attrs
-            })
-            if _is_node_for_redeploy(nodes.get(node_id)):
-                t_state['nodes'][node_id] = {}
-            else:
-                t_state['nodes'][node_id] = deferred_state.setdefault(
-                    node_id, {}
-                )
-                node_ids.append(node_id)
+    if not txs:
+        return {}
 
-        deployment_info = objects.Transaction.get_deployment_info(
-            tx, node_uids=node_ids)
+    nodes_per_transaction = {}
+    for tx, node_id, _ in txs:
+        node_ids = nodes_per_transaction.setdefault(tx, set())
+        if not _is_node_for_redeploy(nodes.get(node_id)):
+            node_ids.add(node_id)
 
-        common_attrs.update(deployment_info['common'])
-        dict_update(deferred_state, deployment_info['nodes'], level=2)
+    deployment_info = objects.TransactionCollection.get_deployment_info(
+        nodes_per_transaction
+    )
+
+    # the deployment info of node is shared between all tasks,
+    # which were executed on this node in the same transaction
+    state = {}
+    for tx, node_id, task_name in txs:
+        tx_info = deployment_info.get(tx, {'common': {}, 'nodes': {}})
+        t_state = state.setdefault(task_name, {
+            'nodes': {}, 'common': tx_info['common']
+        })
+        if node_id in nodes_per_transaction[tx]:
+            t_state['nodes'][node_id] = tx_info['nodes'].get(node_id, {})
+        else:
+            t_state['nodes'][node_id] = {}
 
     return state
 
@@ -644,16 +698,15 @@ def _update_nodes(transaction, nodes_instances, nodes_params):
 
 
 def _update_history(transaction, nodes):
-    for node in nodes:
-        if {'deployment_graph_task_name', 'task_status'}.issubset(node.keys()):
-            objects.DeploymentHistory.update_if_exist(
-                transaction.id,
-                node['uid'],
-                node['deployment_graph_task_name'],
-                node['task_status'],
-                node.get('summary'),
-                node.get('custom'),
-            )
+    objects.DeploymentHistoryCollection.bulk_update_if_exist(
+        transaction.id,
+        [
+            (node['uid'], node['deployment_graph_task_name'],
+             node['task_status'], node.get('summary'), node.get('custom'))
+            for node in nodes
+            if {'deployment_graph_task_name', 'task_status'}.issubset(node)
+        ]
+    )
     db.flush()
 
 
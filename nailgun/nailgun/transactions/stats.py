@@ -0,0 +1,82 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+import cProfile
+import pstats
+import time
+
+import six
+
+from nailgun.logger import logger
+from nailgun.settings import settings
+
+
+class TransactionStats(object):
+    """Collects durations, row counts and sizes of transaction phases.
+
+    Optionally the phases are profiled with cProfile and the report
+    with the most expensive functions is added to the result.
+    """
+
+    def __init__(self, profile=False):
+        self.phases = []
+        self._profiler = cProfile.Profile() if profile else None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Measures the phase of transaction.
+
+        The yielded dict may be updated by metrics of the phase,
+        like 'rows' or 'size'.
+
+        :param name: the name of phase
+        """
+        info = {'name': name}
+        started = time.time()
+        if self._profiler is not None:
+            self._profiler.enable()
+        try:
+            yield info
+        finally:
+            if self._profiler is not None:
+                self._profiler.disable()
+            info['duration'] = round(time.time() - started, 6)
+            self.phases.append(info)
+            logger.debug("Transaction phase %s: %s", name, info)
+
+    def get_profile_report(self, limit=None):
+        """Gets the report of profiler.
+
+        :param limit: the max number of functions in report
+        :return: the text report sorted by cumulative time or None
+        """
+        if self._profiler is None:
+            return None
+
+        stream = six.StringIO()
+        report = pstats.Stats(self._profiler, stream=stream)
+        report.sort_stats('cumulative').print_stats(
+            limit or settings.TRANSACTION_PROFILE_MAX_ENTRIES)
+        return stream.getvalue()
+
+    def to_dict(self):
+        result = {
+            'phases': self.phases,
+            'duration': round(sum(p['duration'] for p in self.phases), 6),
+        }
+        profile = self.get_profile_report()
+        if profile is not None:
+            result['profile'] = profile
+        return result
@@ -113,6 +113,54 @@ def dict_merge(a, b):
     return _merge_recursively(deepcopy(a), b)
 
 
+class ReadOnlyDict(collections.Mapping):
+    """Read-only view of a nested dict.
+
+    Nested dicts are wrapped into views as well and nested lists are
+    shallow copied, so the wrapped data cannot be changed through it.
+    Use copy() to get a mutable deep copy of the data.
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        self._data = data
+
+    @classmethod
+    def _wrap(cls, value):
+        if isinstance(value, dict):
+            return cls(value)
+        if isinstance(value, list):
+            return [cls._wrap(v) for v in value]
+        return value
+
+    def __getitem__(self, key):
+        return self._wrap(self._data[key])
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, ReadOnlyDict):
+            other = other._data
+        return self._data == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'ReadOnlyDict({0!r})'.format(self._data)
+
+    def copy(self):
+        return deepcopy(self._data)
+
+
 def text_format(data, context):
     try:
         return data.format(**context)
@@ -0,0 +1,151 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import atexit
+import collections
+import threading
+
+import six
+
+from nailgun.db import db
+from nailgun.db.sqlalchemy.models import Node
+from nailgun.logger import logger
+from nailgun.settings import settings
+
+
+class NodeHeartbeatWriter(object):
+    """Writes timestamps of heartbeats of node agents to DB by batches.
+
+    The heartbeats are collected in memory, the repeated heartbeats
+    of the same node are coalesced into the latest one. The background
+    thread writes them once per flush_interval seconds, the heartbeats
+    are grouped by the second and each group is written by the single
+    UPDATE statement per batch_size nodes.
+
+    The timestamp is written only for the nodes which are still online
+    and is never moved back. The node which has gone away in the meantime
+    is switched back online by its next heartbeat in the request.
+    """
+
+    def __init__(self, flush_interval, batch_size):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.written = 0
+        self.failed = 0
+        self.coalesced = 0
+        self._heartbeats = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.run, name='node-heartbeat-writer')
+        self._thread.daemon = True
+        self._thread.start()
+        # the collected heartbeats are written before the process exits
+        atexit.register(self.stop)
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def write(self, node_id, timestamp):
+        """Saves the heartbeat of node to be written later.
+
+        :param node_id: id of node
+        :param timestamp: the time of heartbeat
+        """
+        timestamp = timestamp.replace(microsecond=0)
+        with self._lock:
+            if node_id in self._heartbeats:
+                self.coalesced += 1
+            self._heartbeats[node_id] = timestamp
+
+    def get_stats(self):
+        return {
+            'pending': len(self._heartbeats),
+            'written': self.written,
+            'failed': self.failed,
+            'coalesced': self.coalesced,
+        }
+
+    def run(self):
+        stopped = False
+        while not stopped:
+            stopped = self._stop_event.wait(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            heartbeats, self._heartbeats = self._heartbeats, {}
+        if not heartbeats:
+            return
+
+        nodes_by_time = collections.defaultdict(list)
+        for node_id, timestamp in six.iteritems(heartbeats):
+            nodes_by_time[timestamp].append(node_id)
+
+        try:
+            for timestamp, nodes_ids in sorted(six.iteritems(nodes_by_time)):
+                # the rows are locked in the same order by all writers
+                nodes_ids.sort()
+                for i in six.moves.range(0, len(nodes_ids), self.batch_size):
+                    self._write_batch(
+                        timestamp, nodes_ids[i:i + self.batch_size])
+        finally:
+            db.remove()
+
+    def _write_batch(self, timestamp, nodes_ids):
+        try:
+            db().query(Node).filter(
+                Node.id.in_(nodes_ids),
+                Node.timestamp < timestamp
+            ).filter_by(
+                online=True
+            ).update(
+                {'timestamp': timestamp}, synchronize_session=False
+            )
+            db().commit()
+            self.written += len(nodes_ids)
+        except Exception:
+            logger.exception('Failed to write heartbeats of %d nodes',
+                             len(nodes_ids))
+            db().rollback()
+            self.failed += len(nodes_ids)
+
+
+_heartbeat_writer = None
+_heartbeat_writer_lock = threading.Lock()
+
+
+def get_heartbeat_writer():
+    """Get the writer of node heartbeats shared by the process.
+
+    :returns: the started writer or None if NODE_HEARTBEAT_FLUSH_INTERVAL
+              is not set, the heartbeats are written in the request then
+    """
+    global _heartbeat_writer
+
+    if not settings.NODE_HEARTBEAT_FLUSH_INTERVAL:
+        return None
+
+    with _heartbeat_writer_lock:
+        if _heartbeat_writer is None:
+            _heartbeat_writer = NodeHeartbeatWriter(
+                flush_interval=settings.NODE_HEARTBEAT_FLUSH_INTERVAL,
+                batch_size=settings.NODE_HEARTBEAT_BATCH_SIZE)
+            _heartbeat_writer.start()
+        return _heartbeat_writer
@@ -22,6 +22,7 @@ import six
 from nailgun import consts
 from nailgun.logger import logger
 from nailgun import objects
+from nailgun.policy.name_match import ExactMatchingPolicy
 from nailgun.policy.name_match import NameMatchingPolicy
 
 
@@ -51,6 +52,13 @@ class BaseRoleResolver(object):
         :return: the all roles that forth pattern
         """
 
+    def get_stats(self):
+        """Gets the counters of resolver, e.g. the cache hits and misses.
+
+        :return: the dict of counters
+        """
+        return {}
+
 
 class NullResolver(BaseRoleResolver):
     """The implementation of RoleResolver
@@ -88,49 +96,90 @@ class RoleResolver(BaseRoleResolver):
         for node in nodes:
             for r in objects.Node.all_roles(node):
                 self.__mapping[r].add(node.uid)
+        self.__all_nodes = frozenset(
+            uid for nodes_ids in six.itervalues(self.__mapping)
+            for uid in nodes_ids
+        )
+        # the results are cached by (roles, policy), the tasks
+        # refer to the same roles again and again
+        self.__cache = {}
+        self.__patterns = {}
+        self.hits = 0
+        self.misses = 0
 
     def resolve(self, roles, policy=None):
-        result = set()
+        """Resolve roles to IDs of nodes.
+
+        The result is the frozenset, which is shared between calls.
+        """
         if roles == consts.TASK_ROLES.all:
-            # optimization
-            result = {
-                uid for nodes in six.itervalues(self.__mapping)
-                for uid in nodes
-            }
+            key = roles
+        elif isinstance(roles, six.string_types):
+            key = frozenset((roles,))
+        elif isinstance(roles, (list, tuple, set, frozenset)):
+            key = frozenset(roles)
         else:
-            if isinstance(roles, six.string_types):
-                roles = [roles]
-
-            if not isinstance(roles, (list, tuple, set)):
-                # TODO(bgaifullin) fix wrong format for roles in tasks.yaml
-                # After it will be allowed to raise exception here
-                logger.warn(
-                    'Wrong roles format, `roles` should be a list or "*": %s',
-                    roles
-                )
-                return result
-
-            for role in roles:
-                if role in self.SPECIAL_ROLES:
-                    result.update(self.SPECIAL_ROLES[role])
-                else:
-                    pattern = NameMatchingPolicy.create(role)
-                    for node_role, nodes_ids in six.iteritems(self.__mapping):
-                        if pattern.match(node_role):
-                            result.update(nodes_ids)
+            # TODO(bgaifullin) fix wrong format for roles in tasks.yaml
+            # After it will be allowed to raise exception here
+            logger.warn(
+                'Wrong roles format, `roles` should be a list or "*": %s',
+                roles
+            )
+            return frozenset()
+
+        any_node = policy == consts.NODE_RESOLVE_POLICY.any
+        result = self.__cache.get((key, any_node))
+        if result is not None:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        if key == consts.TASK_ROLES.all:
+            result = self.__all_nodes
+        else:
+            result = frozenset(
+                uid for role in key for uid in self._resolve_role(role)
+            )
 
         # in some cases need only one any node from pool
         # for example if need only one any controller.
-        # to distribute load select first node from pool
-        if result and policy == consts.NODE_RESOLVE_POLICY.any:
-            result = {next(iter(result))}
+        # the same node is selected for the same roles
+        if result and any_node:
+            result = frozenset((min(result),))
 
+        self.__cache[key, any_node] = result
         logger.debug(
             "Role '%s' and policy '%s' was resolved to: %s",
             roles, policy, result
         )
         return result
 
+    def _resolve_role(self, role):
+        if role in self.SPECIAL_ROLES:
+            return self.SPECIAL_ROLES[role]
+
+        pattern = self._get_pattern(role)
+        if isinstance(pattern, ExactMatchingPolicy):
+            return self.__mapping.get(role, ())
+        return [
+            uid for node_role, nodes_ids in six.iteritems(self.__mapping)
+            if pattern.match(node_role) for uid in nodes_ids
+        ]
+
+    def _get_pattern(self, role):
+        pattern = self.__patterns.get(role)
+        if pattern is None:
+            pattern = self.__patterns[role] = NameMatchingPolicy.create(role)
+        return pattern
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(float(self.hits) / total, 3) if total else 0.0,
+        }
+
     def get_all_roles(self, pattern=None):
         if pattern is None or pattern == consts.TASK_ROLES.all:
             return set(self.__mapping)
@@ -141,6 +190,6 @@ class RoleResolver(BaseRoleResolver):
         result = set()
         if isinstance(pattern, (list, tuple, set)):
             for p in pattern:
-                p = NameMatchingPolicy.create(p)
+                p = self._get_pattern(p)
                 result.update(r for r in self.__mapping if p.match(r))
         return result
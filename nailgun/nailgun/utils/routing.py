@@ -0,0 +1,249 @@
+#    Copyright 2016 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import re
+
+import six
+
+
+# python 2 re module does not support more than 100 groups per pattern
+MAX_GROUPS = 99
+
+_SPECIAL_CHARS = frozenset('.^$*+?{}[]\\|()')
+_QUANTIFIERS = frozenset('*+?{')
+
+
+def get_static_prefix(pattern):
+    """Gets the literal prefix of regular expression.
+
+    Every string matched by pattern starts with the prefix.
+
+    :param pattern: the regular expression
+    :return: the literal prefix, may be empty
+    """
+    if _has_top_level_alternation(pattern):
+        return ''
+
+    prefix = []
+    i = 1 if pattern.startswith('^') else 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break
+            char = pattern[i + 1]
+            i += 2
+        elif char in _SPECIAL_CHARS:
+            break
+        else:
+            i += 1
+
+        if i < len(pattern) and pattern[i] in _QUANTIFIERS:
+            # the last char is optional or repeated
+            break
+        prefix.append(char)
+
+    return ''.join(prefix)
+
+
+def _has_top_level_alternation(pattern):
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+    return False
+
+
+def _make_non_capturing(pattern):
+    """Converts all groups of pattern into non-capturing ones.
+
+    :return: the converted pattern or None if pattern cannot be
+             combined with others, e.g. it uses backreferences or flags
+    """
+    result = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if pattern[i + 1:i + 2].isdigit():
+                return None
+            result.append(pattern[i:i + 2])
+            i += 2
+            continue
+
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+            # the ']' right after the '[' or '[^' is a literal
+            if pattern[i + 1:i + 2] == '^':
+                result.append(char)
+                i += 1
+                char = '^'
+            if pattern[i + 1:i + 2] == ']':
+                result.append(char)
+                i += 1
+                char = ']'
+        elif char == '(':
+            if pattern[i + 1:i + 2] != '?':
+                result.append('(?:')
+                i += 1
+                continue
+            ext = pattern[i + 2:i + 3]
+            if ext == 'P':
+                if pattern[i + 3:i + 4] != '<':
+                    return None
+                end = pattern.index('>', i)
+                result.append('(?:')
+                i = end + 1
+                continue
+            if ext not in (':', '=', '!', '<', '#'):
+                # inline flags and conditional groups
+                return None
+        result.append(char)
+        i += 1
+
+    return ''.join(result)
+
+
+class _Chunk(object):
+    """Several routes combined into the single regular expression."""
+
+    __slots__ = ('regex', 'indexes')
+
+    def __init__(self, regex, indexes):
+        self.regex = regex
+        self.indexes = indexes
+
+    def match(self, path):
+        matched = self.regex.match(path)
+        if matched is None:
+            return None
+        if len(self.indexes) == 1:
+            return self.indexes[0]
+        return self.indexes[matched.lastindex - 1]
+
+
+class _Node(object):
+
+    __slots__ = ('children', 'routes', 'chunks')
+
+    def __init__(self):
+        self.children = {}
+        self.routes = []
+        self.chunks = ()
+
+    def compile(self, max_groups):
+        chunks = []
+        batch = []
+
+        def flush():
+            if len(batch) == 1:
+                chunks.append(_Chunk(batch[0][2], [batch[0][0]]))
+            elif batch:
+                regex = re.compile('|'.join(
+                    '({0})'.format(p) for _, p, _ in batch))
+                chunks.append(_Chunk(regex, [i for i, _, _ in batch]))
+            del batch[:]
+
+        for index, pattern, regex in self.routes:
+            combinable = _make_non_capturing(pattern)
+            if combinable is None:
+                flush()
+                chunks.append(_Chunk(regex, [index]))
+                continue
+            batch.append((index, combinable, regex))
+            if len(batch) >= max_groups:
+                flush()
+        flush()
+
+        self.chunks = tuple(chunks)
+        del self.routes[:]
+        for child in six.itervalues(self.children):
+            child.compile(max_groups)
+
+
+class Router(object):
+    """Matches paths against an ordered list of regular expressions.
+
+    The routes are organized into the trie by the path segments of
+    their static prefixes, the routes of each trie node are combined
+    into the single regular expression. So the path is matched only
+    against the routes which may match it and with few regex calls.
+    The result is the same as re.match of routes one by one:
+    the first matching route in the original order wins.
+    """
+
+    def __init__(self, routes, max_groups=MAX_GROUPS):
+        """Compiles routes.
+
+        :param routes: the sequence of pairs (pattern, value)
+        :param max_groups: the max number of routes in combined regex
+        :raises: re.error if some pattern is not valid
+        """
+        self._root = _Node()
+        self._routes = []
+
+        for index, (pattern, value) in enumerate(routes):
+            regex = re.compile(pattern)
+            self._routes.append((regex, value))
+
+            node = self._root
+            for segment in get_static_prefix(pattern).split('/')[:-1]:
+                node = node.children.setdefault(segment, _Node())
+            node.routes.append((index, pattern, regex))
+
+        self._root.compile(max_groups)
+
+    def __len__(self):
+        return len(self._routes)
+
+    def match(self, path):
+        """Finds the first route which matches path.
+
+        :param path: the path to match
+        :return: tuple (value, match object) or (None, None)
+        """
+        found = None
+        node = self._root
+        segments = iter(path.split('/'))
+        while node is not None:
+            for chunk in node.chunks:
+                index = chunk.match(path)
+                if index is not None:
+                    if found is None or index < found:
+                        found = index
+                    # the chunks of node are ordered
+                    break
+            node = node.children.get(next(segments, None))
+
+        if found is None:
+            return None, None
+        regex, value = self._routes[found]
+        return value, regex.match(path)
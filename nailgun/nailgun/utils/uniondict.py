@@ -23,7 +23,14 @@ class UnionDict(collections.Mapping):
     This is an object which acts like a deep merge of several
     dicts. It's needed to replace real dict, merged with help
     of utils.dict_merge in LCM code.
+
+    The views of nested dicts are created once per key and the set
+    of keys is built on first use only, so the underlying dicts
+    must not be changed while the union is in use.
     """
+
+    __slots__ = ('dicts', '_keys', '_children')
+
     def __init__(self, *dicts):
         for d in dicts:
             if not isinstance(d, dict):
@@ -31,9 +38,19 @@ class UnionDict(collections.Mapping):
 
         self.dicts = list(dicts)
         self.dicts.reverse()
-        self.keys = set(itertools.chain.from_iterable(dicts))
+        self._keys = None
+        self._children = {}
+
+    def _get_keys(self):
+        if self._keys is None:
+            self._keys = set(itertools.chain.from_iterable(self.dicts))
+        return self._keys
 
     def __getitem__(self, key):
+        child = self._children.get(key)
+        if child is not None:
+            return child
+
         values = []
         for d in self.dicts:
             try:
@@ -51,13 +68,24 @@ class UnionDict(collections.Mapping):
             return values[0]
 
         values.reverse()
-        return UnionDict(*values)
+        child = self._children[key] = UnionDict(*values)
+        return child
+
+    def __contains__(self, key):
+        return any(key in d for d in self.dicts)
 
     def __iter__(self):
-        return iter(self.keys)
+        if len(self.dicts) == 1:
+            return iter(self.dicts[0])
+        return iter(self._get_keys())
 
     def __len__(self):
-        return len(self.keys)
+        if len(self.dicts) == 1:
+            return len(self.dicts[0])
+        return len(self._get_keys())
+
+    def __reduce__(self):
+        return UnionDict, tuple(reversed(self.dicts))
 
     def __repr__(self):
         items = ['{!r}: {!r}'.format(k, v) for k, v in self.items()]
@@ -60,6 +60,8 @@ RPC_CONSUMER_LOG_PATH: "${NAILGUN_LOGS}/receiverd.log"
 ASSASSIN_LOG_PATH: "${NAILGUN_LOGS}/assassind.log"
 STATS_LOGS_PATH: ${NAILGUN_LOGS}
 LCM_SERIALIZERS_CONCURRENCY_FACTOR: 1
+NODE_HEARTBEAT_FLUSH_INTERVAL: 0
+PLUGINS_CACHE_PATH: null
 EOL
 }
 